@@ -1,25 +1,32 @@
+import re
 from typing import Dict, List
 from urllib.parse import urlparse
+from extract.matchers import FACULTY_MATCHER, MUSIC_MATCHER
 
 class AnalysisPlan:
     def __init__(self, url: str):
         self.url = url
         self.strategies = self._select_strategies(url)
         self.needs_js = self._detect_js_need(url)
-        self.has_pagination = False  # TODO: Implement pagination detection
+        self.has_pagination = False  # Set after the first page is fetched (extract/pagination.py)
         self.hints = self._extract_hints(url)
+        self.directory_candidates: List[str] = []  # Filled by discover_directories()
+
+    async def discover_directories(self, limit: int = 10) -> List[str]:
+        """Look up likely faculty directory URLs in the site's sitemaps"""
+        self.directory_candidates = await discover_directory_urls(self.url, limit)
+        return self.directory_candidates
 
     def _select_strategies(self, url: str) -> List[str]:
         """Select extraction strategies based on URL patterns"""
         strategies = []
-        url_lower = url.lower()
 
         # Faculty/directory patterns
-        if any(keyword in url_lower for keyword in ['faculty', 'directory', 'staff', 'people']):
+        if FACULTY_MATCHER.matches(url):
             strategies.extend(['json_ld', 'faculty_generic', 'directory_table', 'profile_cards'])
 
         # Music department patterns
-        if any(keyword in url_lower for keyword in ['music', 'conservatory', 'arts']):
+        if MUSIC_MATCHER.matches(url):
             # If not already included, add faculty_generic before table parsing
             if 'faculty_generic' not in strategies:
                 strategies.extend(['json_ld', 'faculty_generic', 'directory_table'])
@@ -53,6 +60,43 @@ class AnalysisPlan:
 
         return hints
 
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPA_MARKER_RE = re.compile(
+    r'id=["\'](?:root|app|__next|__nuxt)["\']|\bng-app\b|data-reactroot|enable javascript',
+    re.IGNORECASE
+)
+
+def looks_js_rendered(html: str) -> bool:
+    """
+    Heuristic run on fetched HTML: an app-shell page (SPA mount point or
+    "enable JavaScript" notice) with almost no server-rendered text.
+    """
+    if not html:
+        return False
+    text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', html))
+    text_length = len(' '.join(text.split()))
+    if _SPA_MARKER_RE.search(html):
+        return text_length < 500
+    return text_length < 100 and '<script' in html.lower()
+
+async def discover_directory_urls(url: str, limit: int = 10) -> List[str]:
+    """
+    Faculty directory candidates for the URL's site, taken from its sitemaps
+    (fetch/robots.py) rather than by crawling. Paths with faculty/directory
+    terms rank first, music-related URLs next, shallower paths before deeper ones.
+    """
+    from fetch.robots import robots_cache
+    ranked = []
+    for position, page_url in enumerate(await robots_cache.sitemap_urls(url)):
+        path = urlparse(page_url).path.lower()
+        if not FACULTY_MATCHER.matches(path):
+            continue
+        depth = len([segment for segment in path.split('/') if segment])
+        ranked.append((-int(MUSIC_MATCHER.matches(page_url.lower())), depth, position, page_url))
+    ranked.sort()
+    return [page_url for *_, page_url in ranked[:limit]]
+
 def create_analysis_plan(url: str) -> Dict:
     """Create analysis plan for given URL"""
     plan = AnalysisPlan(url)
@@ -62,5 +106,6 @@ def create_analysis_plan(url: str) -> Dict:
         'strategies': plan.strategies,
         'needs_js': plan.needs_js,
         'has_pagination': plan.has_pagination,
-        'hints': plan.hints
+        'hints': plan.hints,
+        'directory_candidates': plan.directory_candidates
     }
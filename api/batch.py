@@ -0,0 +1,47 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, Field
+
+from api.server import ScrapeRequest, scrape_faculty_directory
+from config import settings
+from schemas import ScrapeResponse
+
+class BatchScrapeRequest(BaseModel):
+    requests: List[ScrapeRequest] = Field(..., description="Directory scrapes to run")
+    max_concurrency: Optional[int] = Field(None, description="Scrapes in flight across the whole batch")
+    per_domain_limit: Optional[int] = Field(None, description="Scrapes in flight against any one domain")
+
+async def run_batch(batch: BatchScrapeRequest) -> AsyncIterator[ScrapeResponse]:
+    """
+    Run every scrape in the batch under a global and a per-domain concurrency
+    limit, yielding each ScrapeResponse as soon as it finishes.
+    """
+    global_slots = asyncio.Semaphore(max(1, batch.max_concurrency or settings.batch_max_concurrency))
+    per_domain_limit = max(1, batch.per_domain_limit or settings.batch_per_domain_limit)
+    domain_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def run_one(request: ScrapeRequest) -> ScrapeResponse:
+        domain = urlparse(request.url).netloc.lower()
+        if domain not in domain_slots:
+            domain_slots[domain] = asyncio.Semaphore(per_domain_limit)
+        # Wait on the domain first so a busy domain doesn't hold global slots
+        async with domain_slots[domain]:
+            async with global_slots:
+                return await scrape_faculty_directory(request, enrich_emails=bool(request.enrich_profiles))
+
+    tasks = [asyncio.create_task(run_one(request)) for request in batch.requests]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away or the batch failed: stop outstanding scrapes
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+async def stream_batch_ndjson(batch: BatchScrapeRequest) -> AsyncIterator[str]:
+    """One JSON-encoded ScrapeResponse per line"""
+    async for response in run_batch(batch):
+        yield response.model_dump_json() + "\n"
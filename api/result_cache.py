@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Iterable, List, Optional
+
+from config import settings
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code whose output a cached result depends on; editing any of it invalidates every entry
+PIPELINE_SOURCES = ("extract", "normalize", "analyze", "schemas", os.path.join("api", "server.py"))
+
+def compute_pipeline_version(sources: Iterable[str] = PIPELINE_SOURCES, root: str = _ROOT) -> str:
+    """Hash of the extractor/normalizer source files, in a stable order"""
+    paths: List[str] = []
+    for source in sources:
+        full = os.path.join(root, source)
+        if os.path.isfile(full):
+            paths.append(full)
+        for folder, dirs, files in os.walk(full):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            paths.extend(os.path.join(folder, name) for name in sorted(files) if name.endswith(".py"))
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, root).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+PIPELINE_VERSION = compute_pipeline_version()
+
+class ResultCache:
+    """
+    On-disk cache of finished ScrapeResponses, keyed by the fetched page
+    bodies, the extraction options and PIPELINE_VERSION.
+
+    Layout under `directory`: <version>/<key>.json. Entries from older
+    pipeline versions are never read and are removed first on eviction; past
+    `max_bytes`, the least recently used entries go next. Methods do blocking
+    file I/O: call them from the event loop through asyncio.to_thread.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 enabled: Optional[bool] = None, version: Optional[str] = None):
+        self.configure(directory=directory, max_bytes=max_bytes, enabled=enabled, version=version)
+
+    def configure(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                  enabled: Optional[bool] = None, version: Optional[str] = None):
+        self.directory = directory or settings.result_cache_dir
+        self.max_bytes = settings.result_cache_max_bytes if max_bytes is None else max_bytes
+        self.enabled = settings.result_cache_enabled if enabled is None else enabled
+        self.version = version or PIPELINE_VERSION
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()  # Size accounting is shared by concurrent puts
+
+    def key(self, bodies: Iterable[str], strategies: Iterable[str], **options) -> str:
+        """Cache key for the page bodies (in page order), the planned strategies and any output-affecting options"""
+        digest = hashlib.sha256()
+        for body in bodies:
+            digest.update(hashlib.sha256((body or "").encode("utf-8", "replace")).digest())
+        digest.update(json.dumps([list(strategies), options], sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, self.version, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """The stored ScrapeResponse dict, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = json.loads(f.read())
+            os.utime(path)  # Recently used
+            return result
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: dict):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(result).encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            try:
+                replaced = os.path.getsize(path)  # Overwriting a key frees the old entry's bytes
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - replaced
+            self._evict()
+
+    def clear(self):
+        for item in self._entries():
+            try:
+                os.remove(item[2])
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = 0
+
+    def _entries(self) -> List[tuple]:
+        """(is_current_version, mtime, path, size) for every stored result"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        with os.scandir(self.directory) as versions:
+            for version in versions:
+                if not version.is_dir():
+                    continue
+                with os.scandir(version.path) as it:
+                    for item in it:
+                        if item.name.endswith(".json"):
+                            stat = item.stat()
+                            entries.append((version.name == self.version, stat.st_mtime, item.path, stat.st_size))
+        return entries
+
+    def _evict(self):
+        """Drop stale-version entries, then least recently used ones, until under max_bytes"""
+        if self._total_bytes is None:
+            self._total_bytes = sum(entry[3] for entry in self._entries())
+        if self._total_bytes <= self.max_bytes:
+            return
+        for _, _, path, size in sorted(self._entries()):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self._total_bytes -= size
+            except OSError:
+                pass
+
+result_cache = ResultCache()
@@ -1,86 +1,162 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+from fastapi import FastAPI, Header, HTTPException
 from pydantic import BaseModel, Field
 from schemas import ScrapeResponse, ErrorResponse
-from typing import Optional
+from typing import Optional, Callable, Literal
 
 class ScrapeRequest(BaseModel):
     url: str = Field(..., description="University faculty directory URL to scrape")
     enable_js: Optional[bool] = Field(False, description="Enable JavaScript rendering")
     enrich_profiles: Optional[bool] = Field(False, description="Fetch individual profile pages")
     max_pages: Optional[int] = Field(5, description="Maximum pages to crawl if pagination detected")
+    strategy_mode: Optional[Literal["first", "best"]] = Field("first", description="'first' stops at the first strategy with results; 'best' runs all and keeps the highest scoring")
+    include_timings: Optional[bool] = Field(False, description="Include per-stage milliseconds in the response")
 
-async def scrape_faculty_directory(request: ScrapeRequest, enrich_emails: bool = False) -> ScrapeResponse:
+async def scrape_faculty_directory(request: ScrapeRequest, enrich_emails: bool = False,
+                                   progress: Optional[Callable[[dict], None]] = None,
+                                   on_event: Optional[Callable[[dict], None]] = None) -> ScrapeResponse:
     """
     Main endpoint for scraping university music faculty directories.
     Implements the core pipeline: Analyze → Fetch → Extract → Normalize
+    `progress`, if given, is called with {"stage": ...} as the pipeline advances.
+    `on_event`, if given, receives {"event": "lead", "index", "lead"} for every
+    lead once extraction is done, then {"event": "update", ...} for each lead
+    whose email was found on its profile page or inferred from the directory's
+    address pattern (see api/streaming.py).
     """
+    def report(stage: str, **counters):
+        if progress:
+            progress({"stage": stage, **counters})
+    
     try:
-        from analyze.plan import create_analysis_plan
+        from analyze.plan import create_analysis_plan, looks_js_rendered
+        from fetch.browser import render_html
         from fetch.http import fetch_html
-        from extract.strategies.json_ld import extract_json_ld_people
-        from schemas import NormalizedLead, EmailStatus
+        from extract.executor import parse_executor
+        from extract.pagination import crawl_pages, merge_page_leads
+        from normalize.columnar import normalize_columns
+        from normalize.dedupe import dedupe_leads
+        from metrics import StageTimer, STRATEGY_SECONDS, ENRICHMENT_FANOUT, SCRAPES
+        from api.result_cache import result_cache
+        
+        timer = StageTimer()
         
         # Phase 1: Analyze URL
-        plan = create_analysis_plan(request.url)
+        report("analyze")
+        with timer.span("analyze"):
+            plan = create_analysis_plan(request.url)
+        
+        # Phase 2: Fetch HTML content (plus further pages when paginated)
+        report("fetch")
+        with timer.span("fetch"):
+            html_content, fetch_notes = await fetch_html(request.url)
+            plan['needs_js'] = plan['needs_js'] or looks_js_rendered(html_content)
+            if request.enable_js and plan['needs_js']:
+                # App-shell page: render it in the warm browser pool instead
+                rendered_html, render_notes = await render_html(request.url)
+                if rendered_html:
+                    html_content, fetch_notes = rendered_html, {**render_notes, "http": fetch_notes}
+                else:
+                    fetch_notes["errors"].extend(render_notes["errors"])
+            pages = []
+            if html_content and (request.max_pages or 1) > 1:
+                pages = await crawl_pages(request.url, html_content, request.max_pages)
+                plan['has_pagination'] = bool(pages)
+                if pages:
+                    fetch_notes["pages"] = [
+                        {"url": page_url, "status_code": notes.get("status_code"), "cache": notes.get("cache"), "errors": notes.get("errors")}
+                        for page_url, _, notes in pages
+                    ]
         
-        # Phase 2: Fetch HTML content
-        html_content, fetch_notes = await fetch_html(request.url)
+        # Identical pages with an unchanged pipeline give an identical result
+        cache_key = None
+        if html_content and not enrich_emails:
+            cache_key = result_cache.key(
+                [html_content] + [page_html for _, page_html, _ in pages],
+                plan['strategies'],
+                url=request.url,
+                mode=request.strategy_mode or "first"
+            )
+            cached = await asyncio.to_thread(result_cache.get, cache_key)
+            if cached is not None:
+                fetch_notes["result_cache"] = "hit"
+                response = ScrapeResponse.model_validate(cached)
+                response.fetch_notes = fetch_notes
+                response.timings = timer.as_dict(response.strategy_timings) if request.include_timings else None
+                SCRAPES.inc(strategy=response.strategy_used or "none", success=str(response.success).lower())
+                return response
+            fetch_notes["result_cache"] = "miss"
         
-        # Phase 3: Try extraction strategies in order
-        raw_leads = []
-        strategy_used = None
+        # Phase 3: Run extraction strategies over a single parse, off the event loop
+        report("extract", pages=1 + len(pages))
+        with timer.span("extract"):
+            extraction = await parse_executor.extract(html_content, request.url, plan['strategies'], mode=request.strategy_mode or "first")
+            raw_leads = extraction["leads"]
+            strategy_used = extraction["strategy"]
+            for name, ms in extraction["timings"].items():
+                STRATEGY_SECONDS.observe(ms / 1000, strategy=name)
+            
+            # Remaining pages share the first page's layout, so reuse its strategy
+            if strategy_used and pages:
+                further = [(page_url, page_html) for page_url, page_html, _ in pages if page_html]
+                further_leads = await parse_executor.extract_pages(strategy_used, further)
+                raw_leads = merge_page_leads(
+                    [(request.url, raw_leads)] + [(page_url, leads) for (page_url, _), leads in zip(further, further_leads)]
+                )
+
+        # Phase 3b: Collapse the same person found by several selectors, tables or pages
+        with timer.span("dedupe"):
+            raw_leads = [lead for lead in dedupe_leads(raw_leads) if str(lead.get('name') or '').strip()]
         
-        for strategy_name in plan['strategies']:
-            if strategy_name == 'json_ld':
-                raw_leads = extract_json_ld_people(html_content, request.url)
-                if raw_leads:
-                    strategy_used = 'json_ld'
-                    break
-            elif strategy_name == 'directory_table':
-                from extract.strategies.directory_table import extract_directory_table
-                raw_leads = extract_directory_table(html_content, request.url)
-                if raw_leads:
-                    strategy_used = 'directory_table'
-                    break
-            elif strategy_name == 'faculty_generic':
-                from extract.strategies.faculty_generic import extract_faculty_generic
-                raw_leads = extract_faculty_generic(html_content, request.url)
-                if raw_leads:
-                    strategy_used = 'faculty_generic'
-                    break
+        def emit(event: str, index: int, lead):
+            on_event({"event": event, "index": index, "lead": lead.model_dump(mode="json")})
         
-        # Phase 4: Enrich with emails from profiles (if enabled)
+        if on_event:
+            for index, lead in enumerate(normalize_columns(raw_leads, request.url)):
+                emit("lead", index, lead)
+        
+        # Phase 4: Enrich with emails from profiles (if enabled), taking each profile as it finishes
         if enrich_emails and raw_leads:
-            from normalize.profile_enricher import enrich_emails_from_profiles
-            raw_leads = await enrich_emails_from_profiles(raw_leads)
+            from normalize.profile_enricher import iter_enriched_profiles
+            report("enrich", done=0, total=len(raw_leads))
+            unlisted = [lead for lead in raw_leads if not (lead.get('email') or lead.get('email_raw'))]
+            ENRICHMENT_FANOUT.observe(sum(1 for lead in unlisted if lead.get('profile_url')))
+            with timer.span("enrich"):
+                raw_leads = list(raw_leads)
+                async for index, lead in iter_enriched_profiles(
+                    raw_leads,
+                    on_progress=lambda done, total: report("enrich", done=done, total=total)
+                ):
+                    raw_leads[index] = lead
+                    if on_event and (lead.get('email_enriched') or lead.get('email_inferred')):
+                        emit("update", index, normalize_columns([lead], request.url)[0])
         
         # Phase 5: Normalize data
-        normalized_leads = []
-        for raw_lead in raw_leads:
-            # Basic normalization - TODO: move to separate normalizer
-            normalized_lead = NormalizedLead(
-                name=raw_lead.get('name', ''),
-                title=raw_lead.get('title'),
-                email=raw_lead.get('email_raw'),
-                email_status=EmailStatus.FOUND_ON_PROFILE if raw_lead.get('email_enriched') else (EmailStatus.PRESENT if raw_lead.get('email_raw') else EmailStatus.MISSING),
-                profile_url=raw_lead.get('profile_url'),
-                directory_url=raw_lead.get('directory_url', request.url),
-                socials=raw_lead.get('socials', []),
-                bio_snippet=raw_lead.get('bio_snippet')
-            )
-            normalized_leads.append(normalized_lead)
+        report("normalize", leads=len(raw_leads))
+        with timer.span("normalize"):
+            normalized_leads = normalize_columns(raw_leads, request.url)
+        
+        SCRAPES.inc(strategy=strategy_used or "none", success=str(len(normalized_leads) > 0).lower())
         
         # Return results
-        return ScrapeResponse(
+        response = ScrapeResponse(
             success=len(normalized_leads) > 0,
             items=normalized_leads,
             total_found=len(normalized_leads),
             source_url=request.url,
             strategy_used=strategy_used,
-            message=f"Extracted {len(normalized_leads)} faculty members using {strategy_used or 'no'} strategy"
+            message=f"Extracted {len(normalized_leads)} faculty members using {strategy_used or 'no'} strategy",
+            strategy_timings=extraction["timings"]
         )
+        if cache_key:
+            await asyncio.to_thread(result_cache.put, cache_key, response.model_dump(mode="json"))
+        response.fetch_notes = fetch_notes
+        response.timings = timer.as_dict(extraction["timings"]) if request.include_timings else None
+        return response
         
     except Exception as e:
+        from metrics import SCRAPES
+        SCRAPES.inc(strategy="none", success="error")
         # Return error in consistent format
         return ScrapeResponse(
             success=False,
@@ -93,11 +169,110 @@ async def scrape_faculty_directory(request: ScrapeRequest, enrich_emails: bool =
 
 def register_routes(app: FastAPI):
     """Register all API routes"""
+    from fastapi.responses import StreamingResponse
+    from api.batch import BatchScrapeRequest, stream_batch_ndjson
+    from api.streaming import stream_scrape_ndjson, stream_scrape_sse, wants_sse
+    from jobs import job_store, worker_pool
+    from api.snapshots import diff_leads, snapshot_store
+    from schemas import JobInfo, JobState, ScrapeDiffResponse
     
     @app.post("/scrape", response_model=ScrapeResponse)
-    async def scrape_endpoint(request: ScrapeRequest):
-        """Scrape a university music faculty directory"""
-        return await scrape_faculty_directory(request)
+    async def scrape_endpoint(request: ScrapeRequest, stream: bool = False, accept: Optional[str] = Header(None)):
+        """
+        Scrape a university music faculty directory.
+        enrich_profiles fetches profile pages for leads without an email, as
+        on every other scrape entry point. With ?stream=true, leads are sent
+        as soon as they are extracted and enrichment updates follow as
+        profiles finish: NDJSON, or Server-Sent Events when the client
+        accepts text/event-stream.
+        """
+        if stream:
+            if wants_sse(accept):
+                return StreamingResponse(stream_scrape_sse(request), media_type="text/event-stream",
+                                         headers={"Cache-Control": "no-cache"})
+            return StreamingResponse(stream_scrape_ndjson(request), media_type="application/x-ndjson")
+        return await scrape_faculty_directory(request, enrich_emails=bool(request.enrich_profiles))
+    
+    @app.post("/scrape/batch")
+    async def scrape_batch_endpoint(batch: BatchScrapeRequest):
+        """Scrape many directories, streaming each result as NDJSON when it completes"""
+        return StreamingResponse(stream_batch_ndjson(batch), media_type="application/x-ndjson")
+    
+    @app.post("/scrape/diff", response_model=ScrapeDiffResponse)
+    async def scrape_diff_endpoint(request: ScrapeRequest):
+        """Scrape a directory and return only what changed since its last snapshot"""
+        result = await scrape_faculty_directory(request, enrich_emails=bool(request.enrich_profiles))
+        if not result.success:
+            # Keep the old snapshot: a failed scrape would otherwise report everyone as removed
+            return ScrapeDiffResponse(success=False, source_url=request.url, message=result.message)
+        
+        current = [lead.model_dump(mode="json") for lead in result.items]
+        previous = await asyncio.to_thread(snapshot_store.get, request.url)
+        diff = diff_leads(previous[1] if previous else [], current)
+        snapshot_at = await asyncio.to_thread(snapshot_store.put, request.url, current)
+        return ScrapeDiffResponse(
+            success=True,
+            source_url=request.url,
+            first_snapshot=previous is None,
+            previous_snapshot_at=previous[0] if previous else None,
+            snapshot_at=snapshot_at,
+            total_found=len(current),
+            message=f"{len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed",
+            **diff
+        )
+    
+    @app.post("/jobs", status_code=202)
+    async def create_job(request: ScrapeRequest):
+        """Queue a scrape to run in the background; poll GET /jobs/{job_id} for status"""
+        job_id = await asyncio.to_thread(job_store.enqueue, request.model_dump())
+        worker_pool.notify()
+        return {"job_id": job_id, "status": JobState.QUEUED}
+    
+    @app.get("/jobs/{job_id}", response_model=JobInfo)
+    async def get_job(job_id: str):
+        """Job status and progress"""
+        job = await asyncio.to_thread(job_store.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+        return job
+    
+    @app.get("/jobs/{job_id}/result", response_model=ScrapeResponse)
+    async def get_job_result(job_id: str):
+        """ScrapeResponse of a finished job"""
+        job = await asyncio.to_thread(job_store.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+        if job.status != JobState.SUCCEEDED:
+            raise HTTPException(status_code=409, detail=f"Job is {job.status.value}" + (f": {job.error}" if job.error else ""))
+        return await asyncio.to_thread(job_store.get_result, job_id)
+    
+    @app.get("/stats")
+    async def stats():
+        """Connection pool, fetch scheduler, parse executor and browser pool state"""
+        from extract.executor import parse_executor
+        from fetch.browser import browser_pool
+        from fetch.pool import client_pool
+        from fetch.scheduler import fetch_scheduler
+        return {
+            "http_pool": client_pool.stats(),
+            "fetch_scheduler": fetch_scheduler.stats(),
+            "parse_executor": parse_executor.metrics(),
+            "browser_pool": browser_pool.stats()
+        }
+    
+    @app.get("/discover")
+    async def discover(url: str, limit: int = 10):
+        """Likely faculty directory URLs for a site, from its robots.txt sitemaps"""
+        from analyze.plan import AnalysisPlan
+        plan = AnalysisPlan(url)
+        return {"url": url, "directory_candidates": await plan.discover_directories(limit)}
+    
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus text exposition of stage latencies, fetch and cache counters"""
+        from fastapi.responses import PlainTextResponse
+        from metrics import registry
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
     
     @app.get("/test/{url:path}")
     async def quick_test(url: str):
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from normalize.dedupe import normalize_name, normalize_profile_url
+from schemas import FieldChange, LeadChange
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    directory_url TEXT PRIMARY KEY,
+    taken_at REAL NOT NULL,
+    leads TEXT NOT NULL
+);
+"""
+
+# NormalizedLead fields compared between snapshots (directory_url is the snapshot key)
+DIFF_FIELDS = ('name', 'title', 'email', 'email_status', 'profile_url', 'socials', 'bio_snippet')
+
+class SnapshotStore:
+    """Latest normalized leads per directory URL, in SQLite (blocking: call via asyncio.to_thread)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.configure(path)
+
+    def configure(self, path: Optional[str] = None):
+        self.path = path or settings.snapshots_db
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, directory_url: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """(taken_at, lead dicts) of the last snapshot, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT taken_at, leads FROM snapshots WHERE directory_url = ?", (directory_url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row["taken_at"], json.loads(row["leads"])
+
+    def put(self, directory_url: str, leads: List[Dict[str, Any]]) -> float:
+        taken_at = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (directory_url, taken_at, leads) VALUES (?, ?, ?)",
+                (directory_url, taken_at, json.dumps(leads))
+            )
+        return taken_at
+
+def diff_leads(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare two snapshots of lead dicts. Leads are matched by profile URL
+    when both sides have one, otherwise by normalized name.
+    Returns {"added", "removed", "changed": [LeadChange], "unchanged_count"}.
+    """
+    by_profile: Dict[str, int] = {}
+    by_name: Dict[str, int] = {}
+    for index, lead in enumerate(previous):
+        profile = normalize_profile_url(lead.get('profile_url'))
+        if profile:
+            by_profile.setdefault(profile, index)
+        by_name.setdefault(normalize_name(lead.get('name')), index)
+
+    matched = set()
+    added, changed = [], []
+    unchanged_count = 0
+    for lead in current:
+        index, matched_by = None, None
+        profile = normalize_profile_url(lead.get('profile_url'))
+        candidate = by_profile.get(profile) if profile else None
+        if candidate is not None and candidate not in matched:
+            index, matched_by = candidate, 'profile_url'
+        else:
+            candidate = by_name.get(normalize_name(lead.get('name')))
+            if candidate is not None and candidate not in matched:
+                index, matched_by = candidate, 'name'
+        if index is None:
+            added.append(lead)
+            continue
+
+        matched.add(index)
+        old = previous[index]
+        changes = {
+            field: FieldChange(old=old.get(field), new=lead.get(field))
+            for field in DIFF_FIELDS
+            if (old.get(field) or None) != (lead.get(field) or None)
+        }
+        if changes:
+            changed.append(LeadChange(
+                name=lead.get('name', ''), profile_url=lead.get('profile_url'), matched_by=matched_by, changes=changes
+            ))
+        else:
+            unchanged_count += 1
+
+    removed = [lead for index, lead in enumerate(previous) if index not in matched]
+    return {"added": added, "removed": removed, "changed": changed, "unchanged_count": unchanged_count}
+
+snapshot_store = SnapshotStore()
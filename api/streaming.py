@@ -0,0 +1,58 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from api.server import ScrapeRequest, scrape_faculty_directory
+
+async def stream_scrape_events(request: ScrapeRequest) -> AsyncIterator[dict]:
+    """
+    Run one scrape and yield its events as they happen:
+    {"event": "lead", "index", "lead"} for each lead as soon as extraction is
+    done, {"event": "update", "index", "lead"} when profile enrichment finds a
+    lead's email, and finally {"event": "done", "response"} carrying the
+    ScrapeResponse without its items (clients already have them).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        try:
+            return await scrape_faculty_directory(
+                request, enrich_emails=bool(request.enrich_profiles), on_event=queue.put_nowait
+            )
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    streamed = False
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            streamed = True
+            yield event
+
+        response = await task
+        if not streamed:
+            # Result cache hits and failures finish without per-lead events
+            for index, lead in enumerate(response.items):
+                yield {"event": "lead", "index": index, "lead": lead.model_dump(mode="json")}
+        yield {"event": "done", "response": response.model_dump(mode="json", exclude={"items"})}
+    finally:
+        # Client went away: stop the scrape and its profile fetches
+        if not task.done():
+            task.cancel()
+
+async def stream_scrape_ndjson(request: ScrapeRequest) -> AsyncIterator[str]:
+    """One JSON-encoded event per line"""
+    async for event in stream_scrape_events(request):
+        yield json.dumps(event) + "\n"
+
+async def stream_scrape_sse(request: ScrapeRequest) -> AsyncIterator[str]:
+    """Server-Sent Events: the event type as `event:`, the rest of the event as JSON `data:`"""
+    async for event in stream_scrape_events(request):
+        payload = {key: value for key, value in event.items() if key != "event"}
+        yield f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+
+def wants_sse(accept: Optional[str]) -> bool:
+    return "text/event-stream" in (accept or "").lower()
@@ -0,0 +1,70 @@
+"""
+Microbenchmark: per-row cost of the directory_table hot loop.
+
+Compares the shared precompiled matchers (extract/matchers.py) with the
+inline `re.search(literal)` + `any(k in text.lower())` checks they replaced,
+over the cells of a large synthetic directory table.
+
+    python -m benchmarks.bench_matchers --rows 2000 --repeat 5
+"""
+import argparse
+import re
+import time
+
+from extract.document import ParsedDocument
+from extract.matchers import TITLE_MATCHER, find_email
+from extract.strategies.directory_table import extract_person_from_table_row
+
+TITLES = ['Professor of Music', 'Lecturer, Piano', 'Department Chair', 'Staff Accompanist', 'Director of Bands']
+
+def build_table_html(rows: int) -> str:
+    body = ['<table><tr><th>Name</th><th>Title</th><th>Email</th><th>Phone</th></tr>']
+    for i in range(rows):
+        body.append(
+            f'<tr><td><a href="/people/person-{i}.html">Person{i}, Example</a></td>'
+            f'<td>{TITLES[i % len(TITLES)]}</td>'
+            f'<td>person{i}@example.edu</td><td>(555) 010-{i % 10000:04d}</td></tr>'
+        )
+    body.append('</table>')
+    return '<html><body>' + ''.join(body) + '</body></html>'
+
+def legacy_cell_checks(cell_texts):
+    for text in cell_texts:
+        re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        any(word in text.lower() for word in ['professor', 'instructor', 'lecturer', 'chair', 'director'])
+
+def shared_cell_checks(cell_texts):
+    for text in cell_texts:
+        find_email(text)
+        TITLE_MATCHER.matches(text)
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    doc = ParsedDocument(build_table_html(args.rows))
+    rows = doc.tables[0].find_all('tr')[1:]
+    cell_texts = [cell.get_text(strip=True) for row in rows for cell in row.find_all(['td', 'th'])]
+
+    legacy = best_of(lambda: legacy_cell_checks(cell_texts), args.repeat)
+    shared = best_of(lambda: shared_cell_checks(cell_texts), args.repeat)
+    full_rows = best_of(lambda: [extract_person_from_table_row(row, 'https://music.example.edu/') for row in rows], args.repeat)
+
+    per_row = lambda seconds: seconds / len(rows) * 1e6
+    print(f"rows: {len(rows)}  cells: {len(cell_texts)}")
+    print(f"matcher checks, inline legacy : {per_row(legacy):8.2f} us/row")
+    print(f"matcher checks, shared        : {per_row(shared):8.2f} us/row  ({legacy / shared:.1f}x)")
+    print(f"extract_person_from_table_row : {per_row(full_rows):8.2f} us/row")
+
+if __name__ == '__main__':
+    main()
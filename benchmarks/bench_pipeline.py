@@ -0,0 +1,204 @@
+"""
+Offline pipeline benchmark over the synthetic corpus and recorded fixtures.
+
+Reports, per layout and size, document parse time and each strategy's time,
+lead count and peak traced memory, then end-to-end POST /scrape latency and
+throughput at several concurrency levels, with every fetch served by a mock
+transport.
+
+    python -m benchmarks.bench_pipeline                  # full run, print table
+    python -m benchmarks.bench_pipeline --save-baseline  # rewrite benchmarks/baselines.json
+    python -m benchmarks.bench_pipeline --compare        # exit 1 if anything regressed
+
+Timings are scaled by a fixed pure-Python calibration loop before comparison
+so baselines recorded on one machine remain usable on another.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Tuple
+
+import httpx
+
+from benchmarks.corpus import LAYOUTS, SIZES, build_corpus, corpus_transport, directory_url, fixture_urls
+from extract.document import ParsedDocument
+from extract.runner import run_strategy
+from extract.strategies import STRATEGIES
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+CONCURRENCY = (1, 4, 16)
+# Timings below this many milliseconds are too noisy to fail a comparison on
+MIN_REGRESSION_MS = 2.0
+
+def calibrate(repeat: int = 5) -> float:
+    """Milliseconds for a fixed interpreter-bound workload (best of `repeat`)"""
+    def work():
+        total = 0
+        for i in range(200_000):
+            total += len(str(i)) * (i & 7)
+        return total
+    return best_ms(work, repeat)
+
+def best_ms(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+def peak_kb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+def bench_strategies(pages: Dict[str, str], targets: Iterable[Tuple[str, str]], repeat: int) -> Dict[str, dict]:
+    """Parse time, and per strategy time/leads/peak memory, for each (label, url)"""
+    results = {}
+    for label, url in targets:
+        html = pages[url]
+        results[f'parse/{label}'] = {
+            'ms': best_ms(lambda: ParsedDocument(html, url).soup, repeat),
+            'peak_kb': peak_kb(lambda: ParsedDocument(html, url).soup),
+        }
+        for name in STRATEGIES:
+            # Strategy cost on an already-parsed document, as in the pipeline
+            document = ParsedDocument(html, url)
+            document.soup
+            results[f'strategy/{label}/{name}'] = {
+                'ms': best_ms(lambda: run_strategy(name, document, url), repeat),
+                'peak_kb': peak_kb(lambda: run_strategy(name, ParsedDocument(html, url), url)),
+                'leads': len(run_strategy(name, document, url)['leads']),
+            }
+    return results
+
+async def _scrape_levels(pages: Dict[str, str], url: str, levels: Iterable[int], requests: int) -> Dict[str, dict]:
+    from api.result_cache import result_cache
+    from api.server import app
+    from extract.executor import parse_executor
+    from fetch.cache import response_cache
+    from fetch.pool import client_pool
+    from fetch.scheduler import fetch_scheduler
+
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client_pool.configure(transport=corpus_transport(pages))
+        response_cache.configure(directory=cache_dir, enabled=False)
+        # Every request re-runs extraction; a result cache hit would measure nothing
+        result_cache.configure(enabled=False)
+        # The mock host needs no politeness; measure the pipeline, not the rate limit
+        fetch_scheduler.configure(rate=1e6, burst=1e6)
+        await asyncio.to_thread(parse_executor.start)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench', timeout=120) as client:
+                payload = {'url': url, 'max_pages': 1}
+                await client.post('/scrape', json=payload)  # warm-up
+                for level in levels:
+                    slots = asyncio.Semaphore(level)
+                    latencies: List[float] = []
+
+                    async def one():
+                        async with slots:
+                            start = time.perf_counter()
+                            response = await client.post('/scrape', json=payload)
+                            latencies.append((time.perf_counter() - start) * 1000)
+                            response.raise_for_status()
+
+                    start = time.perf_counter()
+                    await asyncio.gather(*(one() for _ in range(requests)))
+                    elapsed = time.perf_counter() - start
+                    latencies.sort()
+                    results[f'scrape/c{level}'] = {
+                        'ms': round(statistics.median(latencies), 3),
+                        'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                        'rps': round(requests / elapsed, 2),
+                    }
+        finally:
+            client_pool.configure(transport=None)
+            response_cache.configure()
+            result_cache.configure()
+            fetch_scheduler.configure()
+            parse_executor.shutdown()
+    return results
+
+def bench_scrape(pages: Dict[str, str], url: str, levels: Iterable[int], requests: int) -> Dict[str, dict]:
+    """POST /scrape latency (median, p95) and throughput per concurrency level"""
+    return asyncio.run(_scrape_levels(pages, url, levels, requests))
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Regressions of `current` against `baseline`, as readable lines.
+    A result regresses when its calibrated time exceeds baseline * tolerance
+    by more than MIN_REGRESSION_MS.
+    """
+    scale = baseline['calibration_ms'] / current['calibration_ms'] if current.get('calibration_ms') else 1.0
+    regressions = []
+    for key, base in baseline['results'].items():
+        now = current['results'].get(key)
+        if now is None:
+            continue
+        scaled = now['ms'] * scale
+        if scaled > base['ms'] * tolerance and scaled - base['ms'] > MIN_REGRESSION_MS:
+            regressions.append(f"{key}: {base['ms']:.2f} ms -> {scaled:.2f} ms ({scaled / base['ms']:.2f}x)")
+    return regressions
+
+def run(sizes: Iterable[int], levels: Iterable[int], requests: int, repeat: int) -> dict:
+    sizes = list(sizes)
+    pages = build_corpus(sizes=sizes)
+    targets = [(f'{layout}-{size}', directory_url(layout, size)) for layout in LAYOUTS for size in sizes]
+    targets += [(f"fixture-{url.rsplit('/', 1)[-1][:-5]}", url) for url in fixture_urls(pages)]
+
+    results = bench_strategies(pages, targets, repeat)
+    results.update(bench_scrape(pages, directory_url('table', sizes[len(sizes) // 2]), levels, requests))
+    return {'calibration_ms': calibrate(), 'results': results}
+
+def print_report(report: dict):
+    print(f"calibration: {report['calibration_ms']:.2f} ms")
+    for key, value in report['results'].items():
+        extras = '  '.join(f'{k}={v}' for k, v in value.items() if k != 'ms')
+        print(f"{key:<60} {value['ms']:>10.3f} ms  {extras}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=list(CONCURRENCY))
+    parser.add_argument('--requests', type=int, default=32, help='/scrape requests per concurrency level')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINES_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1.3, help='allowed slowdown factor before failing')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.concurrency, args.requests, args.repeat)
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"baseline written to {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance}x:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nno regressions beyond {args.tolerance}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
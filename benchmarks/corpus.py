@@ -0,0 +1,120 @@
+"""
+Deterministic directory corpus for offline benchmarks.
+
+Builds table, card, list and JSON-LD directory pages (plus one profile page per
+person) at any size, and serves them, together with the recorded pages in
+fixtures/, through an httpx.MockTransport so the real fetch path runs without
+network access.
+"""
+import json
+import os
+from typing import Dict, Iterable, List
+
+import httpx
+
+LAYOUTS = ('table', 'card', 'list', 'json_ld')
+SIZES = (10, 100, 500, 2000)
+HOST = 'https://music.bench.edu'
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+FIRST_NAMES = ['Ada', 'Cari', 'Maria', 'Wei', 'Clara', 'Johann', 'Nadia', 'Amir', 'Lena', 'Tomas', 'Yuki', 'Omar']
+LAST_NAMES = ['Lovelace', 'Earnhart', 'Lopez', 'Chen', 'Schumann', 'Bach', 'Boulanger', 'Haddad', 'Berg', 'Novak']
+TITLES = ['Professor of Music', 'Lecturer, Piano', 'Department Chair', 'Associate Professor of Voice', 'Director of Bands']
+
+def person(i: int) -> Dict[str, str]:
+    first = FIRST_NAMES[i % len(FIRST_NAMES)]
+    last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    slug = f'{first.lower()}-{last.lower()}-{i}'
+    return {
+        'name': f'{first} {last} {i}',
+        'title': TITLES[i % len(TITLES)],
+        'email': f'{slug}@bench.edu',
+        'profile_path': f'/people/{slug}.html',
+    }
+
+def _page(body: str, head: str = '') -> str:
+    nav = '<nav><ul><li><a href="/">Home</a></li><li><a href="/about">About</a></li></ul></nav>'
+    return f'<!DOCTYPE html><html><head><title>Faculty</title>{head}</head><body>{nav}<main>{body}</main></body></html>'
+
+def table_page(size: int) -> str:
+    rows = ['<table class="directory"><tr><th>Name</th><th>Title</th><th>Email</th></tr>']
+    for i in range(size):
+        p = person(i)
+        rows.append(
+            f'<tr><td><a href="{p["profile_path"]}">{p["name"]}</a></td><td>{p["title"]}</td>'
+            f'<td><a href="mailto:{p["email"]}">{p["email"]}</a></td></tr>'
+        )
+    rows.append('</table>')
+    return _page(''.join(rows))
+
+def card_page(size: int) -> str:
+    cards = []
+    for i in range(size):
+        p = person(i)
+        cards.append(
+            f'<div class="faculty-card"><h3 class="name"><a href="{p["profile_path"]}">{p["name"]}</a></h3>'
+            f'<p class="title">{p["title"]}</p><a href="mailto:{p["email"]}">Email</a>'
+            f'<p class="bio">Performs and teaches across the region.</p></div>'
+        )
+    return _page('<div class="faculty-grid">' + ''.join(cards) + '</div>')
+
+def list_page(size: int) -> str:
+    items = []
+    for i in range(size):
+        p = person(i)
+        items.append(f'<li><a href="{p["profile_path"]}">{p["name"]}</a> {p["title"]} {p["email"]}</li>')
+    return _page('<ul class="people">' + ''.join(items) + '</ul>')
+
+def json_ld_page(size: int) -> str:
+    people = [
+        {'@type': 'Person', 'name': p['name'], 'jobTitle': p['title'], 'email': p['email'], 'url': HOST + p['profile_path']}
+        for p in (person(i) for i in range(size))
+    ]
+    data = {'@context': 'https://schema.org', '@type': 'Organization', 'name': 'Department of Music', 'employee': people}
+    head = '<script type="application/ld+json">' + json.dumps(data) + '</script>'
+    return _page('<h1>Faculty</h1>', head=head)
+
+def profile_page(i: int) -> str:
+    p = person(i)
+    return _page(f'<h1>{p["name"]}</h1><p>{p["title"]}</p><p>Contact: <a href="mailto:{p["email"]}">{p["email"]}</a></p>')
+
+BUILDERS = {'table': table_page, 'card': card_page, 'list': list_page, 'json_ld': json_ld_page}
+
+def directory_url(layout: str, size: int) -> str:
+    return f'{HOST}/faculty/{layout}-{size}.html'
+
+def load_fixtures() -> Dict[str, str]:
+    """Recorded directory pages from fixtures/, keyed by a corpus URL"""
+    pages = {}
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith('.html'):
+            with open(os.path.join(FIXTURES_DIR, filename), encoding='utf-8') as f:
+                pages[f'{HOST}/fixtures/{filename}'] = f.read()
+    return pages
+
+def build_corpus(layouts: Iterable[str] = LAYOUTS, sizes: Iterable[int] = SIZES,
+                 include_fixtures: bool = True) -> Dict[str, str]:
+    """URL -> HTML for every layout/size directory, the profile pages they link to, and the fixtures"""
+    pages: Dict[str, str] = {}
+    sizes = list(sizes)
+    for layout in layouts:
+        for size in sizes:
+            pages[directory_url(layout, size)] = BUILDERS[layout](size)
+    for i in range(max(sizes, default=0)):
+        pages[HOST + person(i)['profile_path']] = profile_page(i)
+    if include_fixtures:
+        pages.update(load_fixtures())
+    return pages
+
+def corpus_transport(pages: Dict[str, str]) -> httpx.MockTransport:
+    """Serve the corpus; unknown URLs get a 404"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        html = pages.get(str(request.url))
+        if html is None:
+            return httpx.Response(404, text='not found')
+        return httpx.Response(200, html=html)
+    return httpx.MockTransport(handler)
+
+def fixture_urls(pages: Dict[str, str]) -> List[str]:
+    return [url for url in pages if '/fixtures/' in url]
@@ -0,0 +1,131 @@
+import os
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+class Settings:
+    """
+    Runtime settings, read from environment variables (or a local .env file).
+    Every variable is prefixed with SCRAPER_.
+    """
+
+    def __init__(self):
+        # Shared HTTP client pool (fetch/pool.py)
+        self.http_max_connections = _env_int("SCRAPER_HTTP_MAX_CONNECTIONS", 100)
+        self.http_max_keepalive = _env_int("SCRAPER_HTTP_MAX_KEEPALIVE", 20)
+        self.http_keepalive_expiry = _env_int("SCRAPER_HTTP_KEEPALIVE_EXPIRY", 30)
+        self.http_per_host_limit = _env_int("SCRAPER_HTTP_PER_HOST_LIMIT", 6)
+        self.http2 = _env_bool("SCRAPER_HTTP2", True)
+        self.user_agent = os.getenv(
+            "SCRAPER_USER_AGENT",
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        )
+
+        # Per-domain politeness scheduler (fetch/scheduler.py); rates are requests/second
+        self.scheduler_rate = _env_float("SCRAPER_SCHEDULER_RATE", 4.0)
+        self.scheduler_burst = _env_float("SCRAPER_SCHEDULER_BURST", 4.0)
+        self.scheduler_min_rate = _env_float("SCRAPER_SCHEDULER_MIN_RATE", 0.2)
+        self.scheduler_max_rate = _env_float("SCRAPER_SCHEDULER_MAX_RATE", 20.0)
+        self.scheduler_max_in_flight = _env_int("SCRAPER_SCHEDULER_MAX_IN_FLIGHT", 64)
+        self.scheduler_slow_latency = _env_float("SCRAPER_SCHEDULER_SLOW_LATENCY", 3.0)
+        self.scheduler_max_retry_after = _env_int("SCRAPER_SCHEDULER_MAX_RETRY_AFTER", 120)
+
+        # Retries and hedged requests (fetch/retry.py)
+        self.retry_attempts = _env_int("SCRAPER_RETRY_ATTEMPTS", 3)
+        self.retry_statuses = [int(code) for code in os.getenv("SCRAPER_RETRY_STATUSES", "429,500,502,503,504").split(",") if code.strip().isdigit()]
+        self.retry_backoff_base = _env_float("SCRAPER_RETRY_BACKOFF_BASE", 0.5)
+        self.retry_backoff_max = _env_float("SCRAPER_RETRY_BACKOFF_MAX", 8.0)
+        self.retry_deadline = _env_float("SCRAPER_RETRY_DEADLINE", 45.0)
+        self.fetch_hedge = _env_bool("SCRAPER_FETCH_HEDGE", True)
+        self.hedge_min_samples = _env_int("SCRAPER_HEDGE_MIN_SAMPLES", 20)
+
+        # robots.txt and sitemaps (fetch/robots.py)
+        self.respect_robots = _env_bool("SCRAPER_RESPECT_ROBOTS", True)
+        self.robots_user_agent = os.getenv("SCRAPER_ROBOTS_USER_AGENT", "ScrapingAgent")
+        self.robots_cache_dir = os.getenv("SCRAPER_ROBOTS_CACHE_DIR", ".cache/robots")
+        self.robots_ttl = _env_int("SCRAPER_ROBOTS_TTL", 24 * 60 * 60)
+        self.robots_error_ttl = _env_int("SCRAPER_ROBOTS_ERROR_TTL", 10 * 60)
+        self.robots_timeout = _env_int("SCRAPER_ROBOTS_TIMEOUT", 10)
+        self.sitemap_max_files = _env_int("SCRAPER_SITEMAP_MAX_FILES", 20)
+        self.sitemap_max_urls = _env_int("SCRAPER_SITEMAP_MAX_URLS", 50000)
+
+        # Streaming fetch limits (fetch/http.py)
+        self.fetch_max_bytes = _env_int("SCRAPER_FETCH_MAX_BYTES", 8 * 1024 * 1024)
+        self.fetch_stop_at_html_end = _env_bool("SCRAPER_FETCH_STOP_AT_HTML_END", True)
+
+        # On-disk response cache (fetch/cache.py)
+        self.cache_enabled = _env_bool("SCRAPER_CACHE_ENABLED", True)
+        self.cache_dir = os.getenv("SCRAPER_CACHE_DIR", ".cache/http")
+        self.cache_ttl = _env_int("SCRAPER_CACHE_TTL", 24 * 60 * 60)
+        self.cache_max_bytes = _env_int("SCRAPER_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+
+        # Whole-pipeline result cache (api/result_cache.py)
+        self.result_cache_enabled = _env_bool("SCRAPER_RESULT_CACHE_ENABLED", True)
+        self.result_cache_dir = os.getenv("SCRAPER_RESULT_CACHE_DIR", ".cache/results")
+        self.result_cache_max_bytes = _env_int("SCRAPER_RESULT_CACHE_MAX_BYTES", 128 * 1024 * 1024)
+
+        # /scrape/batch (api/batch.py)
+        self.batch_max_concurrency = _env_int("SCRAPER_BATCH_MAX_CONCURRENCY", 10)
+        self.batch_per_domain_limit = _env_int("SCRAPER_BATCH_PER_DOMAIN_LIMIT", 2)
+
+        # Background scrape jobs (jobs/)
+        self.data_dir = os.getenv("SCRAPER_DATA_DIR", ".data")
+        self.jobs_db = os.getenv("SCRAPER_JOBS_DB", os.path.join(self.data_dir, "jobs.sqlite3"))
+        self.job_workers = _env_int("SCRAPER_JOB_WORKERS", 2)
+        self.job_workers_in_server = _env_bool("SCRAPER_JOB_WORKERS_IN_SERVER", True)
+        self.job_poll_interval = _env_int("SCRAPER_JOB_POLL_INTERVAL", 1)
+        # A running job whose worker hasn't renewed its lease for this long is requeued
+        self.job_lease_seconds = _env_int("SCRAPER_JOB_LEASE_SECONDS", 60)
+
+        # Directory snapshots for /scrape/diff (api/snapshots.py)
+        self.snapshots_db = os.getenv("SCRAPER_SNAPSHOTS_DB", os.path.join(self.data_dir, "snapshots.sqlite3"))
+
+        # Profile enrichment store (normalize/enrichment_store.py)
+        self.enrichment_store_enabled = _env_bool("SCRAPER_ENRICHMENT_STORE_ENABLED", True)
+        self.enrichment_db = os.getenv("SCRAPER_ENRICHMENT_DB", os.path.join(self.data_dir, "enrichment.sqlite3"))
+        self.enrichment_ttl = _env_int("SCRAPER_ENRICHMENT_TTL", 6 * 24 * 60 * 60)
+        # Email pattern inference (normalize/email_patterns.py): skip profile fetches once one
+        # address pattern explains at least min_confidence of min_support or more known emails;
+        # after every confirm_every inferences the next covered profile is fetched to check the pattern (0: never)
+        self.email_pattern_inference = _env_bool("SCRAPER_EMAIL_PATTERN_INFERENCE", True)
+        self.email_pattern_min_support = _env_int("SCRAPER_EMAIL_PATTERN_MIN_SUPPORT", 3)
+        self.email_pattern_min_confidence = _env_float("SCRAPER_EMAIL_PATTERN_MIN_CONFIDENCE", 0.8)
+        self.email_pattern_confirm_every = _env_int("SCRAPER_EMAIL_PATTERN_CONFIRM_EVERY", 5)
+
+        # Extraction process pool (extract/executor.py); 0 runs extraction on a thread instead
+        self.parse_workers = _env_int("SCRAPER_PARSE_WORKERS", 2)
+
+        # Headless rendering (fetch/browser.py)
+        self.browser_prelaunch = _env_bool("SCRAPER_BROWSER_PRELAUNCH", True)
+        self.browser_pool_size = _env_int("SCRAPER_BROWSER_POOL_SIZE", 2)
+        self.browser_idle_timeout = _env_int("SCRAPER_BROWSER_IDLE_TIMEOUT", 300)
+        self.browser_blocked_resources = os.getenv("SCRAPER_BROWSER_BLOCKED_RESOURCES", "image,font,media").split(",")
+
+settings = Settings()
@@ -0,0 +1,89 @@
+import re
+from functools import cached_property
+from typing import Dict, List, Optional, Pattern, Union
+
+from bs4 import BeautifulSoup, Tag
+
+class ParsedDocument:
+    """
+    A fetched page parsed once with lxml and shared by every extraction strategy.
+    The tree is built on first access to `soup`; lookups strategies repeat
+    (script tags by type, tables, mailto anchors, class names) are indexed lazily.
+    """
+
+    def __init__(self, html: str, url: str = ""):
+        self.html = html or ""
+        self.url = url
+
+    @classmethod
+    def ensure(cls, html_or_doc: Union[str, "ParsedDocument"], url: str = "") -> "ParsedDocument":
+        """Accept raw HTML or an existing document so strategies work either way"""
+        if isinstance(html_or_doc, ParsedDocument):
+            return html_or_doc
+        return cls(html_or_doc, url)
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "lxml")
+
+    @property
+    def is_parsed(self) -> bool:
+        return "soup" in self.__dict__
+
+    @cached_property
+    def scripts_by_type(self) -> Dict[str, List[Tag]]:
+        """<script> tags keyed by lowercased type attribute ('' when absent)"""
+        index: Dict[str, List[Tag]] = {}
+        for script in self.soup.find_all("script"):
+            script_type = (script.get("type") or "").strip().lower()
+            index.setdefault(script_type, []).append(script)
+        return index
+
+    def scripts(self, script_type: str) -> List[Tag]:
+        return self.scripts_by_type.get(script_type.lower(), [])
+
+    @cached_property
+    def tables(self) -> List[Tag]:
+        return self.soup.find_all("table")
+
+    @cached_property
+    def mailto_anchors(self) -> List[Tag]:
+        return [
+            a for a in self.soup.find_all("a", href=True)
+            if a["href"].strip().lower().startswith("mailto:")
+        ]
+
+    @cached_property
+    def _class_index(self) -> Dict[str, List[tuple]]:
+        """Lowercased class name -> [(document position, element)]"""
+        index: Dict[str, List[tuple]] = {}
+        for position, element in enumerate(self.soup.find_all(class_=True)):
+            for class_name in element.get("class", []):
+                index.setdefault(class_name.lower(), []).append((position, element))
+        return index
+
+    def by_class(self, *class_names: str, tag_name: Optional[str] = None) -> List[Tag]:
+        """Elements carrying any of the given classes, in document order"""
+        hits = {}
+        for class_name in class_names:
+            for position, element in self._class_index.get(class_name.lower(), []):
+                hits[position] = element
+        return self._ordered(hits, tag_name)
+
+    def by_class_pattern(self, pattern: Union[str, Pattern], tag_name: Optional[str] = None) -> List[Tag]:
+        """Elements with any class name matching pattern, in document order"""
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern, re.I)
+        hits = {}
+        for class_name, entries in self._class_index.items():
+            if pattern.search(class_name):
+                for position, element in entries:
+                    hits[position] = element
+        return self._ordered(hits, tag_name)
+
+    @staticmethod
+    def _ordered(hits: Dict[int, Tag], tag_name: Optional[str]) -> List[Tag]:
+        return [
+            element for _, element in sorted(hits.items())
+            if tag_name is None or element.name == tag_name
+        ]
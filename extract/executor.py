@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from metrics import registry
+
+def _warm_worker():
+    """Process initializer: import and exercise the parsers once so the first job doesn't pay for it"""
+    from bs4 import BeautifulSoup
+    import lxml.etree  # noqa: F401
+    import extract.runner  # noqa: F401
+    BeautifulSoup("<html><body><table><tr><td>warm</td></tr></table></body></html>", "lxml")
+
+def _ping() -> bool:
+    return True
+
+def _extract(html_bytes: bytes, source_url: str, strategy_names: List[str], mode: str) -> Dict[str, Any]:
+    """Worker side: parse raw bytes once and run the strategies"""
+    from extract.document import ParsedDocument
+    from extract.runner import run_strategies
+    document = ParsedDocument(html_bytes.decode("utf-8"), source_url)
+    return run_strategies(document, source_url, strategy_names, mode=mode)
+
+def _extract_pages(strategy_name: str, pages: List[Tuple[str, bytes]]) -> List[List[Dict[str, Any]]]:
+    """Worker side: run one known-good strategy over further pages"""
+    from extract.document import ParsedDocument
+    from extract.runner import run_strategy
+    return [
+        run_strategy(strategy_name, ParsedDocument(html_bytes.decode("utf-8"), page_url), page_url)["leads"]
+        for page_url, html_bytes in pages
+    ]
+
+class ParseExecutor:
+    """
+    Runs CPU-bound extraction off the event loop.
+
+    With workers > 0, jobs go to a process pool whose workers preload lxml and
+    bs4; only raw HTML bytes and plain lead dicts cross the process boundary.
+    With workers == 0, jobs run on a thread via asyncio.to_thread.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = settings.parse_workers if workers is None else workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        """Spawn and warm the worker processes (called from the app lifespan)"""
+        pool = self._get_pool()
+        if pool is None:
+            return
+        try:
+            for future in [pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        except BrokenProcessPool as e:
+            # Workers can't start here (e.g. no importable __main__): extract on threads instead
+            self.last_error = f"Process pool unavailable: {e}"
+            self.shutdown()
+            self.workers = 0
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn, not fork: the server process has running threads and an event loop
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker
+            )
+        return self._pool
+
+    async def _run(self, fn, *args):
+        self._submitted += 1
+        self._pending += 1
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                result = await asyncio.to_thread(fn, *args)
+            else:
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+                except BrokenProcessPool:
+                    # A worker died (OOM, segfault in a parser): rebuild the pool, run this job on a thread
+                    self._pool = None
+                    result = await asyncio.to_thread(fn, *args)
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    async def extract(self, html: str, source_url: str, strategy_names: List[str], mode: str = "first") -> Dict[str, Any]:
+        """run_strategies() for one page in a worker"""
+        return await self._run(_extract, (html or "").encode("utf-8"), source_url, list(strategy_names), mode)
+
+    async def extract_pages(self, strategy_name: str, pages: List[Tuple[str, str]]) -> List[List[Dict[str, Any]]]:
+        """Leads for each further page, using the strategy that matched the first one"""
+        if not pages:
+            return []
+        payload = [(page_url, (page_html or "").encode("utf-8")) for page_url, page_html in pages]
+        return await self._run(_extract_pages, strategy_name, payload)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters"""
+        in_flight = min(self._pending, self.workers) if self.workers > 0 else self._pending
+        return {
+            "mode": "process" if self.workers > 0 else "thread",
+            "workers": self.workers,
+            "pending": self._pending,
+            "in_flight": in_flight,
+            "queue_depth": max(0, self._pending - in_flight),
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "last_error": self.last_error
+        }
+
+parse_executor = ParseExecutor()
+registry.gauge("scraper_parse_queue_depth", "Extraction jobs waiting for a worker", lambda: parse_executor.metrics()["queue_depth"])
+registry.gauge("scraper_parse_in_flight", "Extraction jobs running in workers", lambda: parse_executor.metrics()["in_flight"])
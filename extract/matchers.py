@@ -0,0 +1,58 @@
+import re
+from typing import Iterable, List, Optional, Set
+
+# Precompiled patterns shared by the extraction strategies, enrichment and normalization
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+EMAIL_FULL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PERSON_CLASS_RE = re.compile(r'(faculty|person|staff|member|profile)', re.I)
+
+def find_email(text: Optional[str]) -> Optional[str]:
+    """First email-looking token in text; skips the regex scan when there is no '@'"""
+    if not text or '@' not in text:
+        return None
+    match = EMAIL_RE.search(text)
+    return match.group() if match else None
+
+class KeywordMatcher:
+    """
+    Single-pass, case-insensitive multi-keyword matcher.
+
+    All keywords are compiled into one alternation so a string is scanned once
+    by the regex engine, instead of once per keyword with `any(k in s.lower() ...)`
+    (which also allocates a lowered copy of the text on every call).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        # Longest first so overlapping keywords report the most specific hit
+        alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+        self._pattern = re.compile(alternation, re.IGNORECASE)
+
+    def search(self, text: Optional[str]) -> Optional[str]:
+        """First keyword found in text (lowercased), or None"""
+        if not text:
+            return None
+        match = self._pattern.search(text)
+        return match.group().lower() if match else None
+
+    def matches(self, text: Optional[str]) -> bool:
+        return bool(text) and self._pattern.search(text) is not None
+
+    def find_all(self, text: Optional[str]) -> Set[str]:
+        """Every distinct keyword found in text (non-overlapping scan)"""
+        if not text:
+            return set()
+        return {match.lower() for match in self._pattern.findall(text)}
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher({list(self.keywords)!r})"
+
+TITLE_KEYWORDS: List[str] = ['professor', 'instructor', 'lecturer', 'chair', 'director']
+SOCIAL_KEYWORDS: List[str] = ['facebook', 'twitter', 'linkedin', 'instagram']
+FACULTY_KEYWORDS: List[str] = ['faculty', 'directory', 'staff', 'people']
+MUSIC_KEYWORDS: List[str] = ['music', 'conservatory', 'arts']
+
+TITLE_MATCHER = KeywordMatcher(TITLE_KEYWORDS)
+SOCIAL_MATCHER = KeywordMatcher(SOCIAL_KEYWORDS)
+FACULTY_MATCHER = KeywordMatcher(FACULTY_KEYWORDS)
+MUSIC_MATCHER = KeywordMatcher(MUSIC_KEYWORDS)
@@ -0,0 +1,160 @@
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+# Anchors and <link> tags scanned straight from the raw HTML (no DOM needed)
+_ANCHOR_RE = re.compile(r'<a\b([^>]*)>(.*?)</a\s*>', re.IGNORECASE | re.DOTALL)
+_LINK_TAG_RE = re.compile(r'<link\b([^>]*)>', re.IGNORECASE)
+_ATTR_RE = re.compile(r'([a-zA-Z_:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Unambiguous page parameters only: WordPress uses ?p= for post ids
+PAGE_PARAMS = ('page', 'paged', 'pagenum', 'page_num')
+_PAGE_PATH_RE = re.compile(r'/page/(\d+)/?$', re.IGNORECASE)
+
+def _attrs(tag_body: str) -> Dict[str, str]:
+    attrs = {}
+    for name, dq, sq, bare in _ATTR_RE.findall(tag_body):
+        attrs[name.lower()] = dq or sq or bare
+    return attrs
+
+def _same_site(url: str, other: str) -> bool:
+    return urlparse(url).netloc.lower() == urlparse(other).netloc.lower()
+
+def _page_number(url: str) -> Tuple[Optional[str], Optional[int]]:
+    """(page parameter or 'path', page number) if the URL carries a page number"""
+    parsed = urlparse(url)
+    for key, value in parse_qsl(parsed.query, keep_blank_values=True):
+        if key.lower() in PAGE_PARAMS and value.isdigit():
+            return key, int(value)
+    match = _PAGE_PATH_RE.search(parsed.path)
+    if match:
+        return 'path', int(match.group(1))
+    return None, None
+
+def _with_page(url: str, key: str, number: int) -> str:
+    """Rewrite a page URL template to point at page `number`"""
+    parsed = urlparse(url)
+    if key == 'path':
+        path = _PAGE_PATH_RE.sub(f'/page/{number}/', parsed.path)
+        return urlunparse(parsed._replace(path=path))
+    query = [(k, str(number) if k == key else v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)]
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+def _strip_fragment(url: str) -> str:
+    return urlunparse(urlparse(url)._replace(fragment=''))
+
+def detect_pagination(html: str, url: str, max_pages: int = 5) -> List[str]:
+    """
+    Find further pages of a paginated directory listing.
+    Looks at rel=next links, numbered page links and ?page= / /page/N/ URL patterns.
+    Returns up to max_pages - 1 page URLs after `url`, in page order.
+    """
+    if not html or max_pages <= 1:
+        return []
+
+    current = _strip_fragment(url)
+    _, current_number = _page_number(current)
+    current_number = current_number or 1
+
+    rel_next: Optional[str] = None
+    numbered: Dict[int, str] = {}
+    template: Optional[Tuple[str, str]] = None
+
+    for match in _LINK_TAG_RE.finditer(html):
+        attrs = _attrs(match.group(1))
+        if 'next' in attrs.get('rel', '').lower().split() and attrs.get('href'):
+            rel_next = _strip_fragment(urljoin(url, attrs['href']))
+            break
+
+    for match in _ANCHOR_RE.finditer(html):
+        attrs = _attrs(match.group(1))
+        href = attrs.get('href')
+        if not href or href.startswith(('#', 'mailto:', 'javascript:')):
+            continue
+        target = _strip_fragment(urljoin(url, href))
+        if target == current or not _same_site(url, target):
+            continue
+
+        if rel_next is None and 'next' in attrs.get('rel', '').lower().split():
+            rel_next = target
+
+        key, number = _page_number(target)
+        text = _TAG_RE.sub('', match.group(2)).strip()
+        if key is not None:
+            numbered.setdefault(number, target)
+            template = template or (target, key)
+        elif text.isdigit() and int(text) > 1:
+            # Numbered link without a recognisable page parameter
+            numbered.setdefault(int(text), target)
+
+    if template is None and rel_next is None and len(numbered) < 2:
+        # A lone digit link is more likely a footnote than a pager
+        numbered = {}
+
+    if template and (rel_next or len(numbered) >= 2):
+        # Fill gaps in "1 2 3 ... 20" style pagers from the URL template; a single
+        # page-numbered link is not a pager, so it never invents pages on its own
+        last = min(max(numbered), current_number + max_pages - 1)
+        for number in range(current_number + 1, last + 1):
+            numbered.setdefault(number, _with_page(template[0], template[1], number))
+
+    pages = [numbered[n] for n in sorted(numbered) if n > current_number]
+    if rel_next and rel_next not in pages:
+        pages.insert(0, rel_next)
+    pages = [page for page in dict.fromkeys(pages) if page != current]
+    return pages[:max_pages - 1]
+
+async def crawl_pages(url: str, html: str, max_pages: int,
+                      fetch: Optional[Callable[[str], Awaitable[Tuple[str, dict]]]] = None) -> List[Tuple[str, str, dict]]:
+    """
+    Fetch the remaining pages of a paginated directory concurrently.
+    Pages discovered on fetched pages (e.g. a rel=next chain) are fetched in
+    later rounds until max_pages is reached.
+    Returns [(page_url, html, fetch_notes)] for pages after the first.
+    """
+    if fetch is None:
+        from fetch.http import fetch_html
+        fetch = fetch_html
+
+    seen = {_strip_fragment(url)}
+    fetched: List[Tuple[str, str, dict]] = []
+    frontier = [(url, html)]
+
+    while frontier and len(seen) < max_pages:
+        candidates = []
+        for page_url, page_html in frontier:
+            for candidate in detect_pagination(page_html, page_url, max_pages):
+                if candidate not in seen and len(seen) < max_pages:
+                    candidates.append(candidate)
+                    seen.add(candidate)
+        if not candidates:
+            break
+        results = await asyncio.gather(*(fetch(candidate) for candidate in candidates))
+        frontier = []
+        for candidate, (page_html, notes) in zip(candidates, results):
+            fetched.append((candidate, page_html, notes))
+            if page_html:
+                frontier.append((candidate, page_html))
+
+    return fetched
+
+def merge_page_leads(pages_leads: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Concatenate (page_url, leads) in page order, dropping repeats of the same
+    person. Each lead's directory_url is the page it was found on.
+    """
+    merged = []
+    seen = set()
+    for page_url, leads in pages_leads:
+        for lead in leads:
+            key = (
+                ' '.join(str(lead.get('name') or '').lower().split()),
+                (lead.get('profile_url') or '').rstrip('/').lower()
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append({**lead, 'directory_url': page_url})
+    return merged
@@ -0,0 +1,68 @@
+import time
+from typing import Any, Dict, List
+
+from extract.document import ParsedDocument
+from extract.strategies import STRATEGIES
+
+# Fields a complete lead carries; coverage is the share of these that are filled
+COVERAGE_FIELDS = ('name', 'title', 'email', 'profile_url')
+
+def run_strategy(name: str, document: ParsedDocument, source_url: str) -> Dict[str, Any]:
+    """Run one strategy, never raising; returns {"strategy", "leads", "ms"}"""
+    start = time.perf_counter()
+    try:
+        leads = STRATEGIES[name](document, source_url) or []
+    except Exception:
+        leads = []
+    return {"strategy": name, "leads": leads, "ms": round((time.perf_counter() - start) * 1000, 3)}
+
+def score_leads(leads: List[Dict[str, Any]]) -> float:
+    """Mean of the strategies' diagnostics.confidence and of field coverage, in [0, 1]"""
+    if not leads:
+        return 0.0
+    confidence = 0.0
+    coverage = 0.0
+    for lead in leads:
+        confidence += (lead.get('diagnostics') or {}).get('confidence', 0.5)
+        filled = sum(1 for field in COVERAGE_FIELDS if lead.get(field) or (field == 'email' and lead.get('email_raw')))
+        coverage += filled / len(COVERAGE_FIELDS)
+    return round(0.5 * confidence / len(leads) + 0.5 * coverage / len(leads), 4)
+
+def run_strategies(document: ParsedDocument, source_url: str, strategy_names: List[str],
+                   mode: str = "first") -> Dict[str, Any]:
+    """
+    Run the plan's strategies over one parsed document.
+
+    mode="first": in order, stopping at the first strategy with results.
+    mode="best":  all strategies, one after another; the result with the
+                  highest score_leads() wins (ties go to plan order). They are
+                  pure-Python parsing bound by the GIL, so threads would only
+                  interleave them; parallelism comes from the parse workers
+                  (extract/executor.py) running separate scrapes.
+
+    Returns {"strategy", "leads", "timings": {name: ms}, "scores": {name: score}}
+    """
+    names = [name for name in strategy_names if name in STRATEGIES]
+    timings: Dict[str, float] = {}
+    scores: Dict[str, float] = {}
+
+    if mode != "best":
+        for name in names:
+            result = run_strategy(name, document, source_url)
+            timings[name] = result["ms"]
+            if result["leads"]:
+                return {"strategy": name, "leads": result["leads"], "timings": timings, "scores": scores}
+        return {"strategy": None, "leads": [], "timings": timings, "scores": scores}
+
+    results = [run_strategy(name, document, source_url) for name in names]
+
+    best = None
+    for result in results:
+        timings[result["strategy"]] = result["ms"]
+        scores[result["strategy"]] = score_leads(result["leads"])
+        if result["leads"] and (best is None or scores[result["strategy"]] > scores[best["strategy"]]):
+            best = result
+
+    if best is None:
+        return {"strategy": None, "leads": [], "timings": timings, "scores": scores}
+    return {"strategy": best["strategy"], "leads": best["leads"], "timings": timings, "scores": scores}
@@ -1 +1,13 @@
 
+from .json_ld import extract_json_ld_people
+from .directory_table import extract_directory_table
+from .faculty_generic import extract_faculty_generic
+
+# Strategy name (as used in AnalysisPlan.strategies) -> extractor(html_or_document, source_url)
+STRATEGIES = {
+    'json_ld': extract_json_ld_people,
+    'directory_table': extract_directory_table,
+    'faculty_generic': extract_faculty_generic,
+}
+
+__all__ = ['STRATEGIES', 'extract_json_ld_people', 'extract_directory_table', 'extract_faculty_generic']
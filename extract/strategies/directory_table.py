@@ -1,21 +1,23 @@
 
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
-import re
+from typing import List, Dict, Any, Union
+from extract.document import ParsedDocument
+from extract.matchers import PERSON_CLASS_RE, TITLE_MATCHER, find_email
 
-def extract_directory_table(html_content: str, source_url: str) -> List[Dict[str, Any]]:
+def extract_directory_table(html_content: Union[str, ParsedDocument], source_url: str) -> List[Dict[str, Any]]:
     """
     Extract faculty information from HTML tables or lists
+    Accepts raw HTML or a shared ParsedDocument
     """
-    if not html_content:
+    doc = ParsedDocument.ensure(html_content, source_url)
+    if not doc.html:
         return []
     
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = doc.soup
         faculty_data = []
         
         # Strategy 1: Look for tables with faculty data
-        tables = soup.find_all('table')
+        tables = doc.tables
         for table in tables:
             rows = table.find_all('tr')
             for row in rows[1:]:  # Skip header row
@@ -25,7 +27,7 @@ def extract_directory_table(html_content: str, source_url: str) -> List[Dict[str
         
         # Strategy 2: Look for div-based directory listings
         if not faculty_data:
-            faculty_data.extend(extract_from_div_listings(soup, source_url))
+            faculty_data.extend(extract_from_div_listings(doc, source_url))
         
         # Strategy 3: Look for ul/li based listings  
         if not faculty_data:
@@ -59,12 +61,11 @@ def extract_person_from_table_row(row, source_url: str) -> Dict[str, Any]:
             cell_text = cell.get_text(strip=True)
             
             # Extract email
-            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', cell_text)
-            if email_match and not email:
-                email = email_match.group()
+            if not email:
+                email = find_email(cell_text)
             
             # Extract title (if it contains common title words)
-            if any(title_word in cell_text.lower() for title_word in ['professor', 'instructor', 'lecturer', 'chair', 'director']):
+            if TITLE_MATCHER.matches(cell_text):
                 title = cell_text
                 
             # Extract profile URL
@@ -87,18 +88,22 @@ def extract_person_from_table_row(row, source_url: str) -> Dict[str, Any]:
             'profile_url': profile_url,
             'directory_url': source_url,
             'socials': [],
-            'bio_snippet': None
+            'bio_snippet': None,
+            'diagnostics': {
+                'source_strategy': 'directory_table',
+                'confidence': 0.75  # table rows are the most regular layout
+            }
         }
         
     except Exception:
         return None
 
-def extract_from_div_listings(soup, source_url: str) -> List[Dict[str, Any]]:
+def extract_from_div_listings(doc: ParsedDocument, source_url: str) -> List[Dict[str, Any]]:
     """Extract from div-based faculty listings"""
     faculty_data = []
     
     # Look for divs that might contain faculty info
-    potential_divs = soup.find_all('div', class_=re.compile(r'(faculty|person|staff|member|profile)', re.I))
+    potential_divs = doc.by_class_pattern(PERSON_CLASS_RE, tag_name='div')
     
     for div in potential_divs:
         person_data = extract_person_from_div(div, source_url)
@@ -142,8 +147,7 @@ def extract_person_from_div(div, source_url: str) -> Dict[str, Any]:
             return None
             
         # Extract email
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        email = email_match.group() if email_match else None
+        email = find_email(text)
         
         # Extract profile URL
         link = div.find('a')
@@ -161,11 +165,11 @@ def extract_person_from_div(div, source_url: str) -> Dict[str, Any]:
         
         # Extract title
         title = None
-        if any(title_word in text.lower() for title_word in ['professor', 'instructor', 'lecturer', 'chair', 'director']):
+        if TITLE_MATCHER.matches(text):
             # Try to extract the line containing the title
             lines = text.split('\n')
             for line in lines:
-                if any(title_word in line.lower() for title_word in ['professor', 'instructor', 'lecturer', 'chair', 'director']):
+                if TITLE_MATCHER.matches(line):
                     title = line.strip()
                     break
         
@@ -176,7 +180,11 @@ def extract_person_from_div(div, source_url: str) -> Dict[str, Any]:
             'profile_url': profile_url,
             'directory_url': source_url,
             'socials': [],
-            'bio_snippet': None
+            'bio_snippet': None,
+            'diagnostics': {
+                'source_strategy': 'directory_table',
+                'confidence': 0.65
+            }
         }
         
     except Exception:
@@ -195,8 +203,7 @@ def extract_person_from_list_item(item, source_url: str) -> Dict[str, Any]:
         name = parts[0].strip()
         
         # Extract email
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        email = email_match.group() if email_match else None
+        email = find_email(text)
         
         # Extract profile URL
         link = item.find('a')
@@ -219,7 +226,11 @@ def extract_person_from_list_item(item, source_url: str) -> Dict[str, Any]:
             'profile_url': profile_url,
             'directory_url': source_url,
             'socials': [],
-            'bio_snippet': None
+            'bio_snippet': None,
+            'diagnostics': {
+                'source_strategy': 'directory_table',
+                'confidence': 0.5  # list items are often navigation
+            }
         }
         
     except Exception:
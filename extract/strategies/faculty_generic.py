@@ -1,76 +1,129 @@
-from bs4 import BeautifulSoup
+from typing import Dict, Optional, Set, Tuple, Union
 from urllib.parse import urljoin
+from bs4 import Tag
+from extract.document import ParsedDocument
+from extract.matchers import SOCIAL_MATCHER
 
-def extract_faculty_generic(html_content: str, base_url: str):
+# Common containers for faculty listings
+CONTAINER_SELECTOR = ".faculty-card, .faculty, .person, .profile-card, .staff-card, li, .card"
+
+# Site chrome: person-like markup in here is menus and link lists, not people
+LANDMARK_ROLES = frozenset({"navigation", "banner", "contentinfo"})
+
+# <header>/<footer> inside these are part of the content (e.g. a card's header), not page chrome
+SECTIONING = frozenset({"article", "aside", "main", "nav", "section"})
+
+NAME_TAGS, NAME_CLASSES = frozenset({"h1", "h2", "h3"}), frozenset({"faculty-name", "name"})
+TITLE_TAGS, TITLE_CLASSES = frozenset({"h4", "p"}), frozenset({"faculty-title", "title"})
+BIO_TAGS, BIO_CLASSES = frozenset({"p"}), frozenset({"bio", "description"})
+
+def _in_chrome(tag: Tag, memo: Dict[int, Tuple[bool, bool]]) -> bool:
+    """
+    Whether `tag` sits in a navigation, banner or contentinfo region.
+    memo caches (in_chrome, has_sectioning_ancestor) per element, so
+    containers sharing ancestors walk each ancestor once.
+    """
+    chain = []
+    node = tag
+    while node is not None and id(node) not in memo:
+        chain.append(node)
+        node = node.parent
+    in_chrome, sectioned = memo[id(node)] if node is not None else (False, False)
+    for node in reversed(chain):
+        if not in_chrome:
+            role = (node.get("role") or "").strip().lower()
+            in_chrome = (node.name == "nav" or role in LANDMARK_ROLES
+                         or (node.name in ("header", "footer") and not sectioned))
+        sectioned = sectioned or node.name in SECTIONING
+        memo[id(node)] = (in_chrome, sectioned)
+    return in_chrome
+
+def _scan_container(container: Tag, base_url: str) -> Optional[Dict]:
+    """
+    Read every field in one walk over the container's descendants. The first
+    match in document order wins, as each field's select_one used to.
+    """
+    name_tag = title_tag = email_tag = link_tag = bio_tag = None
+    socials = []
+
+    for tag in container.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        classes = tag.get("class") or ()
+        if name_tag is None and (tag.name in NAME_TAGS or NAME_CLASSES.intersection(classes)):
+            name_tag = tag
+        if title_tag is None and (tag.name in TITLE_TAGS or TITLE_CLASSES.intersection(classes)):
+            title_tag = tag
+        if bio_tag is None and (tag.name in BIO_TAGS or BIO_CLASSES.intersection(classes)):
+            bio_tag = tag
+        if tag.name == "a" and tag.has_attr("href"):
+            href = tag.get("href")
+            if link_tag is None:
+                link_tag = tag
+            if email_tag is None and href.startswith("mailto:"):
+                email_tag = tag
+            # Grab any obvious social links
+            if SOCIAL_MATCHER.matches(href):
+                socials.append(href)
+
+    name = name_tag.get_text(strip=True) if name_tag else None
+    if not name:
+        return None
+
+    profile_url = None
+    if link_tag:
+        href = link_tag.get("href")
+        if href and not href.startswith("mailto:"):
+            profile_url = urljoin(base_url, href)
+
+    return {
+        "name": name,
+        "title": title_tag.get_text(strip=True) if title_tag else None,
+        "email_raw": email_tag.get("href").replace("mailto:", "").strip() if email_tag else None,
+        "profile_url": profile_url,
+        "directory_url": base_url,
+        "socials": socials,
+        "bio_snippet": bio_tag.get_text(strip=True)[:200] if bio_tag else None,
+        "diagnostics": {
+            "source_strategy": "faculty_generic",
+            "confidence": 0.6  # base confidence, adjust if needed
+        }
+    }
+
+def extract_faculty_generic(html_content: Union[str, ParsedDocument], base_url: str):
     """
     Generic faculty directory parser for card/list layouts.
     Looks for names, titles, emails, and profile links using common HTML patterns.
+    Accepts raw HTML or a shared ParsedDocument.
     Returns a list of RawLead dicts.
+
+    Containers inside navigation, site header and footer regions are skipped,
+    and a container holding another person-like container is left to the inner
+    one, so each person is read once and nested menus are not re-scanned.
     """
 
-    soup = BeautifulSoup(html_content, "lxml")
-    raw_leads = []
-
-    # Common containers for faculty listings
-    containers = soup.select(
-        ".faculty-card, .faculty, .person, .profile-card, .staff-card, li, .card"
-    )
-
-    for container in containers:
-        name = None
-        title = None
-        email_raw = None
-        profile_url = None
-        socials = []
-        bio_snippet = None
-
-        # Try to find a name
-        name_tag = container.select_one("h1, h2, h3, .faculty-name, .name")
-        if name_tag:
-            name = name_tag.get_text(strip=True)
-
-        # Try to find a title
-        title_tag = container.select_one(".faculty-title, .title, h4, p")
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-
-        # Try to find an email
-        email_tag = container.select_one('a[href^="mailto:"]')
-        if email_tag:
-            email_raw = email_tag.get("href").replace("mailto:", "").strip()
-
-        # Try to find a profile link
-        link_tag = container.select_one("a[href]")
-        if link_tag:
-            href = link_tag.get("href")
-            if href and not href.startswith("mailto:"):
-                profile_url = urljoin(base_url, href)
-
-        # Grab any obvious social links
-        for a in container.select("a[href]"):
-            href = a.get("href")
-            if any(s in href.lower() for s in ["facebook", "twitter", "linkedin", "instagram"]):
-                socials.append(href)
+    soup = ParsedDocument.ensure(html_content, base_url).soup
+    containers = soup.select(CONTAINER_SELECTOR)
+    chrome: Dict[int, Tuple[bool, bool]] = {}
+
+    container_ids = {id(container) for container in containers}
+    holds_person: Set[int] = set()
+    leads: Dict[int, Dict] = {}
+
+    # Descendants come after their ancestors in document order, so walking
+    # backwards resolves inner containers before the ones wrapping them
+    for position in range(len(containers) - 1, -1, -1):
+        container = containers[position]
+        if id(container) in holds_person or _in_chrome(container, chrome):
+            continue
+        lead = _scan_container(container, base_url)
+        if lead is None:
+            continue
+        leads[position] = lead
+        for parent in container.parents:
+            if id(parent) in container_ids:
+                if id(parent) in holds_person:
+                    break
+                holds_person.add(id(parent))
 
-        # Grab a short bio snippet if present
-        bio_tag = container.select_one(".bio, .description, p")
-        if bio_tag:
-            bio_snippet = bio_tag.get_text(strip=True)[:200]
-
-        # Build raw lead dict if we have at least a name
-        if name:
-            raw_leads.append({
-                "name": name,
-                "title": title,
-                "email_raw": email_raw,
-                "profile_url": profile_url,
-                "directory_url": base_url,
-                "socials": socials,
-                "bio_snippet": bio_snippet,
-                "diagnostics": {
-                    "source_strategy": "faculty_generic",
-                    "confidence": 0.6  # base confidence, adjust if needed
-                }
-            })
-
-    return raw_leads
+    return [leads[position] for position in sorted(leads)]
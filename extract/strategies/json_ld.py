@@ -1,138 +1,52 @@
-
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
 import json
 import re
+from typing import Iterator, List, Dict, Any, Union
+from extract.document import ParsedDocument
 
-def extract_json_ld_people(html: str, base_url: str) -> List[Dict]:
-    """
-    Extract Person schema from JSON-LD structured data.
-    Returns list of raw lead dictionaries.
-    """
-    soup = BeautifulSoup(html, 'html.parser')
-    leads = []
-    
-    # Find all JSON-LD script tags
-    json_scripts = soup.find_all('script', type='application/ld+json')
-    
-    for script in json_scripts:
-        try:
-            data = json.loads(script.string)
-            
-            # Handle both single objects and arrays
-            if isinstance(data, dict):
-                data = [data]
-            elif not isinstance(data, list):
-                continue
-                
-            for item in data:
-                if isinstance(item, dict):
-                    # Check if this is a Person or contains Person data
-                    persons = _extract_persons_from_item(item)
-                    for person in persons:
-                        lead = _convert_person_to_lead(person, base_url)
-                        if lead:
-                            leads.append(lead)
-                            
-        except (json.JSONDecodeError, KeyError, TypeError):
-            # Skip malformed JSON-LD
-            continue
-    
-    return leads
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
-def _extract_persons_from_item(item: Dict) -> List[Dict]:
-    """Extract Person objects from a JSON-LD item"""
-    persons = []
-    
-    # Direct Person object
-    if item.get('@type') == 'Person':
-        persons.append(item)
-    
-    # Array of Person objects  
-    elif item.get('@type') == 'ItemList' and 'itemListElement' in item:
-        for element in item['itemListElement']:
-            if isinstance(element, dict) and element.get('@type') == 'Person':
-                persons.append(element)
-    
-    # Organization with members
-    elif item.get('@type') == 'Organization' and 'member' in item:
-        members = item['member']
-        if not isinstance(members, list):
-            members = [members]
-        for member in members:
-            if isinstance(member, dict) and member.get('@type') == 'Person':
-                persons.append(member)
-    
-    return persons
+# Tag-aware scan for <script type="application/ld+json"> bodies on the raw text
+_JSON_LD_SCRIPT = re.compile(
+    r'<script\b[^>]*?\btype\s*=\s*["\']?\s*application/ld\+json\b[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_WRAPPER = re.compile(r'^\s*(?://\s*)?(?:<!--|<!\[CDATA\[)|(?://\s*)?(?:-->|\]\]>)\s*$')
 
-def _convert_person_to_lead(person: Dict, base_url: str) -> Optional[Dict]:
-    """Convert JSON-LD Person to raw lead format"""
-    try:
-        # Extract name (required)
-        name = person.get('name')
-        if not name:
-            return None
-            
-        # Extract other fields with fallbacks
-        title = (person.get('jobTitle') or 
-                person.get('hasOccupation', {}).get('name') if isinstance(person.get('hasOccupation'), dict) else None)
-        
-        email = person.get('email')
-        # Clean email if it has mailto: prefix
-        if email and email.startswith('mailto:'):
-            email = email[7:]
-            
-        profile_url = person.get('url') or person.get('sameAs')
-        if isinstance(profile_url, list) and profile_url:
-            profile_url = profile_url[0]
-            
-        # Extract social links
-        socials = []
-        same_as = person.get('sameAs', [])
-        if isinstance(same_as, str):
-            same_as = [same_as]
-        for link in same_as:
-            if any(social in link.lower() for social in ['twitter', 'facebook', 'linkedin', 'instagram']):
-                socials.append(link)
-        
-        return {
-            'name': name,
-            'title': title,
-            'email_raw': email,
-            'profile_url': profile_url,
-            'directory_url': base_url,
-            'socials': socials,
-            'bio_snippet': person.get('description'),
-            'diagnostics': {
-                'source_strategy': 'json_ld',
-                'confidence': 0.9  # High confidence for structured data
-            }
-        }
-        
-    except (KeyError, TypeError):
-        return None
-from bs4 import BeautifulSoup
-import json
-from typing import List, Dict, Any
+def iter_json_ld_blocks(html: str) -> Iterator[str]:
+    """
+    Yield the body of every JSON-LD script tag without building a DOM.
+    Pages with no JSON-LD cost a single substring search.
+    """
+    marker = html.find('ld+json')
+    if marker == -1:
+        return
+    # Resume the tag scan from the tag holding the first marker
+    start = max(html.rfind('<', 0, marker), 0)
+    for match in _JSON_LD_SCRIPT.finditer(html, start):
+        body = _WRAPPER.sub('', match.group(1)).strip()
+        if body:
+            yield body
 
-def extract_json_ld_people(html_content: str, source_url: str) -> List[Dict[str, Any]]:
+def extract_json_ld_people(html_content: Union[str, ParsedDocument], source_url: str) -> List[Dict[str, Any]]:
     """
     Extract faculty information from JSON-LD structured data
+    Accepts raw HTML or a shared ParsedDocument; scans the raw text, so the
+    document is never parsed on this path
     """
-    if not html_content:
+    html = html_content.html if isinstance(html_content, ParsedDocument) else html_content
+    if not html:
         return []
     
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Find all JSON-LD script tags
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
-        
         faculty_data = []
         
-        for script in json_ld_scripts:
+        for block in iter_json_ld_blocks(html):
             try:
-                data = json.loads(script.string)
+                data = _loads(block)
                 
                 # Handle both single objects and arrays
                 if isinstance(data, list):
@@ -152,7 +66,8 @@ def extract_json_ld_people(html_content: str, source_url: str) -> List[Dict[str,
                         nested_people = find_nested_people(item, source_url)
                         faculty_data.extend(nested_people)
                         
-            except json.JSONDecodeError:
+            except ValueError:
+                # Malformed JSON (json and orjson decode errors are ValueErrors)
                 continue
             except Exception:
                 continue
@@ -213,7 +128,11 @@ def extract_person_data(person: Dict[str, Any], source_url: str) -> Dict[str, An
             'profile_url': url,
             'directory_url': source_url,
             'socials': socials,
-            'bio_snippet': description
+            'bio_snippet': description,
+            'diagnostics': {
+                'source_strategy': 'json_ld',
+                'confidence': 0.9  # High confidence for structured data
+            }
         }
         
     except Exception:
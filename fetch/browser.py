@@ -0,0 +1,197 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, List, Optional, Tuple
+
+from config import settings
+from metrics import registry
+
+def playwright_available() -> bool:
+    """JS rendering needs the optional `playwright` package (and `playwright install chromium`)"""
+    try:
+        import playwright.async_api  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class BrowserPool:
+    """
+    One pre-launched headless Chromium with a pool of reusable browser contexts.
+    Contexts block images, fonts and media; contexts left idle longer than
+    `idle_timeout` seconds are closed and recreated on demand.
+    """
+
+    def __init__(self, size: Optional[int] = None, idle_timeout: Optional[int] = None,
+                 blocked_resources: Optional[List[str]] = None):
+        self.size = size or settings.browser_pool_size
+        self.idle_timeout = idle_timeout or settings.browser_idle_timeout
+        self.blocked_resources = {r.strip() for r in (blocked_resources or settings.browser_blocked_resources) if r.strip()}
+        self.last_error: Optional[str] = None
+        self._playwright = None
+        self._browser = None
+        self._idle: List[Tuple[Any, float]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None and self._loop is asyncio.get_running_loop()
+
+    async def start(self) -> bool:
+        """Launch the browser and pre-warm the contexts; returns False if rendering is unavailable"""
+        loop = asyncio.get_running_loop()
+        if self._start_lock is None or self._loop is not loop:
+            self._start_lock = asyncio.Lock()
+            self._browser = None
+            self._loop = loop
+        async with self._start_lock:
+            if self._browser is not None:
+                return True
+            if not playwright_available():
+                self.last_error = "playwright is not installed"
+                return False
+            try:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._slots = asyncio.Semaphore(self.size)
+                self._idle = [(await self._new_context(), time.monotonic()) for _ in range(self.size)]
+                self._reaper = asyncio.create_task(self._reap_idle())
+                self.last_error = None
+                return True
+            except Exception as e:
+                self.last_error = f"Browser launch failed: {str(e).splitlines()[0] if str(e) else type(e).__name__}"
+                await self._shutdown()
+                return False
+
+    async def close(self):
+        if self._loop is asyncio.get_running_loop():
+            await self._shutdown()
+
+    async def _shutdown(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for context, _ in self._idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._idle = []
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    async def _new_context(self):
+        context = await self._browser.new_context(user_agent=settings.user_agent, java_script_enabled=True)
+        if self.blocked_resources:
+            async def block(route):
+                if route.request.resource_type in self.blocked_resources:
+                    await route.abort()
+                else:
+                    await route.continue_()
+            await context.route("**/*", block)
+        return context
+
+    @asynccontextmanager
+    async def context(self):
+        """Borrow a warm context for one render"""
+        if not self.started and not await self.start():
+            raise RuntimeError(self.last_error or "Browser unavailable")
+        async with self._slots:
+            context = self._idle.pop()[0] if self._idle else await self._new_context()
+            healthy = True
+            try:
+                yield context
+            except Exception:
+                healthy = False
+                raise
+            finally:
+                if healthy:
+                    try:
+                        await context.clear_cookies()
+                        self._idle.append((context, time.monotonic()))
+                    except Exception:
+                        healthy = False
+                if not healthy:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+
+    async def _reap_idle(self):
+        interval = max(1, min(self.idle_timeout, 30))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            keep = []
+            for context, last_used in self._idle:
+                if now - last_used > self.idle_timeout:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+                else:
+                    keep.append((context, last_used))
+            self._idle = keep
+
+    def stats(self) -> dict:
+        return {
+            "started": self._browser is not None,
+            "size": self.size,
+            "idle_contexts": len(self._idle),
+            "last_error": self.last_error
+        }
+
+browser_pool = BrowserPool()
+registry.gauge("scraper_browser_idle_contexts", "Warm browser contexts waiting for a render", lambda: len(browser_pool._idle))
+
+async def render_html(url: str, timeout: int = 30) -> Tuple[str, dict]:
+    """
+    Render a page in the warm browser pool and return the resulting DOM.
+
+    Returns:
+        Tuple of (html_content, fetch_notes) in the same shape as fetch_html
+    """
+    fetch_notes = {
+        "url": url,
+        "status_code": None,
+        "content_length": None,
+        "content_type": None,
+        "method": "browser",
+        "errors": []
+    }
+
+    try:
+        async with browser_pool.context() as context:
+            page = await context.new_page()
+            try:
+                response = await page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+                html_content = await page.content()
+            finally:
+                await page.close()
+
+        if response is not None:
+            fetch_notes["status_code"] = response.status
+            fetch_notes["content_type"] = response.headers.get("content-type", "")
+        fetch_notes["content_length"] = len(html_content)
+
+        if response is not None and response.status >= 400:
+            fetch_notes["errors"].append(f"HTTP {response.status}")
+            return "", fetch_notes
+        return html_content, fetch_notes
+
+    except Exception as e:
+        fetch_notes["errors"].append(f"Render error: {str(e)}")
+        return "", fetch_notes
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import settings
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of HTTP responses.
+
+    Layout under `directory`:
+        meta/<sha256(url)>.json    - url, status, headers, validators, stored_at, body hash
+        bodies/<sha256(body)>      - raw body bytes, shared by every URL with identical content
+
+    Entries are fresh for `ttl` seconds; stale entries are revalidated with
+    If-None-Match / If-Modified-Since. Once the bodies exceed `max_bytes`,
+    the least recently used entries are evicted. Lookups, reads and writes
+    block on disk: fetch_html runs them through asyncio.to_thread.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[int] = None,
+                 max_bytes: Optional[int] = None, enabled: Optional[bool] = None):
+        self.configure(directory=directory, ttl=ttl, max_bytes=max_bytes, enabled=enabled)
+
+    def configure(self, directory: Optional[str] = None, ttl: Optional[int] = None,
+                  max_bytes: Optional[int] = None, enabled: Optional[bool] = None):
+        """(Re)point the cache, e.g. at a temporary directory in tests"""
+        self.directory = directory or settings.cache_dir
+        self.ttl = settings.cache_ttl if ttl is None else ttl
+        self.max_bytes = settings.cache_max_bytes if max_bytes is None else max_bytes
+        self.enabled = settings.cache_enabled if enabled is None else enabled
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()  # Size accounting is shared by concurrent writers
+
+    @property
+    def _meta_dir(self) -> str:
+        return os.path.join(self.directory, "meta")
+
+    @property
+    def _body_dir(self) -> str:
+        return os.path.join(self.directory, "bodies")
+
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self._meta_dir, _sha256(url.encode("utf-8")) + ".json")
+
+    def _body_path(self, body_sha: str) -> str:
+        return os.path.join(self._body_dir, body_sha)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for url, or None"""
+        if not self.enabled:
+            return None
+        path = self._meta_path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or not os.path.exists(self._body_path(entry.get("body_sha", ""))):
+            return None
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    def read_body(self, entry: Dict) -> Optional[bytes]:
+        try:
+            with open(self._body_path(entry["body_sha"]), "rb") as f:
+                return f.read()
+        except (OSError, KeyError):
+            return None
+
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """Validators for a conditional GET against a stale entry"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, status_code: int, headers: Dict[str, str], body: bytes) -> Optional[Dict]:
+        """Write a 200 response to the cache; returns the new entry"""
+        if not self.enabled:
+            return None
+        if "no-store" in headers.get("cache-control", "").lower():
+            return None
+
+        os.makedirs(self._meta_dir, exist_ok=True)
+        os.makedirs(self._body_dir, exist_ok=True)
+
+        body_sha = _sha256(body)
+        body_path = self._body_path(body_sha)
+        if not os.path.exists(body_path):
+            self._atomic_write(body_path, body)
+            with self._lock:
+                if self._total_bytes is not None:
+                    self._total_bytes += len(body)
+
+        entry = {
+            "url": url,
+            "status_code": status_code,
+            "headers": {k: v for k, v in headers.items() if k.lower() in ("content-type", "etag", "last-modified")},
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "stored_at": time.time(),
+            "body_sha": body_sha,
+            "size": len(body)
+        }
+        self._write_entry(entry)
+        with self._lock:
+            self._evict()
+        return entry
+
+    def refresh(self, entry: Dict, headers: Optional[Dict[str, str]] = None) -> Dict:
+        """Restart the TTL of an entry after a 304 Not Modified"""
+        headers = headers or {}
+        entry["stored_at"] = time.time()
+        if headers.get("etag"):
+            entry["etag"] = headers["etag"]
+        if headers.get("last-modified"):
+            entry["last_modified"] = headers["last-modified"]
+        self._write_entry(entry)
+        return entry
+
+    def clear(self):
+        """Drop every cached entry and body"""
+        for folder in (self._meta_dir, self._body_dir):
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:
+                    pass
+        with self._lock:
+            self._total_bytes = 0
+
+    def _write_entry(self, entry: Dict):
+        self._atomic_write(self._meta_path(entry["url"]), json.dumps(entry).encode("utf-8"))
+
+    def _atomic_write(self, path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _scan_total_bytes(self) -> int:
+        total = 0
+        if os.path.isdir(self._body_dir):
+            with os.scandir(self._body_dir) as it:
+                for item in it:
+                    if item.is_file():
+                        total += item.stat().st_size
+        return total
+
+    def _evict(self):
+        """Evict least recently used entries until bodies fit in max_bytes"""
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_total_bytes()
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = []
+        with os.scandir(self._meta_dir) as it:
+            for item in it:
+                if item.name.endswith(".json"):
+                    entries.append((item.stat().st_mtime, item.path))
+        entries.sort()
+
+        # Bodies can be shared, so count references before deleting any
+        body_refs: Dict[str, int] = {}
+        loaded = []
+        for _, path in entries:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    body_sha = json.load(f).get("body_sha", "")
+            except (OSError, ValueError):
+                body_sha = ""
+            body_refs[body_sha] = body_refs.get(body_sha, 0) + 1
+            loaded.append((path, body_sha))
+
+        for path, body_sha in loaded:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            body_refs[body_sha] -= 1
+            if body_refs[body_sha] == 0 and body_sha:
+                body_path = self._body_path(body_sha)
+                try:
+                    size = os.path.getsize(body_path)
+                    os.remove(body_path)
+                    self._total_bytes -= size
+                except OSError:
+                    pass
+
+response_cache = ResponseCache()
@@ -1,69 +1,259 @@
-
+import asyncio
+import codecs
+import re
 import httpx
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 
-async def fetch_html(url: str, timeout: int = 30) -> Tuple[str, dict]:
+from config import settings
+from fetch.cache import response_cache
+from fetch.pool import client_pool
+from fetch.robots import robots_cache
+from fetch.retry import hedged, host_latency, retry_policy
+from fetch.scheduler import fetch_scheduler
+from metrics import FETCH_BYTES, FETCH_REQUESTS
+
+# Content types worth downloading. A response without a content-type is accepted
+# too (its charset is then sniffed from the first bytes, not its type)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/xml", "application/xml", "text/plain")
+SNIFF_BYTES = 4096
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+_HTML_END_RE = re.compile(r'</html\s*>', re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+def _is_html_type(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not media_type or media_type in HTML_CONTENT_TYPES
+
+def _header_charset(content_type: str) -> Optional[str]:
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return _valid_codec(value.strip().strip('"\''))
+    return None
+
+def _valid_codec(name: str) -> Optional[str]:
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+def _sniff_charset(head: bytes) -> str:
+    """Charset from a byte-order mark or <meta charset>, else UTF-8"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _CHARSET_RE.search(head)
+    if match:
+        return _valid_codec(match.group(1).decode("ascii", "ignore")) or "utf-8"
+    return "utf-8"
+
+def _decode(body: bytes, headers: dict) -> str:
+    """Decode a cached body using the charset from its stored headers, or sniffed from the markup"""
+    encoding = _header_charset(headers.get("content-type", "")) or _sniff_charset(body[:SNIFF_BYTES])
+    return body.decode(encoding, errors="replace")
+
+async def _read_html(response: httpx.Response, max_bytes: int) -> Tuple[bytes, str, bool, bool]:
     """
-    Fetch HTML content via HTTP.
-    Returns: (html_content, fetch_notes)
-    TODO: Add retries, user agents, error handling
+    Read and incrementally decode a streamed body, keeping at most max_bytes.
+    With settings.fetch_stop_at_html_end, reading stops at the chunk holding
+    </html>: anything the server sends after it (trailing comments, tracking
+    markup) is dropped on purpose, since no strategy reads past the document.
+    Returns (body, html, truncated, stopped_at_html_end).
     """
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=timeout)
-            response.raise_for_status()
-            
-            return response.text, {
-                "status_code": response.status_code,
-                "content_type": response.headers.get("content-type", ""),
-                "method": "http"
-            }
-    except Exception as e:
-        raise Exception(f"HTTP fetch failed for {url}: {str(e)}")
-import httpx
-from typing import Tuple, Optional
-import asyncio
+    encoding = _header_charset(response.headers.get("content-type", ""))
+    decoder = None
+    body = bytearray()
+    parts = []
+    tail = ""
+    truncated = stopped = False
+
+    async for chunk in response.aiter_bytes():
+        if len(body) + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - len(body)]
+            truncated = True
+        body += chunk
+        if decoder is None:
+            if encoding is None and len(body) < SNIFF_BYTES and not truncated:
+                continue  # Not enough bytes to sniff a <meta charset> yet
+            decoder = codecs.getincrementaldecoder(encoding or _sniff_charset(bytes(body[:SNIFF_BYTES])))(errors="replace")
+            text = decoder.decode(bytes(body))
+        else:
+            text = decoder.decode(chunk)
+        parts.append(text)
+        if truncated:
+            break
+        if settings.fetch_stop_at_html_end and _HTML_END_RE.search(tail + text):
+            stopped = True
+            break
+        tail = text[-16:]
+
+    if decoder is None:
+        decoder = codecs.getincrementaldecoder(encoding or _sniff_charset(bytes(body[:SNIFF_BYTES])))(errors="replace")
+        parts.append(decoder.decode(bytes(body)))
+    parts.append(decoder.decode(b"", final=True))
+    return bytes(body), "".join(parts), truncated, stopped
 
 async def fetch_html(url: str, timeout: int = 30) -> Tuple[str, dict]:
     """
-    Fetch HTML content from URL with retries and proper error handling
-    
+    Fetch HTML content from URL through the shared connection pool.
+    Fresh cached responses are served from disk; stale ones are revalidated.
+    URLs disallowed by the host's robots.txt are not fetched.
+    Network requests wait their turn in the per-domain fetch_scheduler and
+    are retried (and optionally hedged) according to fetch.retry.retry_policy.
+    Bodies are streamed: non-HTML content types are skipped before download
+    and at most settings.fetch_max_bytes are kept.
+
     Returns:
         Tuple of (html_content, fetch_notes)
     """
+    html_content, fetch_notes = await _fetch_html(url, timeout)
+    FETCH_REQUESTS.inc(cache=fetch_notes["cache"], status=fetch_notes["status_code"] or "error")
+    if fetch_notes["content_length"]:
+        FETCH_BYTES.inc(fetch_notes["content_length"], cache=fetch_notes["cache"])
+    return html_content, fetch_notes
+
+async def _fetch_html(url: str, timeout: int) -> Tuple[str, dict]:
     fetch_notes = {
         "url": url,
         "status_code": None,
         "content_length": None,
         "content_type": None,
+        "http_version": None,
+        "cache": "bypass" if not response_cache.enabled else "miss",
+        "attempts": 0,
         "errors": []
     }
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    try:
-        async with httpx.AsyncClient(timeout=timeout, headers=headers) as client:
-            response = await client.get(url, follow_redirects=True)
-            
-            fetch_notes["status_code"] = response.status_code
-            fetch_notes["content_type"] = response.headers.get("content-type", "")
-            fetch_notes["content_length"] = len(response.content)
-            
-            if response.status_code == 200:
-                html_content = response.text
-                return html_content, fetch_notes
-            else:
-                fetch_notes["errors"].append(f"HTTP {response.status_code}")
-                return "", fetch_notes
-                
-    except httpx.TimeoutException:
-        fetch_notes["errors"].append("Request timeout")
-        return "", fetch_notes
-    except httpx.RequestError as e:
-        fetch_notes["errors"].append(f"Request error: {str(e)}")
-        return "", fetch_notes
-    except Exception as e:
-        fetch_notes["errors"].append(f"Unexpected error: {str(e)}")
+
+    cached = await asyncio.to_thread(response_cache.lookup, url)
+    if cached and response_cache.is_fresh(cached):
+        body = await asyncio.to_thread(response_cache.read_body, cached)
+        if body is not None:
+            fetch_notes["status_code"] = cached["status_code"]
+            fetch_notes["content_type"] = cached["headers"].get("content-type", "")
+            fetch_notes["content_length"] = len(body)
+            fetch_notes["cache"] = "hit"
+            return _decode(body, cached["headers"]), fetch_notes
+
+    if not await robots_cache.is_allowed(url):
+        fetch_notes["robots"] = "disallowed"
+        fetch_notes["errors"].append("Disallowed by robots.txt")
         return "", fetch_notes
+
+    policy = retry_policy
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + policy.deadline
+    retries = []
+
+    while True:
+        fetch_notes["attempts"] += 1
+        remaining = deadline - loop.time()
+        attempt_timeout = max(0.001, min(timeout, remaining))
+        hedge_after = host_latency.p95(url) if policy.hedge else None
+        html_content = ""
+        try:
+            # The deadline covers scheduler waits (including Retry-After pauses), not just the request
+            (html_content, notes), hedge_won = await asyncio.wait_for(
+                hedged(lambda on_sent: _attempt(url, attempt_timeout, cached, on_sent), hedge_after),
+                max(0.001, remaining)
+            )
+            fetch_notes.update(notes)
+            if hedge_won:
+                fetch_notes["hedged"] = True
+            retryable = policy.should_retry_status(notes["status_code"])
+        except asyncio.TimeoutError:
+            fetch_notes["status_code"] = None
+            fetch_notes["errors"] = [f"Deadline of {policy.deadline:g}s exceeded"]
+            break
+        except Exception as e:
+            fetch_notes["status_code"] = None
+            fetch_notes["errors"] = [_describe_error(e)]
+            retryable = policy.should_retry_exception(e)
+
+        if not retryable or fetch_notes["attempts"] >= policy.attempts:
+            break
+        delay = policy.backoff(fetch_notes["attempts"])
+        if loop.time() + delay >= deadline:
+            break
+        retries.extend(fetch_notes["errors"])
+        await asyncio.sleep(delay)
+
+    if retries:
+        fetch_notes["retries"] = retries
+    return html_content, fetch_notes
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, httpx.TimeoutException):
+        return "Request timeout"
+    if isinstance(error, httpx.RequestError):
+        return f"Request error: {str(error)}"
+    return f"Unexpected error: {str(error)}"
+
+async def _attempt(url: str, timeout: float, cached: Optional[dict],
+                   on_sent: Callable[[], None] = lambda: None) -> Tuple[str, dict]:
+    """
+    One network request for `url`. Returns (html_content, notes) with the
+    status, content type, length, cache outcome and errors of this attempt;
+    transport errors are raised for the retry loop to classify.
+    Host latency is measured from when the request leaves (after the scheduler
+    slot is granted) until the response is read; `on_sent` marks that moment.
+    """
+    notes = {"errors": []}
+    client = client_pool.get_client()
+    request_headers = response_cache.conditional_headers(cached) if cached else {}
+    max_bytes = settings.fetch_max_bytes
+    loop = asyncio.get_running_loop()
+    async with fetch_scheduler.slot(url) as ticket, client_pool.host_slot(url):
+        on_sent()
+        started = loop.time()
+
+        def finish(html_content: str) -> Tuple[str, dict]:
+            host_latency.record(url, loop.time() - started)
+            return html_content, notes
+
+        async with client.stream("GET", url, timeout=timeout, headers=request_headers) as response:
+            fetch_scheduler.done(ticket, url, response.status_code, response.headers.get("retry-after"))
+            notes["status_code"] = response.status_code
+            notes["content_type"] = response.headers.get("content-type", "")
+            notes["http_version"] = response.http_version
+
+            if response.status_code == 304 and cached:
+                body = await asyncio.to_thread(response_cache.read_body, cached)
+                if body is not None:
+                    await asyncio.to_thread(response_cache.refresh, cached, response.headers)
+                    notes["status_code"] = cached["status_code"]
+                    notes["content_type"] = cached["headers"].get("content-type", "")
+                    notes["content_length"] = len(body)
+                    notes["cache"] = "revalidated"
+                    return finish(_decode(body, cached["headers"]))
+
+            if response.status_code != 200:
+                notes["content_length"] = 0
+                notes["errors"].append(f"HTTP {response.status_code}")
+                return finish("")
+
+            # Decide from the headers alone, before any of the body is downloaded
+            if not _is_html_type(notes["content_type"]):
+                notes["content_length"] = 0
+                notes["errors"].append(f"Skipped non-HTML content type: {notes['content_type']}")
+                return finish("")
+            declared = response.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                notes["content_length"] = 0
+                notes["errors"].append(f"Response too large: {declared} bytes (limit {max_bytes})")
+                return finish("")
+
+            body, html_content, truncated, stopped = await _read_html(response, max_bytes)
+        finish(html_content)
+
+    notes["content_length"] = len(body)
+    if truncated:
+        # Keep the partial page for extraction, but never cache it
+        notes["truncated"] = True
+        notes["errors"].append(f"Body truncated at {max_bytes} bytes")
+    else:
+        # A body read up to </html> is cached as-is: the dropped tail is never extracted
+        if stopped:
+            notes["stopped_at_html_end"] = True
+        await asyncio.to_thread(response_cache.store, url, response.status_code, response.headers, body)
+    return html_content, notes
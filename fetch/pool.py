@@ -0,0 +1,142 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+import httpx
+
+from config import settings
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class ClientPool:
+    """
+    Process-wide httpx.AsyncClient shared by every fetch.
+    Keeps keep-alive connections open per host and caps concurrent
+    connections to any single host.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None, max_keepalive: Optional[int] = None,
+                 per_host_limit: Optional[int] = None, http2: Optional[bool] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_connections = max_connections or settings.http_max_connections
+        self.max_keepalive = max_keepalive or settings.http_max_keepalive
+        self.per_host_limit = per_host_limit or settings.http_per_host_limit
+        self.http2 = (settings.http2 if http2 is None else http2) and _http2_available()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def configure(self, transport: Optional[httpx.AsyncBaseTransport] = None, per_host_limit: Optional[int] = None):
+        """Swap the transport (e.g. httpx.MockTransport in tests) or host cap; the old client is closed and the next call builds a new one"""
+        self._transport = transport
+        if per_host_limit:
+            self.per_host_limit = per_host_limit
+        self._retire()
+        self._host_slots = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={"User-Agent": settings.user_agent},
+            follow_redirects=True,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=settings.http_keepalive_expiry
+            ),
+            transport=self._transport
+        )
+
+    def _retire(self):
+        """Close the current client, on its own loop when that loop is still usable, instead of leaking its connections"""
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        if client is None or client.is_closed:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        usable = loop is not None and not loop.is_closed()
+        if usable and loop is not running and loop.is_running():
+            # Owned by a loop in another thread
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+        elif running is not None:
+            # Same loop, or its loop is gone and whatever is left is closed from here
+            task = running.create_task(_close_quietly(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif usable:
+            loop.run_until_complete(_close_quietly(client))
+        else:
+            asyncio.run(_close_quietly(client))
+
+    async def start(self):
+        """Open the shared client (called from the app lifespan)"""
+        self.get_client()
+
+    async def close(self):
+        """Close the shared client and drop its pooled connections"""
+        client = self._client
+        self._client = None
+        self._loop = None
+        self._host_slots = {}
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared client, creating it on first use.
+        Connections are bound to the event loop that opened them, so a new
+        loop (e.g. a test client outside the lifespan) gets a fresh client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._retire()
+            self._client = self._build_client()
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str):
+        """Hold one of the per-host connection slots while a request is in flight"""
+        host = urlparse(url).netloc.lower()
+        semaphore = self._host_slots.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_slots[host] = semaphore
+        async with semaphore:
+            yield
+
+    def stats(self) -> dict:
+        """Snapshot of pool configuration and per-host usage"""
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "per_host_limit": self.per_host_limit,
+            "hosts_in_flight": {
+                host: self.per_host_limit - semaphore._value
+                for host, semaphore in self._host_slots.items()
+                if semaphore._value < self.per_host_limit
+            }
+        }
+
+async def _close_quietly(client: httpx.AsyncClient):
+    try:
+        await client.aclose()
+    except Exception:
+        pass  # Connections bound to a closed loop can't be shut down cleanly; they are dropped either way
+
+client_pool = ClientPool()
@@ -0,0 +1,108 @@
+import asyncio
+import collections
+import random
+from typing import Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+from config import settings
+
+T = TypeVar("T")
+
+class RetryPolicy:
+    """
+    What fetch_html retries and how long it keeps trying.
+
+    Attempts that fail with a retryable exception or status are retried after
+    an exponentially growing, fully jittered delay, until `attempts` is used up
+    or the `deadline` (seconds for the whole fetch, waits included) has passed.
+    """
+
+    def __init__(self, attempts: Optional[int] = None, retry_statuses: Optional[Iterable[int]] = None,
+                 retry_exceptions: Tuple[Type[BaseException], ...] = (httpx.TimeoutException, httpx.NetworkError,
+                                                                      httpx.RemoteProtocolError),
+                 backoff_base: Optional[float] = None, backoff_max: Optional[float] = None,
+                 deadline: Optional[float] = None, hedge: Optional[bool] = None):
+        self.attempts = max(1, settings.retry_attempts if attempts is None else attempts)
+        self.retry_statuses = frozenset(settings.retry_statuses if retry_statuses is None else retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.backoff_base = settings.retry_backoff_base if backoff_base is None else backoff_base
+        self.backoff_max = settings.retry_backoff_max if backoff_max is None else backoff_max
+        self.deadline = settings.retry_deadline if deadline is None else deadline
+        self.hedge = settings.fetch_hedge if hedge is None else hedge
+
+    def should_retry_status(self, status_code: Optional[int]) -> bool:
+        return status_code in self.retry_statuses
+
+    def should_retry_exception(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_exceptions)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based): uniform in [0, min(max, base * 2^(attempt-1))]"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+class HostLatency:
+    """Recent request latencies per host, for the hedging threshold"""
+
+    def __init__(self, window: int = 100, min_samples: Optional[int] = None):
+        self.window = window
+        self.min_samples = settings.hedge_min_samples if min_samples is None else min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, url: str, seconds: float):
+        host = urlparse(url).netloc.lower()
+        samples = self._samples.get(host)
+        if samples is None:
+            samples = self._samples[host] = collections.deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def p95(self, url: str) -> Optional[float]:
+        """95th percentile latency for the URL's host, once enough samples exist"""
+        samples = self._samples.get(urlparse(url).netloc.lower())
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+retry_policy = RetryPolicy()
+host_latency = HostLatency()
+
+async def hedged(attempt: Callable[[Callable[[], None]], Awaitable[T]], delay: Optional[float]) -> Tuple[T, bool]:
+    """
+    Run `attempt`; if it hasn't finished `delay` seconds after it was sent,
+    start a second copy and take whichever finishes first (the other is cancelled).
+    `attempt` is called with an `on_sent()` callback to fire once its request
+    has a scheduler slot and goes out, so time spent queued never triggers a
+    hedge. Returns (result, hedge_won). With delay None this is a plain await.
+    """
+    if delay is None:
+        return await attempt(lambda: None), False
+
+    sent = asyncio.Event()
+    first = asyncio.ensure_future(attempt(sent.set))
+    pending = {first}
+    try:
+        waiting = asyncio.ensure_future(sent.wait())
+        await asyncio.wait({first, waiting}, return_when=asyncio.FIRST_COMPLETED)
+        waiting.cancel()
+        if not first.done():
+            await asyncio.wait({first}, timeout=delay)
+        if first.done():
+            pending.clear()
+            return first.result(), False
+
+        second = asyncio.ensure_future(attempt(lambda: None))
+        pending.add(second)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Both can finish together: a success wins over the other's error
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), task is second
+        # Every attempt failed: raise the original request's error
+        return first.result(), False
+    finally:
+        # Also reached when the caller is cancelled (e.g. the fetch deadline passed)
+        for task in pending:
+            task.cancel()
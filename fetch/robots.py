@@ -0,0 +1,284 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from config import settings
+from fetch.pool import client_pool
+from fetch.scheduler import fetch_scheduler
+
+# RFC 9309: crawlers may ignore anything past the first 500 KiB
+MAX_ROBOTS_BYTES = 500 * 1024
+
+_LOC_RE = re.compile(rb'<loc>\s*(.*?)\s*</loc>', re.IGNORECASE | re.DOTALL)
+_SITEMAP_INDEX_RE = re.compile(rb'<sitemapindex\b', re.IGNORECASE)
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+def _path(url: str) -> str:
+    parsed = urlparse(url)
+    return (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """robots.txt path pattern ('*' wildcard, trailing '$' anchor) as a prefix regex"""
+    anchored = pattern.endswith("$")
+    body = re.escape(pattern[:-1] if anchored else pattern).replace(r"\*", ".*")
+    return re.compile(body + ("$" if anchored else ""))
+
+class RobotsRules:
+    """
+    The robots.txt group that applies to our user agent, compiled once.
+    Rules are ordered so the first match is the decision: longest pattern
+    wins, and Allow wins a tie with Disallow (RFC 9309).
+    """
+
+    def __init__(self, rules: List[Tuple[bool, str]], crawl_delay: Optional[float] = None,
+                 sitemaps: Optional[List[str]] = None):
+        ordered = sorted(rules, key=lambda rule: (-len(rule[1]), not rule[0]))
+        self._rules = [(allow, _compile_pattern(pattern)) for allow, pattern in ordered]
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+
+    @classmethod
+    def allow_all(cls) -> "RobotsRules":
+        return cls([])
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        return cls([(False, "/")])
+
+    @classmethod
+    def parse(cls, text: str, agent: str) -> "RobotsRules":
+        """Pick the most specific group matching `agent` (falling back to '*')"""
+        agent = agent.lower()
+        groups: List[dict] = []
+        sitemaps = []
+        current = None
+        in_agents = False
+        for raw_line in text.splitlines():
+            line = raw_line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            key, _, value = line.partition(":")
+            key, value = key.strip().lower(), value.strip()
+            if key == "sitemap":
+                if value:
+                    sitemaps.append(value)
+                continue
+            if key == "user-agent":
+                # Consecutive user-agent lines share the rules that follow them
+                if current is None or not in_agents:
+                    current = {"agents": [], "rules": [], "crawl_delay": None}
+                    groups.append(current)
+                current["agents"].append(value.lower())
+                in_agents = True
+                continue
+            in_agents = False
+            if current is None:
+                continue
+            if key in ("allow", "disallow") and value:
+                current["rules"].append((key == "allow", value))
+            elif key == "crawl-delay":
+                try:
+                    current["crawl_delay"] = float(value)
+                except ValueError:
+                    pass
+
+        best, best_length = None, -1
+        for group in groups:
+            for name in group["agents"]:
+                if name == "*":
+                    length = 0
+                elif name and name in agent:
+                    length = len(name)
+                else:
+                    continue
+                if length > best_length:
+                    best, best_length = group, length
+        if best is None:
+            return cls([], sitemaps=sitemaps)
+        return cls(best["rules"], crawl_delay=best["crawl_delay"], sitemaps=sitemaps)
+
+    def is_allowed(self, url: str) -> bool:
+        path = _path(url)
+        if path == "/robots.txt":
+            return True
+        for allow, pattern in self._rules:
+            if pattern.match(path):
+                return allow
+        return True
+
+class RobotsCache:
+    """
+    robots.txt rules and sitemap URL lists per origin, kept in memory and on
+    disk for `ttl` seconds. Concurrent lookups for one origin share a single
+    fetch; disk reads and writes run in a thread.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[int] = None,
+                 enabled: Optional[bool] = None, agent: Optional[str] = None):
+        self.configure(directory, ttl, enabled, agent)
+
+    def configure(self, directory: Optional[str] = None, ttl: Optional[int] = None,
+                  enabled: Optional[bool] = None, agent: Optional[str] = None):
+        self.directory = directory or settings.robots_cache_dir
+        self.ttl = settings.robots_ttl if ttl is None else ttl
+        self.enabled = settings.respect_robots if enabled is None else enabled
+        self.agent = agent or settings.robots_user_agent
+        self._rules: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._sitemaps: Dict[str, Tuple[List[str], float]] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _disk_path(self, kind: str, origin: str) -> str:
+        return os.path.join(self.directory, kind, hashlib.sha256(origin.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_disk(self, kind: str, origin: str) -> Optional[dict]:
+        try:
+            with open(self._disk_path(kind, origin), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("expires_at", 0) > time.time() else None
+
+    def _write_disk(self, kind: str, origin: str, entry: dict):
+        path = self._disk_path(kind, origin)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    async def _single_flight(self, key: Tuple[str, str], load):
+        """Run `load()` once per key at a time; other callers await the same result"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await load()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def rules_for(self, url: str) -> RobotsRules:
+        origin = _origin(url)
+        cached = self._rules.get(origin)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        return await self._single_flight(("robots", origin), lambda: self._load_rules(origin))
+
+    async def _load_rules(self, origin: str) -> RobotsRules:
+        entry = await asyncio.to_thread(self._read_disk, "robots", origin)
+        if entry is None:
+            status, body = await _get(origin + "/robots.txt", MAX_ROBOTS_BYTES)
+            entry = {"origin": origin, "status": status, "body": body.decode("utf-8", "replace"), "fetched_at": time.time()}
+            # Unreachable or failing servers are retried sooner than healthy ones
+            ok = status is not None and status < 500 and status != 429
+            entry["expires_at"] = entry["fetched_at"] + (self.ttl if ok else settings.robots_error_ttl)
+            await asyncio.to_thread(self._write_disk, "robots", origin, entry)
+
+        status = entry["status"]
+        if status is not None and 200 <= status < 300:
+            rules = RobotsRules.parse(entry["body"], self.agent)
+        elif status is not None and (status >= 500 or status == 429):
+            # RFC 9309: an erroring robots.txt means assume complete disallow for now
+            rules = RobotsRules.disallow_all()
+        else:
+            # 4xx (no robots.txt) or unreachable host
+            rules = RobotsRules.allow_all()
+
+        if rules.crawl_delay:
+            fetch_scheduler.cap_rate(origin, 1 / rules.crawl_delay)
+        self._rules[origin] = (rules, entry["expires_at"])
+        return rules
+
+    async def is_allowed(self, url: str) -> bool:
+        """Whether our user agent may fetch `url` (always True when disabled)"""
+        if not self.enabled:
+            return True
+        return (await self.rules_for(url)).is_allowed(url)
+
+    async def sitemap_urls(self, url: str) -> List[str]:
+        """Page URLs listed in the origin's sitemaps (robots.txt Sitemap: lines, else /sitemap.xml)"""
+        origin = _origin(url)
+        cached = self._sitemaps.get(origin)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        return await self._single_flight(("sitemap", origin), lambda: self._load_sitemaps(origin))
+
+    async def _load_sitemaps(self, origin: str) -> List[str]:
+        entry = await asyncio.to_thread(self._read_disk, "sitemaps", origin)
+        if entry is None:
+            rules = await self.rules_for(origin)
+            queue = list(rules.sitemaps) or [origin + "/sitemap.xml"]
+            seen = set()
+            pages: List[str] = []
+            while queue and len(seen) < settings.sitemap_max_files and len(pages) < settings.sitemap_max_urls:
+                sitemap_url = queue.pop(0)
+                if sitemap_url in seen or (self.enabled and not rules.is_allowed(sitemap_url)):
+                    continue
+                seen.add(sitemap_url)
+                status, body = await _get(sitemap_url, settings.fetch_max_bytes)
+                if status != 200 or not body:
+                    continue
+                if body[:2] == b"\x1f\x8b":
+                    try:
+                        body = gzip.decompress(body)
+                    except (OSError, EOFError):
+                        continue
+                locs = [urljoin(sitemap_url, loc.decode("utf-8", "replace").strip()) for loc in _LOC_RE.findall(body)]
+                if _SITEMAP_INDEX_RE.search(body[:2048]):
+                    queue.extend(locs)
+                else:
+                    pages.extend(locs)
+            entry = {"origin": origin, "urls": pages[:settings.sitemap_max_urls], "expires_at": time.time() + self.ttl}
+            await asyncio.to_thread(self._write_disk, "sitemaps", origin, entry)
+
+        self._sitemaps[origin] = (entry["urls"], entry["expires_at"])
+        return entry["urls"]
+
+    def clear(self):
+        self._rules.clear()
+        self._sitemaps.clear()
+
+async def _get(url: str, max_bytes: int) -> Tuple[Optional[int], bytes]:
+    """Plain GET through the shared pool and scheduler; (None, b"") if the host is unreachable"""
+    try:
+        client = client_pool.get_client()
+        async with fetch_scheduler.slot(url) as ticket, client_pool.host_slot(url):
+            async with client.stream("GET", url, timeout=settings.robots_timeout) as response:
+                fetch_scheduler.done(ticket, url, response.status_code, response.headers.get("retry-after"))
+                if response.status_code != 200:
+                    return response.status_code, b""
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= max_bytes:
+                        break
+                return response.status_code, bytes(body[:max_bytes])
+    except Exception:
+        return None, b""
+
+robots_cache = RobotsCache()
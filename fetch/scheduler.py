@@ -0,0 +1,224 @@
+import asyncio
+import collections
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from config import settings
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class DomainBucket:
+    """
+    Token bucket for one domain whose refill rate adapts to the server:
+    additive increase while responses are fast, multiplicative decrease on
+    429/503, timeouts and slow responses, and a hard pause for Retry-After.
+    """
+
+    # Requests/second added per fast response
+    INCREASE = 0.25
+
+    def __init__(self, rate: float, burst: float, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.latency: Optional[float] = None  # EWMA of seconds to response headers
+        self.waiters: Deque[asyncio.Future] = collections.deque()
+        self.in_flight = 0
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_in(self, now: float) -> float:
+        """Seconds until a request may start (0 if now)"""
+        self.refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def record(self, status_code: Optional[int], latency: float, retry_after: Optional[float], slow_latency: float):
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if status_code in (429, 503) or status_code is None:
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else (1 / self.rate if status_code else 0.0)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + min(pause, settings.scheduler_max_retry_after))
+        elif self.latency > slow_latency:
+            self.rate = max(self.min_rate, self.rate * 0.8)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.INCREASE)
+
+class Ticket:
+    """Handed to the caller of FetchScheduler.slot(); report the response with done()"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.reported = False
+
+class FetchScheduler:
+    """
+    Politeness scheduler every network fetch passes through.
+
+    Each domain has an adaptive DomainBucket; a global cap bounds requests in
+    flight, and free global slots are handed out round-robin across domains
+    with waiting requests so one large crawl cannot starve the others.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                 max_in_flight: Optional[int] = None):
+        self.configure(rate, burst, max_in_flight)
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                  max_in_flight: Optional[int] = None):
+        self.rate = rate or settings.scheduler_rate
+        self.burst = burst or settings.scheduler_burst
+        self.max_in_flight = max_in_flight or settings.scheduler_max_in_flight
+        self.min_rate = min(settings.scheduler_min_rate, self.rate)
+        self.max_rate = max(settings.scheduler_max_rate, self.rate)
+        self.slow_latency = settings.scheduler_slow_latency
+        self._buckets: Dict[str, DomainBucket] = {}
+        self._ring: List[str] = []
+        self._cursor = 0
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bucket(self, domain: str) -> DomainBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = self._buckets[domain] = DomainBucket(self.rate, self.burst, self.min_rate, self.max_rate)
+            self._ring.append(domain)
+        return bucket
+
+    def _bind_loop(self):
+        """Waiters are futures of one event loop; a new loop starts with empty queues"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._timer = None
+            self._in_flight = 0
+            for bucket in self._buckets.values():
+                bucket.waiters.clear()
+                bucket.in_flight = 0
+
+    def _dispatch(self):
+        """Grant free global slots round-robin to domains whose bucket has a token"""
+        self._timer = None
+        now = time.monotonic()
+        next_wake = None
+        granted = True
+        while granted and self._in_flight < self.max_in_flight:
+            granted = False
+            for offset in range(len(self._ring)):
+                index = (self._cursor + offset) % len(self._ring)
+                bucket = self._buckets[self._ring[index]]
+                while bucket.waiters and bucket.waiters[0].done():
+                    bucket.waiters.popleft()  # Cancelled while queued
+                if not bucket.waiters:
+                    continue
+                wait = bucket.ready_in(now)
+                if wait > 0:
+                    next_wake = wait if next_wake is None else min(next_wake, wait)
+                    continue
+                bucket.tokens -= 1
+                bucket.in_flight += 1
+                self._in_flight += 1
+                bucket.waiters.popleft().set_result(None)
+                self._cursor = index + 1
+                granted = True
+                break
+        if next_wake is not None and self._in_flight < self.max_in_flight:
+            self._timer = self._loop.call_later(next_wake, self._dispatch)
+
+    def _wake(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait for the domain's turn, then hold a slot while the request runs"""
+        self._bind_loop()
+        loop = self._loop
+        bucket = self._bucket(urlparse(url).netloc.lower())
+        waiter = loop.create_future()
+        bucket.waiters.append(waiter)
+        self._wake()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we were cancelled: give the slot back
+                self._release(bucket)
+            raise
+
+        ticket = Ticket()
+        try:
+            yield ticket
+        except httpx.TimeoutException:
+            # A timeout is an overload signal; refused connections and cancelled hedges are not
+            if not ticket.reported:
+                bucket.record(None, time.monotonic() - ticket.started, None, self.slow_latency)
+            raise
+        finally:
+            if self._loop is loop:
+                self._release(bucket)
+
+    def cap_rate(self, url: str, rate: float):
+        """Never exceed `rate` requests/second to this domain (e.g. a robots.txt Crawl-delay)"""
+        bucket = self._bucket(urlparse(url).netloc.lower())
+        bucket.max_rate = min(bucket.max_rate, rate)
+        bucket.min_rate = min(bucket.min_rate, bucket.max_rate)
+        bucket.rate = min(bucket.rate, bucket.max_rate)
+        bucket.burst = 1
+        bucket.tokens = min(bucket.tokens, 1)
+
+    def done(self, ticket: Ticket, url: str, status_code: int, retry_after: Optional[str] = None):
+        """Feed a response's status, latency and Retry-After back into its domain bucket"""
+        ticket.reported = True
+        self._bucket(urlparse(url).netloc.lower()).record(
+            status_code, time.monotonic() - ticket.started, parse_retry_after(retry_after), self.slow_latency
+        )
+
+    def _release(self, bucket: DomainBucket):
+        bucket.in_flight -= 1
+        self._in_flight -= 1
+        self._wake()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "domains": {
+                domain: {
+                    "rate": round(bucket.rate, 3),
+                    "queued": len(bucket.waiters),
+                    "in_flight": bucket.in_flight,
+                    "latency_ms": round(bucket.latency * 1000, 1) if bucket.latency is not None else None,
+                    "paused_for": round(max(0.0, bucket.blocked_until - now), 3)
+                }
+                for domain, bucket in self._buckets.items()
+            }
+        }
+
+fetch_scheduler = FetchScheduler()
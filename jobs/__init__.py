@@ -0,0 +1,5 @@
+
+from .store import JobStore, job_store
+from .worker import JobWorkerPool, worker_pool
+
+__all__ = ['JobStore', 'job_store', 'JobWorkerPool', 'worker_pool']
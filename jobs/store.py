@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+from config import settings
+from schemas import JobInfo, JobState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    url TEXT NOT NULL,
+    request TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release; older databases get them on open
+_LATER_COLUMNS = {"owner": "TEXT", "lease_expires": "REAL"}
+
+class JobStore:
+    """
+    SQLite-backed queue of scrape jobs and their results.
+    Safe to share between the API server and separate worker processes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.configure(path)
+
+    def configure(self, path: Optional[str] = None):
+        self.path = path or settings.jobs_db
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+                for column, column_type in _LATER_COLUMNS.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+                self._initialized = True
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, request: Dict[str, Any]) -> str:
+        """Queue a scrape request; returns the new job id"""
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, url, request, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobState.QUEUED.value, request.get("url", ""), json.dumps(request), time.time())
+            )
+        return job_id
+
+    def claim_next(self, owner: str = "", lease_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest queued job to running and return it.
+        The job is leased to `owner`, who must renew the lease (heartbeat)
+        before it expires or the job is handed to another worker.
+        """
+        lease_seconds = settings.job_lease_seconds if lease_seconds is None else lease_seconds
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, request FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JobState.QUEUED.value,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, owner = ?, lease_expires = ? WHERE id = ?",
+                    (JobState.RUNNING.value, now, owner, now + lease_seconds, row["id"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return {"job_id": row["id"], "request": json.loads(row["request"])}
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress), job_id))
+
+    def _finish(self, job_id: str, owner: Optional[str], assignments: str, values: tuple) -> bool:
+        """Set a terminal state; with `owner`, only while that worker still holds the running job"""
+        query = f"UPDATE jobs SET {assignments}, finished_at = ?, lease_expires = NULL WHERE id = ?"
+        params = (*values, time.time(), job_id)
+        if owner is not None:
+            query += " AND owner = ? AND status = ?"
+            params += (owner, JobState.RUNNING.value)
+        with self._connect() as conn:
+            return conn.execute(query, params).rowcount > 0
+
+    def complete(self, job_id: str, result: Dict[str, Any], owner: Optional[str] = None) -> bool:
+        """Store the result; False if `owner` lost the job (its lease expired and it was reclaimed)"""
+        return self._finish(job_id, owner, "status = ?, result = ?", (JobState.SUCCEEDED.value, json.dumps(result)))
+
+    def fail(self, job_id: str, error: str, owner: Optional[str] = None) -> bool:
+        """Record the error; False if `owner` lost the job"""
+        return self._finish(job_id, owner, "status = ?, error = ?", (JobState.FAILED.value, error))
+
+    def heartbeat(self, owner: str, job_ids: Iterable[str], lease_seconds: Optional[float] = None) -> int:
+        """Extend the leases `owner` holds on its running jobs"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+        lease_seconds = settings.job_lease_seconds if lease_seconds is None else lease_seconds
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE owner = ? AND status = ? AND id IN ({placeholders})",
+                (time.time() + lease_seconds, owner, JobState.RUNNING.value, *job_ids)
+            )
+            return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        """Put running jobs whose worker stopped renewing its lease (crashed or killed) back on the queue"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_expires = NULL "
+                "WHERE status = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                (JobState.QUEUED.value, JobState.RUNNING.value, time.time())
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[JobInfo]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, url, progress, error, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return JobInfo(
+            job_id=row["id"],
+            status=JobState(row["status"]),
+            url=row["url"],
+            progress=json.loads(row["progress"] or "{}"),
+            error=row["error"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"]
+        )
+
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row["result"] is None:
+            return None
+        return json.loads(row["result"])
+
+job_store = JobStore()
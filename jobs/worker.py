@@ -0,0 +1,135 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from config import settings
+from jobs.store import JobStore, job_store
+
+class JobWorkerPool:
+    """
+    Async workers that pull queued scrape jobs from the JobStore and run them.
+    Runs inside the API server (started from the app lifespan) or standalone
+    via `python main.py worker`.
+
+    Claimed jobs are leased to this pool's `owner` id and the lease is renewed
+    every third of settings.job_lease_seconds while they run. Any pool
+    requeues running jobs whose lease has expired, so a crashed worker's jobs
+    are picked up again without touching jobs another live process is running.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, concurrency: Optional[int] = None,
+                 poll_interval: Optional[float] = None):
+        self.store = store or job_store
+        self.concurrency = concurrency or settings.job_workers
+        self.poll_interval = poll_interval or settings.job_poll_interval
+        self.lease_seconds = settings.job_lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: List[asyncio.Task] = []
+        self._active: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self, recover: bool = True):
+        """Spawn the workers; `recover` requeues jobs whose worker let its lease expire"""
+        if self.running:
+            return
+        if recover:
+            await asyncio.to_thread(self.store.requeue_expired)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker_loop()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._lease_loop()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job is enqueued in this process"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_forever(self):
+        """Standalone worker process entry point"""
+        await self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    async def _lease_loop(self):
+        """Renew leases on our running jobs and recover jobs whose leases lapsed"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self.store.heartbeat, self.owner, list(self._active), self.lease_seconds)
+            await asyncio.to_thread(self.store.requeue_expired)
+
+    async def _worker_loop(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next, self.owner, self.lease_seconds)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._active.add(job["job_id"])
+            try:
+                await self.run_job(job["job_id"], job["request"])
+            finally:
+                self._active.discard(job["job_id"])
+
+    async def run_job(self, job_id: str, request_data: Dict[str, Any]):
+        """Run one scrape and record its progress and result"""
+        from api.server import ScrapeRequest, scrape_faculty_directory
+
+        last_write = [0.0]
+        latest: List[Optional[Dict[str, Any]]] = [None]
+        writer: List[Optional[asyncio.Task]] = [None]
+
+        async def flush():
+            # One write in flight at a time, always of the newest progress
+            while latest[0] is not None:
+                progress, latest[0] = latest[0], None
+                await asyncio.to_thread(self.store.update_progress, job_id, progress)
+
+        def report(progress: Dict[str, Any]):
+            # Per-profile ticks are throttled; the SQLite write runs off the event loop
+            now = time.monotonic()
+            if progress.get("done") is not None and progress.get("done") != progress.get("total") and now - last_write[0] < 0.5:
+                return
+            last_write[0] = now
+            latest[0] = progress
+            if writer[0] is None or writer[0].done():
+                writer[0] = asyncio.create_task(flush())
+
+        try:
+            request = ScrapeRequest(**request_data)
+            response = await scrape_faculty_directory(
+                request,
+                enrich_emails=bool(request.enrich_profiles),
+                progress=report
+            )
+            if writer[0] is not None:
+                await writer[0]
+            # scrape_faculty_directory reports errors in the response instead of raising
+            if response.success:
+                await asyncio.to_thread(self.store.complete, job_id, response.model_dump(mode="json"), self.owner)
+            else:
+                await asyncio.to_thread(self.store.fail, job_id, response.message or "Scrape failed", self.owner)
+        except asyncio.CancelledError:
+            if writer[0] is not None:
+                writer[0].cancel()
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self.store.fail, job_id, str(e), self.owner)
+
+worker_pool = JobWorkerPool()
@@ -1,12 +1,38 @@
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from api import register_routes
+from config import settings
+from extract.executor import parse_executor
+from fetch.browser import browser_pool, playwright_available
+from fetch.pool import client_pool
+from jobs import worker_pool
+import asyncio
+import sys
 import uvicorn
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client for the whole process
+    await client_pool.start()
+    # Warm extraction workers before the first request needs them
+    await asyncio.to_thread(parse_executor.start)
+    if settings.browser_prelaunch and playwright_available():
+        # Warm browser contexts so enable_js scrapes don't pay a launch
+        await browser_pool.start()
+    if settings.job_workers_in_server:
+        await worker_pool.start()
+    yield
+    await worker_pool.stop()
+    await browser_pool.close()
+    parse_executor.shutdown()
+    await client_pool.close()
+
 app = FastAPI(
     title="Scraping Agent #1", 
     version="0.1.0",
-    description="University Music Faculty Directory Scraper"
+    description="University Music Faculty Directory Scraper",
+    lifespan=lifespan
 )
 
 # Register API routes
@@ -20,5 +46,16 @@ def home():
 def health_check():
     return {"status": "healthy", "version": "0.1.0"}
 
+async def run_worker():
+    """Run background job workers without the API (`python main.py worker`)"""
+    try:
+        await worker_pool.run_forever()
+    finally:
+        parse_executor.shutdown()
+        await client_pool.close()
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=5000)
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        asyncio.run(run_worker())
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional
+
+from normalize.normalize import clean_email_address
+from schemas.normalized_lead import EmailStatus, NormalizedLead
+
+def _clean_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+def clean_emails(values: List[Optional[str]]) -> List[Optional[str]]:
+    """
+    clean_email_address over a whole column. Each distinct raw value is
+    cleaned and matched once; repeats (and the many missing values) are lookups.
+    """
+    cleaned: Dict[Optional[str], Optional[str]] = {None: None, '': None}
+    for value in set(values):
+        if value not in cleaned:
+            cleaned[value] = clean_email_address(value)
+    return [cleaned[value] for value in values]
+
+def normalize_columns(raw_leads: List[Dict[str, Any]], source_url: str,
+                      lead_directory_urls: bool = True) -> List[NormalizedLead]:
+    """
+    Normalize a batch of raw lead dicts column by column.
+
+    Names, titles, emails and profile URLs are pulled into column lists and
+    cleaned in one pass each; email status comes from the cleaned email column
+    and the enrichment/inference flags. Every value is already the type
+    NormalizedLead declares, so models are built with model_construct and skip
+    validation. Rows without a name are dropped.
+
+    Each lead keeps the directory_url it was extracted from (paginated
+    directories span several pages), falling back to `source_url`; with
+    lead_directory_urls=False every lead gets `source_url`.
+    """
+    rows = [lead for lead in raw_leads if _clean_text(lead.get('name'))]
+    if not rows:
+        return []
+
+    names = [str(lead['name']).strip() for lead in rows]
+    titles = [_clean_text(lead.get('title') or lead.get('jobTitle')) for lead in rows]
+    raw_emails = [lead.get('email') or lead.get('email_raw') for lead in rows]
+    raw_emails = [str(email) if email else None for email in raw_emails]
+    emails = clean_emails(raw_emails)
+    enriched = [bool(lead.get('email_enriched')) for lead in rows]
+    inferred = [bool(lead.get('email_inferred')) for lead in rows]
+    profile_urls = [lead.get('profile_url') or lead.get('url') for lead in rows]
+    profile_urls = [url if isinstance(url, str) and url.startswith('http') else None for url in profile_urls]
+    directory_urls = [(lead.get('directory_url') if lead_directory_urls else None) or source_url for lead in rows]
+    socials = [lead.get('socials') if isinstance(lead.get('socials'), list) else [] for lead in rows]
+    bios = [_clean_text(lead.get('bio_snippet')) for lead in rows]
+
+    statuses = [
+        EmailStatus.MISSING if raw is None
+        else EmailStatus.OBFUSCATED_UNRESOLVED if email is None
+        else EmailStatus.FOUND_ON_PROFILE if from_profile
+        else EmailStatus.INFERRED_PATTERN if from_pattern
+        else EmailStatus.PRESENT
+        for raw, email, from_profile, from_pattern in zip(raw_emails, emails, enriched, inferred)
+    ]
+
+    construct = NormalizedLead.model_construct
+    return [
+        construct(name=name, title=title, email=email, email_status=status, profile_url=profile_url,
+                  directory_url=directory_url, socials=[str(link) for link in links], bio_snippet=bio)
+        for name, title, email, status, profile_url, directory_url, links, bio
+        in zip(names, titles, emails, statuses, profile_urls, directory_urls, socials, bios)
+    ]
@@ -0,0 +1,164 @@
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from normalize.columnar import clean_emails
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+# Name tokens that say nothing about who the person is
+HONORIFICS = frozenset({'dr', 'prof', 'professor', 'mr', 'mrs', 'ms', 'mx', 'phd', 'dma', 'dmus', 'mfa', 'jr', 'sr'})
+
+# Leads sharing a surname are compared pairwise; beyond this size the surname is too common to be useful
+MAX_BLOCK_SIZE = 50
+
+LIST_FIELDS = ('socials',)
+
+def normalize_name(name: Optional[str]) -> str:
+    """'Earnhart, Cari' and 'Cari  Earnhart' both become 'cari earnhart'"""
+    name = str(name or '')
+    if name.count(',') == 1:
+        last, first = name.split(',')
+        name = f"{first} {last}"
+    return ' '.join(_PUNCTUATION_RE.sub(' ', name.lower()).split())
+
+def normalize_profile_url(url: Optional[str]) -> str:
+    return (url or '').strip().rstrip('/').lower()
+
+def fold_accents(text: str) -> str:
+    """Strip accents: 'maría lópez' -> 'maria lopez'"""
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """Sorted, accent-folded name tokens without honorifics or initials"""
+    return sorted(t for t in ordered_name_tokens(name) if len(t) > 1)
+
+def ordered_name_tokens(name: Optional[str]) -> List[str]:
+    """Accent-folded name tokens in first-to-last order, initials kept: 'Dr. López, M.' -> ['m', 'lopez']"""
+    return [t for t in fold_accents(normalize_name(name)).split() if t not in HONORIFICS]
+
+class _Groups:
+    """Union-find over lead indexes, tracking each group's emails and profile URLs"""
+
+    def __init__(self, emails: List[str], profiles: List[str]):
+        self.parent = list(range(len(emails)))
+        self.emails: List[Set[str]] = [{e} if e else set() for e in emails]
+        self.profiles: List[Set[str]] = [{p} if p else set() for p in profiles]
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def compatible(self, a: int, b: int) -> bool:
+        """Groups can be merged on name evidence unless they carry different emails or profile URLs"""
+        a, b = self.find(a), self.find(b)
+        for sets in (self.emails, self.profiles):
+            if sets[a] and sets[b] and not (sets[a] & sets[b]):
+                return False
+        return True
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if b < a:
+            a, b = b, a  # The earliest lead stays the root, so output keeps first-seen order
+        self.parent[b] = a
+        self.emails[a] |= self.emails[b]
+        self.profiles[a] |= self.profiles[b]
+
+def _union_by_key(groups: _Groups, keys: Iterable[str], accept: Callable[[int, int], bool]):
+    """Join each lead to the first earlier group with the same key that accepts it"""
+    holders: Dict[str, List[int]] = {}
+    for index, key in enumerate(keys):
+        if not key:
+            continue
+        representatives = holders.setdefault(key, [])
+        for representative in representatives:
+            if accept(representative, index):
+                groups.union(representative, index)
+                break
+        else:
+            representatives.append(index)
+
+def merge_leads(leads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold duplicates into the first: empty fields are filled, list fields are unioned"""
+    merged = dict(leads[0])
+    for lead in leads[1:]:
+        for field, value in lead.items():
+            if field in LIST_FIELDS:
+                current = merged.get(field) if isinstance(merged.get(field), list) else []
+                extra = value if isinstance(value, list) else []
+                merged[field] = current + [v for v in extra if v not in current]
+            elif field == 'diagnostics':
+                if (value or {}).get('confidence', 0) > (merged.get(field) or {}).get('confidence', 0):
+                    merged[field] = value
+            elif not merged.get(field) and value:
+                merged[field] = value
+    return merged
+
+def dedupe_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse raw leads that describe the same person, keeping first-seen order.
+
+    Leads are joined through hash indexes on email, profile URL, normalized
+    name and sorted name tokens. Within a surname, a first initial joins the
+    one full first name it stands for ("M. Lopez" / "Maria Lopez"); similar
+    but different first names ("Daniel" / "Danielle", "Maria" / "Mario") are
+    never joined on spelling alone. Joins never merge groups that carry
+    different emails or profile URLs, and an email or profile URL match also
+    needs one name's tokens to contain the other's. Sorted tokens only key
+    names with at least two tokens left after dropping initials and
+    honorifics. Each index is a single pass and surname blocks are
+    size-capped, so the cost stays near-linear in the number of leads.
+    """
+    if len(leads) < 2:
+        return list(leads)
+
+    emails = clean_emails([str(lead.get('email') or lead.get('email_raw') or '') or None for lead in leads])
+    emails = [email or '' for email in emails]
+    profiles = [normalize_profile_url(lead.get('profile_url')) for lead in leads]
+    tokens = [name_tokens(lead.get('name')) for lead in leads]
+    sorted_names = [' '.join(t) for t in tokens]
+    # With initials and honorifics gone, a lone surname says nothing about who this is
+    token_keys = [name if len(t) >= 2 else '' for name, t in zip(sorted_names, tokens)]
+
+    groups = _Groups(emails, profiles)
+
+    def same_person(a: int, b: int) -> bool:
+        # A shared department address or landing-page link is not evidence on its own:
+        # one name's tokens must contain the other's ("Maria Lopez" / "Dr. Maria Lopez")
+        first, second = set(tokens[a]), set(tokens[b])
+        return groups.compatible(a, b) and (not first or not second or first <= second or second <= first)
+
+    _union_by_key(groups, emails, same_person)
+    _union_by_key(groups, profiles, same_person)
+    _union_by_key(groups, [normalize_name(lead.get('name')) for lead in leads], groups.compatible)
+    _union_by_key(groups, token_keys, groups.compatible)
+
+    ordered = [ordered_name_tokens(lead.get('name')) for lead in leads]
+    blocks: Dict[str, List[int]] = {}
+    for index, parts in enumerate(ordered):
+        if len(parts) >= 2 and len(parts[-1]) > 1:
+            blocks.setdefault(parts[-1], []).append(index)
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for a in members:
+            initial = ordered[a][0]
+            if len(initial) != 1:
+                continue
+            matches = [b for b in members if len(ordered[b][0]) > 1 and ordered[b][0][0] == initial]
+            # "M. Lopez" next to both Maria and Mario Lopez could be either of them
+            if len({ordered[b][0] for b in matches}) != 1:
+                continue
+            for b in matches:
+                if groups.find(a) != groups.find(b) and groups.compatible(a, b):
+                    groups.union(a, b)
+
+    members_by_root: Dict[int, List[Dict[str, Any]]] = {}
+    for index, lead in enumerate(leads):
+        members_by_root.setdefault(groups.find(index), []).append(lead)
+    return [merge_leads(members) for members in members_by_root.values()]
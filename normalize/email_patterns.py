@@ -0,0 +1,96 @@
+import re
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+from config import settings
+from normalize.dedupe import HONORIFICS, fold_accents, normalize_name
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+# Local-part templates over (first, last) name tokens, most common first; ties go to the earlier one
+TEMPLATES: Dict[str, Callable[[str, str], str]] = {
+    'first.last': lambda f, l: f"{f}.{l}",
+    'flast': lambda f, l: f"{f[0]}{l}",
+    'firstlast': lambda f, l: f"{f}{l}",
+    'first_last': lambda f, l: f"{f}_{l}",
+    'first-last': lambda f, l: f"{f}-{l}",
+    'f.last': lambda f, l: f"{f[0]}.{l}",
+    'lastf': lambda f, l: f"{l}{f[0]}",
+    'last.first': lambda f, l: f"{l}.{f}",
+    'firstl': lambda f, l: f"{f}{l[0]}",
+    'last': lambda f, l: l,
+    'first': lambda f, l: f,
+}
+
+def name_parts(name: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(first, last) as ASCII tokens, ignoring honorifics and middle initials; None for single names"""
+    tokens = [_NON_ALNUM_RE.sub('', t) for t in fold_accents(normalize_name(name)).split()]
+    tokens = [t for t in tokens if len(t) > 1 and t not in HONORIFICS]
+    if len(tokens) < 2:
+        return None
+    return tokens[0], tokens[-1]
+
+class EmailPatternLearner:
+    """
+    Learns how a directory builds addresses from names, per email domain.
+
+    Every (name, email) example votes for each template that reproduces its
+    local part under its domain. The best (template, domain) is trusted for
+    inference once it has `min_support` votes and explains at least
+    `min_confidence` of all examples. A confirmed address that the trusted
+    pattern would have built differently retires inference for good.
+    """
+
+    def __init__(self, min_support: Optional[int] = None, min_confidence: Optional[float] = None):
+        self.min_support = settings.email_pattern_min_support if min_support is None else min_support
+        self.min_confidence = settings.email_pattern_min_confidence if min_confidence is None else min_confidence
+        self.examples = 0
+        self.votes: Counter = Counter()
+        self.contradicted = False
+
+    def add(self, name: Optional[str], email: Optional[str]) -> bool:
+        """Record a known address; False if the name or email can't be used"""
+        parts = name_parts(name)
+        if not parts or not email or email.count('@') != 1:
+            return False
+        local, domain = email.strip().lower().split('@')
+        self.examples += 1
+        for template, render in TEMPLATES.items():
+            if render(*parts) == local:
+                self.votes[(template, domain)] += 1
+        return True
+
+    def best(self) -> Optional[Tuple[str, str, int, float]]:
+        """(template, domain, support, confidence) of the leading pattern, or None"""
+        if not self.votes:
+            return None
+        order = list(TEMPLATES)
+        (template, domain), support = max(self.votes.items(), key=lambda item: (item[1], -order.index(item[0][0])))
+        return template, domain, support, support / self.examples
+
+    def confirm(self, name: Optional[str], email: Optional[str]) -> bool:
+        """Record an address found on a profile page; False if the confident pattern predicted another one"""
+        predicted = self.infer(name)
+        if not self.add(name, email):
+            return True
+        if predicted and predicted != email.strip().lower():
+            self.contradicted = True
+            return False
+        return True
+
+    @property
+    def confident(self) -> bool:
+        if self.contradicted:
+            return False
+        best = self.best()
+        return best is not None and best[2] >= self.min_support and best[3] >= self.min_confidence
+
+    def infer(self, name: Optional[str]) -> Optional[str]:
+        """The address the confident pattern gives this name, or None"""
+        if not self.confident:
+            return None
+        parts = name_parts(name)
+        if not parts:
+            return None
+        template, domain, _, _ = self.best()
+        return f"{TEMPLATES[template](*parts)}@{domain}"
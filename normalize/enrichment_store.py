@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_url TEXT PRIMARY KEY,
+    email TEXT,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+class EnrichmentStore:
+    """
+    Last enrichment result per profile URL: the extracted email, a hash of the
+    page it came from and when it was fetched.
+
+    Entries younger than `ttl` seconds are used without touching the network;
+    older ones are refetched (conditionally, through the HTTP cache) and only
+    re-scanned when the page content actually changed. Reads and writes are
+    blocking SQLite calls; the enricher makes them through asyncio.to_thread.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None, enabled: Optional[bool] = None):
+        self.configure(path, ttl, enabled)
+
+    def configure(self, path: Optional[str] = None, ttl: Optional[int] = None, enabled: Optional[bool] = None):
+        self.path = path or settings.enrichment_db
+        self.ttl = settings.enrichment_ttl if ttl is None else ttl
+        self.enabled = settings.enrichment_store_enabled if enabled is None else enabled
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_many(self, profile_urls: Iterable[str]) -> Dict[str, Dict]:
+        """Stored entries for the given URLs, keyed by URL"""
+        urls = list(dict.fromkeys(profile_urls))
+        if not self.enabled or not urls:
+            return {}
+        entries = {}
+        with self._connect() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT * FROM profiles WHERE profile_url IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                entries.update({row["profile_url"]: dict(row) for row in rows})
+        return entries
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def put_many(self, entries: List[Dict]):
+        """Insert or replace {"profile_url", "email", "content_hash", "fetched_at"} rows"""
+        if not self.enabled or not entries:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO profiles (profile_url, email, content_hash, fetched_at) "
+                "VALUES (:profile_url, :email, :content_hash, :fetched_at)",
+                entries
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM profiles")
+
+enrichment_store = EnrichmentStore()
@@ -1,45 +1,157 @@
-
 import asyncio
-import re
-from typing import List, Dict, Any
+import hashlib
+import time
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Tuple
+from extract.matchers import find_email
 from fetch.http import fetch_html
+from config import settings
+from metrics import ENRICHMENT_LOOKUPS
+from normalize.columnar import clean_emails
+from normalize.email_patterns import EmailPatternLearner
+from normalize.enrichment_store import EnrichmentStore, enrichment_store
 
-async def enrich_emails_from_profiles(raw_leads: List[Dict[str, Any]], max_concurrent: int = 5) -> List[Dict[str, Any]]:
+async def enrich_emails_from_profiles(raw_leads: List[Dict[str, Any]], max_concurrent: int = 5,
+                                      on_progress: Optional[Callable[[int, int], None]] = None,
+                                      store: Optional[EnrichmentStore] = None,
+                                      infer_patterns: Optional[bool] = None) -> List[Dict[str, Any]]:
     """
     Fetch emails from individual profile URLs.
     Simple, fast, graceful fallback if anything fails.
+    Returns enriched copies of the leads, in their original order.
+    """
+    enriched_leads = list(raw_leads)
+    async for index, lead in iter_enriched_profiles(raw_leads, max_concurrent, on_progress, store, infer_patterns):
+        enriched_leads[index] = lead
+    return enriched_leads
+
+async def iter_enriched_profiles(raw_leads: List[Dict[str, Any]], max_concurrent: int = 5,
+                                 on_progress: Optional[Callable[[int, int], None]] = None,
+                                 store: Optional[EnrichmentStore] = None,
+                                 infer_patterns: Optional[bool] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
     """
-    enriched_leads = []
-    
+    Yield (index, enriched copy) for each lead as its profile finishes, fastest first.
+    Leads that already carry an email are handed back untouched.
+    Profiles enriched within the store's TTL are answered from the enrichment
+    store; stale ones are refetched and only re-scanned if the page changed.
+    `on_progress(done, total)` is called as each profile finishes.
+
+    With pattern inference on, the directory's address pattern is learned from
+    emails already known (listed, stored or just found on a profile). Once it
+    is confident, leads still without an email get a synthesized address
+    (`email_inferred`) instead of a profile fetch; leads it can't cover are
+    fetched as before. After every `email_pattern_confirm_every` inferences
+    the next lead with a profile is fetched instead, and a profile whose
+    address the pattern would have got wrong stops inference for the rest of
+    the directory.
+    """
+    store = store or enrichment_store
+    known = await asyncio.to_thread(store.get_many, [lead['profile_url'] for lead in raw_leads if lead.get('profile_url')])
+    updates = []
+
+    learner = None
+    if settings.email_pattern_inference if infer_patterns is None else infer_patterns:
+        learner = EmailPatternLearner()
+        for lead in raw_leads:
+            entry = known.get(lead.get('profile_url')) if lead.get('profile_url') else None
+            listed = clean_emails([str(lead.get('email') or lead.get('email_raw') or '') or None])[0]
+            learner.add(lead.get('name'), listed or (entry['email'] if entry and store.is_fresh(entry) else None))
+
     # Process in batches to be polite to servers
     semaphore = asyncio.Semaphore(max_concurrent)
-    
+    completed = 0
+    unconfirmed = 0
+
+    def apply_email(lead, email):
+        if email:
+            lead['email_raw'] = email
+            lead['email_enriched'] = True
+        else:
+            lead['email_enriched'] = False
+
+    def infer_email(lead) -> bool:
+        nonlocal unconfirmed
+        email = learner.infer(lead.get('name')) if learner else None
+        if not email:
+            return False
+        if lead.get('profile_url') and 0 < settings.email_pattern_confirm_every <= unconfirmed:
+            # Fetch this one to check the pattern still holds
+            unconfirmed = 0
+            return False
+        unconfirmed += 1
+        ENRICHMENT_LOOKUPS.inc(outcome="inferred")
+        lead['email_raw'] = email
+        lead['email_inferred'] = True
+        lead['email_enriched'] = False
+        return True
+
     async def enrich_single_profile(lead):
+        if lead.get('email') or lead.get('email_raw'):
+            return lead  # Already listed in the directory: no profile fetch
+        if not lead.get('profile_url'):
+            infer_email(lead)
+            return lead
+
+        entry = known.get(lead['profile_url'])
+        if entry and store.is_fresh(entry):
+            ENRICHMENT_LOOKUPS.inc(outcome="stored")
+            apply_email(lead, entry['email'])
+            return lead
+
         async with semaphore:
-            if not lead.get('profile_url'):
+            # Profiles queued behind the first fetches may not need one any more
+            if infer_email(lead):
                 return lead
-            
             try:
-                # Fetch profile page
+                # Fetch profile page (stale pages are revalidated by the HTTP cache)
                 html_content, _ = await fetch_html(lead['profile_url'], timeout=10)
-                
-                # Extract email with regex
-                email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', html_content)
-                
-                if email_match:
-                    lead['email_raw'] = email_match.group()
-                    lead['email_enriched'] = True
+                if not html_content:
+                    raise ValueError("empty profile page")
+
+                content_hash = hashlib.sha256(html_content.encode('utf-8', 'replace')).hexdigest()
+                if entry and entry['content_hash'] == content_hash:
+                    ENRICHMENT_LOOKUPS.inc(outcome="unchanged")
+                    email = entry['email']
                 else:
-                    lead['email_enriched'] = False
-                    
+                    ENRICHMENT_LOOKUPS.inc(outcome="changed")
+                    # Extract email with regex
+                    email = find_email(html_content)
+
+                apply_email(lead, email)
+                if learner and email:
+                    learner.confirm(lead.get('name'), email)
+                updates.append({
+                    'profile_url': lead['profile_url'],
+                    'email': email,
+                    'content_hash': content_hash,
+                    'fetched_at': time.time()
+                })
+
             except Exception:
-                # Graceful fallback - don't break the whole pipeline
-                lead['email_enriched'] = False
-                
+                # Graceful fallback - don't break the whole pipeline; a stale answer beats none
+                ENRICHMENT_LOOKUPS.inc(outcome="failed")
+                if entry:
+                    apply_email(lead, entry['email'])
+                else:
+                    lead['email_enriched'] = False
+
             return lead
-    
-    # Process all profiles concurrently
-    tasks = [enrich_single_profile(lead.copy()) for lead in raw_leads]
-    enriched_leads = await asyncio.gather(*tasks)
-    
-    return enriched_leads
+
+    async def enrich_and_report(index, lead):
+        nonlocal completed
+        lead = await enrich_single_profile(lead)
+        completed += 1
+        if on_progress:
+            on_progress(completed, len(raw_leads))
+        return index, lead
+
+    # Process all profiles concurrently, handing each back as soon as it is done
+    tasks = [asyncio.ensure_future(enrich_and_report(index, lead.copy())) for index, lead in enumerate(raw_leads)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Consumer stopped early: don't leave profile fetches running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.to_thread(store.put_many, updates)
@@ -1,5 +1,7 @@
 
 from .normalized_lead import NormalizedLead, EmailStatus, ScrapeResponse
 from .error_envelope import ErrorResponse
+from .job import JobState, JobInfo
+from .diff import FieldChange, LeadChange, ScrapeDiffResponse
 
-__all__ = ['NormalizedLead', 'EmailStatus', 'ScrapeResponse', 'ErrorResponse']
+__all__ = ['NormalizedLead', 'EmailStatus', 'ScrapeResponse', 'ErrorResponse', 'JobState', 'JobInfo', 'FieldChange', 'LeadChange', 'ScrapeDiffResponse']
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+from .normalized_lead import NormalizedLead
+
+class FieldChange(BaseModel):
+    old: Any = Field(None, description="Value in the previous snapshot")
+    new: Any = Field(None, description="Value in this scrape")
+
+class LeadChange(BaseModel):
+    name: str = Field(..., description="Faculty member's current name")
+    profile_url: Optional[str] = Field(None, description="Current profile URL")
+    matched_by: str = Field(..., description="How the lead was matched to the snapshot: profile_url or name")
+    changes: Dict[str, FieldChange] = Field(..., description="Changed fields, old and new values")
+
+class ScrapeDiffResponse(BaseModel):
+    success: bool = Field(..., description="Whether the scrape succeeded and the snapshot was updated")
+    source_url: str = Field(..., description="Directory URL that was scraped")
+    first_snapshot: bool = Field(False, description="No earlier snapshot existed; every lead is reported as added")
+    previous_snapshot_at: Optional[float] = Field(None, description="Unix time of the snapshot compared against")
+    snapshot_at: Optional[float] = Field(None, description="Unix time of the snapshot this scrape stored")
+    added: List[NormalizedLead] = Field(default_factory=list, description="Leads not in the previous snapshot")
+    removed: List[NormalizedLead] = Field(default_factory=list, description="Snapshot leads missing from this scrape")
+    changed: List[LeadChange] = Field(default_factory=list, description="Matched leads with field-level changes")
+    unchanged_count: int = Field(0, description="Matched leads with no changes")
+    total_found: int = Field(0, description="Leads in this scrape")
+    message: Optional[str] = Field(None, description="Human-readable status message")
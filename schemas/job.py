@@ -0,0 +1,20 @@
+
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+from enum import Enum
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class JobInfo(BaseModel):
+    job_id: str = Field(..., description="Job identifier returned by POST /jobs")
+    status: JobState = Field(..., description="Current job state")
+    url: str = Field(..., description="Directory URL being scraped")
+    progress: Dict[str, Any] = Field(default_factory=dict, description="Latest pipeline stage and counters")
+    error: Optional[str] = Field(None, description="Failure reason when status is failed")
+    created_at: float = Field(..., description="Unix time the job was enqueued")
+    started_at: Optional[float] = Field(None, description="Unix time a worker picked the job up")
+    finished_at: Optional[float] = Field(None, description="Unix time the job finished")
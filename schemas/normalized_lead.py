@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from enum import Enum
 
 class EmailStatus(str, Enum):
@@ -10,6 +10,7 @@ class EmailStatus(str, Enum):
     MISSING = "missing"
     NOT_LISTED = "not_listed"
     OBFUSCATED_UNRESOLVED = "obfuscated_unresolved"
+    INFERRED_PATTERN = "inferred_pattern"
 
 class NormalizedLead(BaseModel):
     name: str = Field(..., description="Full name of faculty member")
@@ -28,3 +29,6 @@ class ScrapeResponse(BaseModel):
     source_url: str = Field(..., description="URL that was scraped")
     strategy_used: Optional[str] = Field(None, description="Extraction strategy that succeeded")
     message: Optional[str] = Field(None, description="Human-readable status message")
+    fetch_notes: Optional[Dict[str, Any]] = Field(None, description="Fetch diagnostics (status, content type, cache hit/miss)")
+    strategy_timings: Optional[Dict[str, float]] = Field(None, description="Milliseconds spent in each strategy that ran")
+    timings: Optional[Dict[str, float]] = Field(None, description="Milliseconds per pipeline stage plus total, when include_timings is set")
@@ -0,0 +1,21 @@
+from benchmarks.bench_pipeline import bench_strategies, compare
+from benchmarks.corpus import build_corpus, directory_url
+
+def test_corpus_layouts_are_extracted():
+    """Every synthetic layout yields its faculty through the expected strategy"""
+    pages = build_corpus(sizes=[10], include_fixtures=False)
+    targets = [(layout, directory_url(layout, 10)) for layout in ('table', 'card', 'json_ld')]
+    results = bench_strategies(pages, targets, repeat=1)
+    assert results['strategy/table/directory_table']['leads'] == 10
+    assert results['strategy/card/faculty_generic']['leads'] == 10
+    assert results['strategy/json_ld/json_ld']['leads'] == 10
+    assert results['parse/table']['peak_kb'] > 0
+
+def test_compare_flags_calibrated_regressions():
+    """Slowdowns beyond tolerance fail; machine speed differences are scaled out"""
+    baseline = {'calibration_ms': 10.0, 'results': {'strategy/table-2000/directory_table': {'ms': 100.0}}}
+    slower_machine = {'calibration_ms': 20.0, 'results': {'strategy/table-2000/directory_table': {'ms': 200.0}}}
+    assert compare(slower_machine, baseline, tolerance=1.3) == []
+
+    regressed = {'calibration_ms': 10.0, 'results': {'strategy/table-2000/directory_table': {'ms': 150.0}}}
+    assert len(compare(regressed, baseline, tolerance=1.3)) == 1
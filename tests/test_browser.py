@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+from analyze.plan import looks_js_rendered
+from extract.strategies.directory_table import extract_directory_table
+from fetch.browser import BrowserPool, playwright_available
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def fixture_server():
+    """Serve fixtures/ over HTTP on localhost so rendering runs offline"""
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_js_shell_detection():
+    """App-shell pages are flagged for rendering; server-rendered tables are not"""
+    assert looks_js_rendered((FIXTURES / "js_rendered_directory.html").read_text())
+    assert not looks_js_rendered((FIXTURES / "sample_table_directory.html").read_text())
+
+def test_render_js_directory(fixture_server):
+    """A pooled context renders the JS-built table and reuses the context"""
+    if not playwright_available():
+        pytest.skip("playwright not installed")
+
+    async def run():
+        pool = BrowserPool(size=1, blocked_resources=["image", "font", "media"])
+        if not await pool.start():
+            pytest.skip(pool.last_error)
+        try:
+            url = f"{fixture_server}/js_rendered_directory.html"
+            async with pool.context() as context:
+                page = await context.new_page()
+                await page.goto(url, wait_until="networkidle")
+                html = await page.content()
+                await page.close()
+            async with pool.context() as again:
+                reused = again is context
+            return html, reused
+        finally:
+            await pool.close()
+
+    html, reused = asyncio.run(run())
+    leads = extract_directory_table(html, "https://music.example.edu/about/directory/music/index.html")
+    assert [lead["name"] for lead in leads] == ["Earnhart, Cari", "Lopez, Maria", "Chen, Wei"]
+    assert reused
@@ -0,0 +1,140 @@
+import asyncio
+from pathlib import Path
+from extract.document import ParsedDocument
+from extract.matchers import KeywordMatcher, find_email
+from extract.pagination import crawl_pages, detect_pagination, merge_page_leads
+from extract.runner import run_strategies
+from extract.strategies.directory_table import extract_directory_table
+from extract.strategies.faculty_generic import extract_faculty_generic
+from extract.strategies.json_ld import extract_json_ld_people, iter_json_ld_blocks
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+DIRECTORY_URL = "https://music.example.edu/about/directory/music/index.html"
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+def test_parsed_document_indexes():
+    """Script, table, mailto and class indexes come from one lxml parse"""
+    doc = ParsedDocument(load_fixture("sample_table_directory.html"), DIRECTORY_URL)
+    assert not doc.is_parsed
+    assert len(doc.scripts("text/javascript")) == 1
+    assert len(doc.tables) == 1
+    assert len(doc.mailto_anchors) == 3
+    assert [el.name for el in doc.by_class("directory", "footer-contact")] == ["table", "div"]
+    assert doc.by_class_pattern(r"footer", tag_name="div")[0].get_text(strip=True).startswith("Contact")
+
+def test_strategies_share_one_parse():
+    """Strategies reuse the document's soup instead of re-parsing"""
+    doc = ParsedDocument(load_fixture("sample_table_directory.html"), DIRECTORY_URL)
+    assert extract_json_ld_people(doc, DIRECTORY_URL) == []
+    soup = doc.soup
+    leads = extract_directory_table(doc, DIRECTORY_URL)
+    assert doc.soup is soup
+    assert [lead["name"] for lead in leads] == ["Earnhart, Cari", "Lopez, Maria", "Chen, Wei"]
+    assert leads[0]["profile_url"] == "https://music.example.edu/about/directory/music/earnhart-cari.html"
+    assert leads[1]["email"] == "mlopez@example.edu"
+
+def test_json_ld_people():
+    """Person entries nested under an Organization are extracted"""
+    doc = ParsedDocument(load_fixture("sample_json_ld_directory.html"), DIRECTORY_URL)
+    leads = extract_json_ld_people(doc, DIRECTORY_URL)
+    assert [lead["name"] for lead in leads] == ["Ada Lovelace", "Clara Schumann"]
+    assert leads[0]["title"] == "Professor of Composition"
+    assert not doc.is_parsed  # raw-text scan, no tree build
+
+def test_json_ld_scanner_handles_wrappers():
+    """Case, quoting and comment wrappers around the JSON body are tolerated"""
+    html = "<SCRIPT type='application/ld+json'>\n<!--\n{\"@type\": \"Person\", \"name\": \"Ada\"}\n-->\n</SCRIPT>"
+    assert list(iter_json_ld_blocks(html)) == ['{"@type": "Person", "name": "Ada"}']
+    assert list(iter_json_ld_blocks("<html><body><p>No structured data</p></body></html>")) == []
+
+def test_keyword_matcher_single_pass():
+    """Case-insensitive matching reports the most specific keyword"""
+    matcher = KeywordMatcher(["chair", "department chair", "professor"])
+    assert matcher.search("Associate PROFESSOR of Voice") == "professor"
+    assert matcher.search("Department Chair") == "department chair"
+    assert matcher.find_all("Professor and Chair") == {"professor", "chair"}
+    assert not matcher.matches("Staff Accompanist")
+    assert find_email("Contact: mlopez@example.edu") == "mlopez@example.edu"
+    assert find_email("no address here") is None
+
+def test_detect_pagination_fills_numbered_pager():
+    """?page= links in a '1 2 3 ... 9' pager expand to every page up to max_pages"""
+    html = """
+    <ul class="pager">
+      <li><a href="?page=1">1</a></li><li><a href="?page=2">2</a></li>
+      <li><a href="?page=3">3</a></li><li>...</li><li><a href="?page=9">9</a></li>
+      <li><a href="?page=2" rel="next">Next</a></li>
+    </ul>"""
+    pages = detect_pagination(html, "https://music.example.edu/faculty", max_pages=5)
+    assert pages == [f"https://music.example.edu/faculty?page={n}" for n in range(2, 6)]
+    assert detect_pagination(html, "https://music.example.edu/faculty", max_pages=1) == []
+
+def test_detect_pagination_ignores_lone_page_like_links():
+    """A WordPress ?p= post link or a single ?page=N link doesn't invent a run of pages"""
+    url = "https://music.example.edu/faculty/"
+    assert detect_pagination('<a href="/faculty/?p=1234">Latest news</a>', url) == []
+    assert detect_pagination('<a href="/faculty/?page=9">Archive</a>', url) == [url + "?page=9"]
+
+def test_crawl_pages_follows_rel_next_chain():
+    """rel=next chains are followed round by round, capped at max_pages"""
+    def page(n):
+        return f'<link rel="next" href="/faculty/page/{n + 1}/"><p>Page {n}</p>'
+
+    async def fake_fetch(url):
+        number = int(url.rstrip("/").rsplit("/", 1)[1])
+        return page(number), {"status_code": 200}
+
+    fetched = asyncio.run(crawl_pages("https://music.example.edu/faculty/page/1/", page(1), 3, fetch=fake_fetch))
+    assert [url for url, _, _ in fetched] == [
+        "https://music.example.edu/faculty/page/2/",
+        "https://music.example.edu/faculty/page/3/",
+    ]
+
+def test_merge_page_leads_drops_repeats():
+    first = [{"name": "Lopez, Maria", "profile_url": "https://x.edu/lopez/"}]
+    second = [{"name": "lopez,  maria", "profile_url": "https://x.edu/lopez"}, {"name": "Chen, Wei"}]
+    merged = merge_page_leads([("https://x.edu/faculty", first), ("https://x.edu/faculty?page=2", second)])
+    assert [lead["name"] for lead in merged] == ["Lopez, Maria", "Chen, Wei"]
+    assert [lead["directory_url"] for lead in merged] == ["https://x.edu/faculty", "https://x.edu/faculty?page=2"]
+
+def test_best_mode_prefers_richer_strategy():
+    """A noisy faculty_generic hit no longer hides a complete directory table"""
+    html = """
+    <ul><li><h3>Events</h3></li><li><h3>News</h3></li></ul>
+    <table>
+      <tr><th>Name</th><th>Title</th></tr>
+      <tr><td><a href="/p/lopez">Lopez, Maria</a></td><td>Professor of Voice</td></tr>
+      <tr><td><a href="/p/chen">Chen, Wei</a></td><td>Lecturer, Piano</td></tr>
+    </table>"""
+    strategies = ["json_ld", "faculty_generic", "directory_table"]
+    first = run_strategies(ParsedDocument(html), DIRECTORY_URL, strategies, mode="first")
+    best = run_strategies(ParsedDocument(html), DIRECTORY_URL, strategies, mode="best")
+    assert first["strategy"] == "faculty_generic"
+    assert best["strategy"] == "directory_table"
+    assert set(best["timings"]) == set(strategies)
+    assert best["scores"]["directory_table"] > best["scores"]["faculty_generic"]
+
+def test_faculty_generic_skips_chrome_and_outer_containers():
+    """Menus in nav/header/footer are ignored and nested containers yield one lead per person"""
+    html = """
+    <header><ul><li><h3>Admissions</h3></li></ul></header>
+    <nav><ul><li><h2>About</h2><ul><li><h3>History</h3></li></ul></li></ul></nav>
+    <main>
+      <ul class="faculty">
+        <li class="person"><article class="card"><header><h3>Lopez, Maria</h3></header>
+          <p class="title">Professor of Voice</p><a href="/p/lopez">Profile</a>
+          <a href="mailto:mlopez@example.edu">Email</a><a href="https://twitter.com/mlopez">Tw</a></article></li>
+        <li class="person"><h3>Chen, Wei</h3><ul><li>Office: M-101</li></ul>
+          <p>Lecturer, Piano</p></li>
+      </ul>
+    </main>
+    <div role="contentinfo"><ul><li><h3>Contact us</h3></li></ul></div>"""
+    leads = extract_faculty_generic(html, DIRECTORY_URL)
+    assert [lead["name"] for lead in leads] == ["Lopez, Maria", "Chen, Wei"]
+    assert leads[0]["title"] == "Professor of Voice"
+    assert leads[0]["email_raw"] == "mlopez@example.edu"
+    assert leads[0]["profile_url"] == "https://music.example.edu/p/lopez"
+    assert leads[0]["socials"] == ["https://twitter.com/mlopez"]
+    assert leads[1]["title"] == leads[1]["bio_snippet"] == "Lecturer, Piano"
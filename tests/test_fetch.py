@@ -0,0 +1,352 @@
+import asyncio
+import os
+import time
+import httpx
+import pytest
+from fetch.cache import ResponseCache, response_cache
+from fetch.http import fetch_html
+from fetch.pool import client_pool
+from fetch.robots import RobotsRules, robots_cache
+from fetch.scheduler import FetchScheduler, fetch_scheduler, parse_retry_after
+from config import settings
+from analyze.plan import discover_directory_urls
+
+@pytest.fixture
+def mock_site(tmp_path):
+    """Route the shared client pool through an in-memory transport with a throwaway cache"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        calls.append(str(request.url))
+        if request.url.path == "/missing":
+            return httpx.Response(404, text="not found")
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html="<html><body><h1>Faculty</h1></body></html>", headers={"ETag": '"v1"'})
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    yield calls
+    asyncio.run(client_pool.close())
+    client_pool.configure(transport=None)
+    response_cache.configure()
+    robots_cache.configure()
+
+def test_fetch_html_reuses_shared_client(mock_site):
+    """Every fetch on the same loop goes through one pooled client"""
+    async def run():
+        first, notes = await fetch_html("https://music.example.edu/faculty")
+        client = client_pool.get_client()
+        second, _ = await fetch_html("https://music.example.edu/faculty/a")
+        return first, notes, client is client_pool.get_client()
+
+    html, notes, same_client = asyncio.run(run())
+    assert "Faculty" in html
+    assert notes["status_code"] == 200
+    assert same_client
+    assert len(mock_site) == 2
+
+def test_fetch_html_reports_http_errors(mock_site):
+    """Non-200 responses come back empty with the status recorded"""
+    html, notes = asyncio.run(fetch_html("https://music.example.edu/missing"))
+    assert html == ""
+    assert notes["errors"] == ["HTTP 404"]
+
+def test_replaced_clients_are_closed():
+    """Reconfiguring the pool or moving to a new loop closes the old client instead of leaking its connections"""
+    async def open_client():
+        client = client_pool.get_client()
+        await asyncio.sleep(0)  # Let a retired client's close run
+        return client
+
+    client_pool.configure(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    try:
+        first = asyncio.run(open_client())
+        second = asyncio.run(open_client())
+        assert first.is_closed and not second.is_closed
+
+        client_pool.configure(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        assert second.is_closed
+    finally:
+        client_pool.configure(transport=None)
+
+def test_host_slot_caps_concurrency():
+    """No more than per_host_limit requests to one host run at once"""
+    client_pool.configure(per_host_limit=2)
+    in_flight = []
+    peak = []
+
+    async def hit(url):
+        async with client_pool.host_slot(url):
+            in_flight.append(url)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(url)
+
+    async def run():
+        await asyncio.gather(*(hit(f"https://music.example.edu/p/{i}") for i in range(6)))
+
+    asyncio.run(run())
+    client_pool.configure(per_host_limit=settings.http_per_host_limit)
+    assert max(peak) == 2
+
+def test_cache_hit_then_revalidation(mock_site):
+    """Fresh entries skip the network; stale ones are revalidated with a 304"""
+    url = "https://music.example.edu/faculty"
+    _, first = asyncio.run(fetch_html(url))
+    _, second = asyncio.run(fetch_html(url))
+    assert first["cache"] == "miss"
+    assert second["cache"] == "hit"
+    assert len(mock_site) == 1
+
+    response_cache.ttl = 0
+    html, third = asyncio.run(fetch_html(url))
+    assert third["cache"] == "revalidated"
+    assert "Faculty" in html
+    assert len(mock_site) == 2
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Bodies beyond max_bytes are evicted oldest-access first"""
+    cache = ResponseCache(directory=str(tmp_path), ttl=60, max_bytes=250, enabled=True)
+    cache.store("https://a.edu/1", 200, {}, b"a" * 100)
+    cache.store("https://a.edu/2", 200, {}, b"b" * 100)
+    entry = cache.lookup("https://a.edu/1")
+    os.utime(cache._meta_path("https://a.edu/1"), (time.time() + 5, time.time() + 5))
+    cache.store("https://a.edu/3", 200, {}, b"c" * 100)
+
+    assert entry is not None
+    assert cache.lookup("https://a.edu/1") is not None
+    assert cache.lookup("https://a.edu/2") is None
+    assert cache.lookup("https://a.edu/3") is not None
+
+def test_streaming_fetch_limits(tmp_path, monkeypatch):
+    """Non-HTML is skipped unread, bodies are capped, charsets sniffed and reading stops at </html>"""
+    pulled = []
+
+    async def chunks():
+        for chunk in [b"<html><head><meta charset=\"iso-8859-1\"></head><body>Jos\xe9 " + b" " * 5000,
+                      b"</body></html>", b"<!-- trailing -->"]:
+            pulled.append(chunk)
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        if request.url.path == "/cv.pdf":
+            return httpx.Response(200, content=b"%PDF" * 100, headers={"content-type": "application/pdf"})
+        if request.url.path == "/declared":
+            return httpx.Response(200, content=b"<p>" * 1000, headers={"content-type": "text/html"})
+        if request.url.path == "/huge":
+            async def endless():
+                for _ in range(100):
+                    yield b"<p>" * 100
+            return httpx.Response(200, content=endless(), headers={"content-type": "text/html"})
+        return httpx.Response(200, content=chunks(), headers={"content-type": "text/html"})
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    monkeypatch.setattr(settings, "fetch_max_bytes", 2000)
+    try:
+        html, notes = asyncio.run(fetch_html("https://music.example.edu/cv.pdf"))
+        assert html == "" and notes["errors"][0].startswith("Skipped non-HTML")
+
+        html, notes = asyncio.run(fetch_html("https://music.example.edu/declared"))
+        assert html == "" and notes["errors"][0].startswith("Response too large")
+
+        html, notes = asyncio.run(fetch_html("https://music.example.edu/huge"))
+        assert notes["truncated"] and notes["content_length"] == 2000
+        assert response_cache.lookup("https://music.example.edu/huge") is None
+
+        monkeypatch.setattr(settings, "fetch_max_bytes", 1 << 20)
+        html, notes = asyncio.run(fetch_html("https://music.example.edu/faculty"))
+        assert "José" in html and "trailing" not in html
+        assert len(pulled) == 2 and notes["stopped_at_html_end"]
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+
+def test_scheduler_round_robins_domains_and_honors_retry_after():
+    """Queued requests alternate between domains; a 429 with Retry-After pauses only that domain"""
+    scheduler = FetchScheduler(rate=1000, burst=1, max_in_flight=1)
+    order = []
+
+    async def fetch(url):
+        async with scheduler.slot(url) as ticket:
+            order.append(url.split("/")[2])
+            scheduler.done(ticket, url, 200)
+            await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(*[fetch(f"https://big.edu/{i}") for i in range(4)], fetch("https://small.edu/1"))
+        async with scheduler.slot("https://big.edu/x") as ticket:
+            scheduler.done(ticket, "https://big.edu/x", 429, retry_after="1")
+        start = time.monotonic()
+        await fetch("https://small.edu/2")
+        small_wait = time.monotonic() - start
+        start = time.monotonic()
+        await fetch("https://big.edu/y")
+        return small_wait, time.monotonic() - start
+
+    small_wait, big_wait = asyncio.run(run())
+    assert order[:3] == ["big.edu", "small.edu", "big.edu"]
+    assert small_wait < 0.5 <= big_wait
+    assert parse_retry_after("120") == 120.0
+
+def test_retries_transient_failures_and_hedges_slow_requests(tmp_path, monkeypatch):
+    """503s and timeouts are retried with backoff; a request past the host's p95 is hedged"""
+    import fetch.http
+    from fetch.retry import HostLatency, RetryPolicy
+    attempts = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/robots.txt":
+            return httpx.Response(404)
+        attempts[path] = attempts.get(path, 0) + 1
+        if path == "/flaky" and attempts[path] == 1:
+            return httpx.Response(503)
+        if path == "/down":
+            raise httpx.ConnectTimeout("timed out", request=request)
+        if path == "/slow" and attempts[path] == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, html="<html><body>ok</body></html>")
+
+    latency = HostLatency(min_samples=1)
+    latency.record("https://slow.example.edu/", 0.05)
+    monkeypatch.setattr(fetch.http, "retry_policy", RetryPolicy(attempts=3, backoff_base=0.01, hedge=True))
+    monkeypatch.setattr(fetch.http, "host_latency", latency)
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"), enabled=False)
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    try:
+        html, notes = asyncio.run(fetch_html("https://music.example.edu/flaky"))
+        assert "ok" in html and notes["attempts"] == 2 and notes["retries"] == ["HTTP 503"]
+
+        html, notes = asyncio.run(fetch_html("https://music.example.edu/down"))
+        assert html == "" and notes["attempts"] == 3 and notes["errors"] == ["Request timeout"]
+
+        start = time.monotonic()
+        # A separate host: the failures above have (rightly) throttled music.example.edu
+        html, notes = asyncio.run(fetch_html("https://slow.example.edu/slow"))
+        assert "ok" in html and notes.get("hedged")
+        assert time.monotonic() - start < 0.9
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+        fetch_scheduler.configure()
+
+def test_hedge_success_beats_a_simultaneous_failure():
+    """When one attempt fails in the same instant the other succeeds, the success is returned"""
+    from fetch.retry import hedged
+
+    async def run(failing):
+        release = asyncio.Event()
+        started = []
+
+        async def attempt(on_sent):
+            index = len(started)
+            started.append(index)
+            on_sent()
+            if index == 1:
+                # Wake both attempts in the same loop iteration
+                asyncio.get_running_loop().call_soon(release.set)
+            await release.wait()
+            if index == failing:
+                raise httpx.ConnectError("reset")
+            return "ok"
+
+        return await hedged(attempt, 0.01)
+
+    # Which finished task asyncio.wait lists first varies, so try both sides a few times
+    for _ in range(10):
+        assert asyncio.run(run(failing=0)) == ("ok", True)
+        assert asyncio.run(run(failing=1)) == ("ok", False)
+
+def test_fetch_deadline_includes_scheduler_waits(tmp_path, monkeypatch):
+    """A Retry-After pause longer than the fetch deadline ends the fetch at the deadline"""
+    import fetch.http
+    from fetch.retry import RetryPolicy
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        return httpx.Response(429, headers={"Retry-After": "30"})
+
+    monkeypatch.setattr(fetch.http, "retry_policy", RetryPolicy(attempts=3, backoff_base=0.01, deadline=0.5, hedge=False))
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"), enabled=False)
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    try:
+        start = time.monotonic()
+        html, notes = asyncio.run(fetch_html("https://paused.example.edu/faculty"))
+        assert html == "" and notes["attempts"] == 2
+        assert notes["errors"] == ["Deadline of 0.5s exceeded"] and notes["retries"] == ["HTTP 429"]
+        assert time.monotonic() - start < 1.5
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+        fetch_scheduler.configure()
+
+def test_robots_rules_and_sitemap_discovery(tmp_path):
+    """robots.txt is fetched once per host and cached on disk; disallowed URLs are not fetched"""
+    calls = []
+    robots_txt = (
+        "User-agent: *\nDisallow: /private\nAllow: /private/faculty$\n\n"
+        "User-agent: ScrapingAgent\nDisallow: /search\n\n"
+        "Sitemap: https://music.robots.edu/sitemap_index.xml\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text=robots_txt)
+        if request.url.path == "/sitemap_index.xml":
+            return httpx.Response(200, text="<sitemapindex><sitemap><loc>https://music.robots.edu/pages.xml</loc></sitemap></sitemapindex>")
+        if request.url.path == "/pages.xml":
+            return httpx.Response(200, text="<urlset><url><loc>https://music.robots.edu/faculty/</loc></url>"
+                                            "<url><loc>https://music.robots.edu/events/</loc></url>"
+                                            "<url><loc>https://music.robots.edu/faculty/ada-lovelace/</loc></url></urlset>")
+        return httpx.Response(200, html="<html><body>ok</body></html>")
+
+    rules = RobotsRules.parse(robots_txt, "ScrapingAgent")
+    assert not rules.is_allowed("https://music.robots.edu/search?q=x")
+    assert rules.is_allowed("https://music.robots.edu/private/notes")  # the specific group replaces '*'
+    star = RobotsRules.parse(robots_txt, "OtherBot")
+    assert not star.is_allowed("https://music.robots.edu/private/notes")
+    assert star.is_allowed("https://music.robots.edu/private/faculty")
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"), enabled=False)
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    try:
+        async def run():
+            return await asyncio.gather(
+                fetch_html("https://music.robots.edu/faculty/"),
+                fetch_html("https://music.robots.edu/search?q=piano"),
+                robots_cache.sitemap_urls("https://music.robots.edu/")
+            )
+
+        (html, _), (blocked, notes), pages = asyncio.run(run())
+        assert "ok" in html
+        assert blocked == "" and notes["robots"] == "disallowed"
+        assert pages[:2] == ["https://music.robots.edu/faculty/", "https://music.robots.edu/events/"]
+        assert asyncio.run(discover_directory_urls("https://music.robots.edu/")) == [
+            "https://music.robots.edu/faculty/", "https://music.robots.edu/faculty/ada-lovelace/"
+        ]
+        assert calls.count("/robots.txt") == 1 and "/search" not in calls
+
+        # A fresh process (empty memory cache) reads the rules back from disk
+        robots_cache.configure(directory=str(tmp_path / "robots"))
+        asyncio.run(fetch_html("https://music.robots.edu/faculty/"))
+        assert calls.count("/robots.txt") == 1
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
@@ -1,10 +1,24 @@
 
+import httpx
 import pytest
+from pathlib import Path
 from fastapi.testclient import TestClient
+from api.result_cache import ResultCache, compute_pipeline_version, result_cache
+from fetch.cache import response_cache
+from fetch.pool import client_pool
+from fetch.robots import robots_cache
 from main import app
 
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
 client = TestClient(app)
 
+def serve(page):
+    """Mock transport answering every path with page() and /robots.txt with a 404"""
+    return httpx.MockTransport(
+        lambda request: httpx.Response(404) if request.url.path == "/robots.txt" else httpx.Response(200, html=page())
+    )
+
 def test_fresno_music_golden_fixture():
     """
     Golden test: Fresno State Music Faculty Directory
@@ -32,3 +46,177 @@ def test_fresno_music_golden_fixture():
     assert first_item["profile_url"].startswith("https://cah.fresnostate.edu/about/directory/music/")
     
     print(f"✅ Golden fixture passed: {data['total_found']} items extracted")
+
+def test_sample_table_fixture_offline(tmp_path):
+    """
+    Offline golden test: the recorded sample table directory served through a
+    mock transport runs the full pipeline (fetch, process-pool extraction, normalize).
+    """
+    html = (FIXTURES / "sample_table_directory.html").read_text(encoding="utf-8")
+    client_pool.configure(transport=serve(lambda: html))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    result_cache.configure(directory=str(tmp_path / "results"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    try:
+        response = client.post("/scrape", json={
+            "url": "https://music.example.edu/about/directory/music/index.html",
+            "strategy_mode": "best"
+        })
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        result_cache.configure()
+        robots_cache.configure()
+
+    data = response.json()
+    assert data["success"] == True
+    assert data["strategy_used"] == "directory_table"
+    assert [item["name"] for item in data["items"]] == ["Earnhart, Cari", "Lopez, Maria", "Chen, Wei"]
+    assert data["fetch_notes"]["cache"] == "miss"
+    assert "directory_table" in data["strategy_timings"]
+
+def test_result_cache_skips_extraction_for_identical_pages(tmp_path, monkeypatch):
+    """An unchanged page is answered from the result cache; a new pipeline version misses"""
+    from extract.executor import parse_executor
+    html = (FIXTURES / "sample_table_directory.html").read_text(encoding="utf-8")
+    client_pool.configure(transport=serve(lambda: html))
+    response_cache.configure(directory=str(tmp_path / "http"), enabled=False)
+    result_cache.configure(directory=str(tmp_path / "results"), enabled=True)
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    payload = {"url": "https://music.example.edu/people/", "max_pages": 1}
+    try:
+        first = client.post("/scrape", json=payload).json()
+        submitted = parse_executor.metrics()["submitted"]
+        second = client.post("/scrape", json=payload).json()
+        assert parse_executor.metrics()["submitted"] == submitted
+        assert first["fetch_notes"]["result_cache"] == "miss"
+        assert second["fetch_notes"]["result_cache"] == "hit"
+        assert second["items"] == first["items"]
+
+        result_cache.configure(directory=str(tmp_path / "results"), enabled=True, version="next")
+        third = client.post("/scrape", json=payload).json()
+        assert third["fetch_notes"]["result_cache"] == "miss"
+        assert compute_pipeline_version() == compute_pipeline_version()
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        result_cache.configure()
+        robots_cache.configure()
+
+def test_result_cache_overwrites_keep_size_accounting(tmp_path):
+    """Rewriting a key replaces its bytes instead of adding to them, so nothing is evicted early"""
+    cache = ResultCache(directory=str(tmp_path), max_bytes=300, enabled=True, version="v1")
+    cache.put("other", {"items": "b" * 100})
+    for _ in range(5):
+        cache.put("same", {"items": "a" * 100})
+    assert cache.get("other") is not None and cache.get("same") is not None
+    assert cache._total_bytes == sum(entry[3] for entry in cache._entries())
+
+def test_scrape_diff_reports_only_changes(tmp_path):
+    """The first diff stores a snapshot; the next one reports added, removed and changed leads"""
+    from api.snapshots import snapshot_store
+    html = (FIXTURES / "sample_table_directory.html").read_text(encoding="utf-8")
+    pages = [html, html.replace("Associate Professor of Voice", "Professor of Voice").replace(
+        '<td><a href="https://music.example.edu/people/chen-wei">Chen, Wei</a></td>',
+        '<td><a href="/about/directory/music/ngata-aroha.html">Ngata, Aroha</a></td>'
+    )]
+    client_pool.configure(transport=serve(lambda: pages[0]))
+    response_cache.configure(directory=str(tmp_path / "http"), enabled=False)
+    result_cache.configure(directory=str(tmp_path / "results"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    snapshot_store.configure(str(tmp_path / "snapshots.sqlite3"))
+    payload = {"url": "https://music.example.edu/about/directory/music/", "max_pages": 1}
+    try:
+        first = client.post("/scrape/diff", json=payload).json()
+        pages.pop(0)
+        second = client.post("/scrape/diff", json=payload).json()
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        result_cache.configure()
+        robots_cache.configure()
+        snapshot_store.configure()
+
+    assert first["first_snapshot"] and len(first["added"]) == 3
+    assert [lead["name"] for lead in second["added"]] == ["Ngata, Aroha"]
+    assert [lead["name"] for lead in second["removed"]] == ["Chen, Wei"]
+    assert second["changed"][0]["name"] == "Lopez, Maria"
+    assert second["changed"][0]["matched_by"] == "profile_url"
+    assert second["changed"][0]["changes"]["title"] == {"old": "Associate Professor of Voice", "new": "Professor of Voice"}
+    assert second["unchanged_count"] == 1
+
+def test_scrape_stream_sends_leads_before_enrichment_updates(tmp_path):
+    """?stream=true emits every extracted lead, then an update per enriched profile, then the summary"""
+    import json
+    from normalize.enrichment_store import enrichment_store
+    html = (FIXTURES / "sample_table_directory.html").read_text(encoding="utf-8")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        if request.url.path == "/people/chen-wei":
+            return httpx.Response(200, html="<p>Email: wchen@example.edu</p>")
+        if request.url.path.endswith(".html") and "index" not in request.url.path:
+            return httpx.Response(200, html="<p>No contact listed</p>")
+        return httpx.Response(200, html=html)
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    enrichment_store.configure(path=str(tmp_path / "enrichment.sqlite3"))
+    payload = {"url": "https://music.example.edu/about/directory/music/index.html", "max_pages": 1, "enrich_profiles": True}
+    try:
+        with client.stream("POST", "/scrape?stream=true", json=payload) as response:
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            events = [json.loads(line) for line in response.iter_lines() if line]
+        sse = client.post("/scrape?stream=true", json=payload, headers={"Accept": "text/event-stream"})
+        plain = client.post("/scrape", json=payload).json()
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+        enrichment_store.configure()
+
+    assert [event["event"] for event in events] == ["lead", "lead", "lead", "update", "done"]
+    assert [event["lead"]["name"] for event in events[:3]] == ["Earnhart, Cari", "Lopez, Maria", "Chen, Wei"]
+    assert events[2]["lead"]["email_status"] == "missing"
+    assert events[3]["index"] == 2 and events[3]["lead"]["email"] == "wchen@example.edu"
+    assert events[3]["lead"]["email_status"] == "found_on_profile"
+    assert events[4]["response"]["total_found"] == 3 and "items" not in events[4]["response"]
+
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: lead\ndata: {")
+    assert sse.text.rstrip().split("\n\n")[-1].startswith("event: done\n")
+
+    # Without ?stream=true the same request is enriched too
+    assert plain["items"][2]["email"] == "wchen@example.edu"
+
+def test_paginated_scrape_keeps_each_leads_page(tmp_path):
+    """Leads from a second directory page point at that page, not the first"""
+    rows = {"1": ("Lopez, Maria", "Professor of Voice", "lopez"), "2": ("Chen, Wei", "Lecturer, Piano", "chen")}
+
+    def page(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        number = request.url.params.get("page", "1")
+        name, title, slug = rows[number]
+        link = '<link rel="next" href="/faculty/?page=2">' if number == "1" else ""
+        return httpx.Response(200, html=f'<html><head>{link}</head><body><table><tr><th>Name</th><th>Title</th></tr>'
+                                        f'<tr><td><a href="/people/{slug}">{name}</a></td><td>{title}</td></tr></table></body></html>')
+
+    client_pool.configure(transport=httpx.MockTransport(page))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    result_cache.configure(directory=str(tmp_path / "results"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    try:
+        data = client.post("/scrape", json={"url": "https://music.example.edu/faculty/", "max_pages": 2}).json()
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        result_cache.configure()
+        robots_cache.configure()
+
+    assert [(item["name"], item["directory_url"]) for item in data["items"]] == [
+        ("Lopez, Maria", "https://music.example.edu/faculty/"),
+        ("Chen, Wei", "https://music.example.edu/faculty/?page=2"),
+    ]
@@ -0,0 +1,107 @@
+import time
+import httpx
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+from main import app
+from api.result_cache import result_cache
+from fetch.cache import response_cache
+from fetch.pool import client_pool
+from fetch.robots import robots_cache
+from jobs import job_store
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+@pytest.fixture
+def jobs_client(tmp_path):
+    """App with its lifespan running (so workers are up), a throwaway job database and a mock site"""
+    html = (FIXTURES / "sample_table_directory.html").read_text(encoding="utf-8")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/faculty/":
+            return httpx.Response(200, html=html)
+        return httpx.Response(404)
+
+    job_store.configure(str(tmp_path / "jobs.sqlite3"))
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    result_cache.configure(directory=str(tmp_path / "results"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    with TestClient(app) as client:
+        yield client
+    job_store.configure()
+    client_pool.configure(transport=None)
+    response_cache.configure()
+    result_cache.configure()
+    robots_cache.configure()
+
+def wait_for_job(client, job_id):
+    status = None
+    for _ in range(100):
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(0.05)
+    return status
+
+def test_job_lifecycle(jobs_client):
+    """POST /jobs queues a scrape that a worker runs to completion"""
+    response = jobs_client.post("/jobs", json={"url": "https://music.example.edu/faculty/", "max_pages": 1})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    status = wait_for_job(jobs_client, job_id)
+    assert status["status"] == "succeeded"
+    assert status["progress"]["stage"] in ("normalize", "extract")
+    result = jobs_client.get(f"/jobs/{job_id}/result").json()
+    assert result["source_url"] == "https://music.example.edu/faculty/"
+    assert result["total_found"] == 3
+
+def test_unsuccessful_scrape_marks_job_failed(jobs_client):
+    """A scrape that comes back with success=False is a failed job, not a succeeded one"""
+    job_id = jobs_client.post("/jobs", json={"url": "https://music.example.edu/missing/"}).json()["job_id"]
+    status = wait_for_job(jobs_client, job_id)
+    assert status["status"] == "failed" and status["error"]
+    assert jobs_client.get(f"/jobs/{job_id}/result").status_code == 409
+
+def test_unknown_job_returns_404(jobs_client):
+    assert jobs_client.get("/jobs/does-not-exist").status_code == 404
+    assert jobs_client.get("/jobs/does-not-exist/result").status_code == 404
+
+def test_claim_is_exclusive(tmp_path):
+    """A queued job is handed to exactly one worker"""
+    job_store.configure(str(tmp_path / "jobs.sqlite3"))
+    job_id = job_store.enqueue({"url": "https://example.com"})
+    first = job_store.claim_next()
+    second = job_store.claim_next()
+    job_store.configure()
+    assert first["job_id"] == job_id
+    assert second is None
+
+def test_only_expired_leases_are_requeued(tmp_path):
+    """Recovery leaves jobs with a live lease alone and requeues ones whose worker stopped renewing"""
+    job_store.configure(str(tmp_path / "jobs.sqlite3"))
+    try:
+        live = job_store.enqueue({"url": "https://example.com/a"})
+        dead = job_store.enqueue({"url": "https://example.com/b"})
+        assert job_store.claim_next("worker-a", lease_seconds=60)["job_id"] == live
+        assert job_store.claim_next("worker-b", lease_seconds=-1)["job_id"] == dead
+
+        assert job_store.requeue_expired() == 1
+        assert job_store.get(live).status.value == "running"
+        assert job_store.get(dead).status.value == "queued"
+
+        assert job_store.heartbeat("worker-a", [live], lease_seconds=-1) == 1
+        assert job_store.heartbeat("worker-b", [live]) == 0  # not its job
+        assert job_store.requeue_expired() == 1
+        assert job_store.get(live).status.value == "queued"
+
+        # worker-a's lease lapsed and worker-c took the job over: a's late result must not land
+        assert job_store.claim_next("worker-c", lease_seconds=60)["job_id"] == live
+        assert not job_store.complete(live, {"source_url": "stale"}, owner="worker-a")
+        assert not job_store.fail(live, "stale", owner="worker-a")
+        assert job_store.get(live).status.value == "running"
+        assert job_store.complete(live, {"source_url": "fresh"}, owner="worker-c")
+        assert job_store.get_result(live) == {"source_url": "fresh"}
+    finally:
+        job_store.configure()
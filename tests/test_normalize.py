@@ -0,0 +1,216 @@
+import asyncio
+import httpx
+from config import settings
+from fetch.cache import response_cache
+from fetch.pool import client_pool
+from fetch.robots import robots_cache
+from schemas import EmailStatus, NormalizedLead
+from normalize.columnar import normalize_columns
+from normalize.dedupe import dedupe_leads
+from normalize.email_patterns import EmailPatternLearner
+from normalize.enrichment_store import EnrichmentStore
+from normalize.normalize import normalize_faculty_data
+from normalize.profile_enricher import enrich_emails_from_profiles
+
+def test_enrichment_store_skips_unchanged_profiles(tmp_path):
+    """Repeat enrichments are served from the store; stale entries reuse the stored email when the page is unchanged"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        calls.append(str(request.url))
+        if request.headers.get("if-none-match") == '"p1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html=f"<p>Contact: {request.url.path[1:]}@music.edu</p>", headers={"ETag": '"p1"'})
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    store = EnrichmentStore(path=str(tmp_path / "enrichment.sqlite3"), ttl=3600, enabled=True)
+    leads = [{"name": "Ada Lovelace", "profile_url": "https://music.edu/ada"},
+             {"name": "Clara Schumann", "profile_url": "https://music.edu/clara"},
+             {"name": "No Profile"},
+             {"name": "Listed Already", "email": "listed@music.edu", "profile_url": "https://music.edu/listed"}]
+    try:
+        first = asyncio.run(enrich_emails_from_profiles(leads, store=store))
+        assert [lead.get("email_raw") for lead in first] == ["ada@music.edu", "clara@music.edu", None, None]
+        assert first[3] == leads[3]
+        assert len(calls) == 2
+
+        second = asyncio.run(enrich_emails_from_profiles(leads, store=store))
+        assert second[0]["email_raw"] == "ada@music.edu" and second[0]["email_enriched"]
+        assert len(calls) == 2
+
+        store.ttl = 0
+        response_cache.ttl = 0
+        third = asyncio.run(enrich_emails_from_profiles(leads, store=store))
+        assert third[1]["email_raw"] == "clara@music.edu"
+        assert len(calls) == 4  # conditional revalidations, answered with 304
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+
+def test_columnar_normalization_matches_validated_models():
+    """Both extractor email keys are read, statuses come from one pass, and constructed models equal validated ones"""
+    raw = [
+        {"name": " Lopez, Maria ", "title": "Professor ", "email": "mailto:MLopez@Example.edu",
+         "profile_url": "https://music.edu/lopez"},
+        {"name": "Ada Lovelace", "email_raw": "ada@music.edu", "email_enriched": True, "url": "/relative"},
+        {"name": "Chen, Wei", "jobTitle": "Lecturer", "email": "wchen [at] music.edu", "socials": "nope"},
+        {"name": "Clara Schumann", "directory_url": "https://music.edu/page/2", "socials": ["https://x.com/clara"]},
+        {"name": "   ", "email": "ghost@music.edu"},
+    ]
+    leads = normalize_columns(raw, "https://music.edu/faculty")
+
+    assert [lead.name for lead in leads] == ["Lopez, Maria", "Ada Lovelace", "Chen, Wei", "Clara Schumann"]
+    assert [lead.email for lead in leads] == ["mlopez@example.edu", "ada@music.edu", None, None]
+    assert [lead.email_status for lead in leads] == [
+        EmailStatus.PRESENT, EmailStatus.FOUND_ON_PROFILE, EmailStatus.OBFUSCATED_UNRESOLVED, EmailStatus.MISSING
+    ]
+    assert leads[0].title == "Professor" and leads[2].title == "Lecturer"
+    assert leads[1].profile_url is None and leads[2].socials == []
+    assert leads[3].directory_url == "https://music.edu/page/2" and leads[0].directory_url == "https://music.edu/faculty"
+    assert [NormalizedLead.model_validate(lead.model_dump()) for lead in leads] == leads
+
+    # The legacy entry point still stamps every lead with the directory it was given
+    legacy = normalize_faculty_data(raw, "https://music.edu/faculty")
+    assert {lead.directory_url for lead in legacy} == {"https://music.edu/faculty"}
+
+    # A listed email wins over email_raw, as normalize_faculty_data always did
+    both = normalize_columns([{"name": "Ada Lovelace", "email": "ada@music.edu", "email_raw": "mailto:a.l@music.edu"}], "")
+    assert both[0].email == "ada@music.edu"
+
+def test_dedupe_merges_same_person_and_keeps_namesakes_apart():
+    """Duplicates from other selectors/pages are merged field by field; shared or conflicting contact details are not enough"""
+    leads = [
+        {"name": "Lopez, Maria", "title": "Professor of Voice", "profile_url": "https://music.edu/lopez/"},
+        {"name": "Dr. María López", "email": "mlopez@music.edu", "socials": ["https://x.com/mlopez"]},
+        {"name": "Maria Lopez", "profile_url": "https://music.edu/lopez", "bio_snippet": "Soprano",
+         "diagnostics": {"source_strategy": "faculty_generic", "confidence": 0.9}},
+        {"name": "J. Smith", "email": "music@music.edu"},
+        {"name": "John Smith", "title": "Lecturer"},
+        {"name": "Ada Park", "email": "music@music.edu"},
+        {"name": "Wei Chen", "email": "wchen@music.edu"},
+        {"name": "Wei Chen", "email": "wei.chen@music.edu"},
+    ]
+    deduped = dedupe_leads(leads)
+
+    assert [lead["name"] for lead in deduped] == ["Lopez, Maria", "J. Smith", "Ada Park", "Wei Chen", "Wei Chen"]
+    lopez = deduped[0]
+    assert lopez["title"] == "Professor of Voice" and lopez["email"] == "mlopez@music.edu"
+    assert lopez["bio_snippet"] == "Soprano" and lopez["socials"] == ["https://x.com/mlopez"]
+    assert lopez["diagnostics"]["confidence"] == 0.9
+    assert deduped[1]["title"] == "Lecturer"
+
+def test_dedupe_keeps_surname_only_matches_apart():
+    """Initial-only names and a shared department address don't make two people one"""
+    initials = dedupe_leads([{"name": "J. Smith"}, {"name": "K. Smith"}])
+    assert [lead["name"] for lead in initials] == ["J. Smith", "K. Smith"]
+
+    shared = dedupe_leads([{"name": "John Smith", "email": "music@x.edu"}, {"name": "Jane Smith", "email": "music@x.edu"}])
+    assert [lead["name"] for lead in shared] == ["John Smith", "Jane Smith"]
+
+def test_dedupe_keeps_similar_first_names_apart():
+    """Namesakes whose first names differ by a few letters are different people"""
+    for pair in (["Daniel Lee", "Danielle Lee"], ["Maria Lopez", "Mario Lopez"], ["Jon Smith", "John Smith"]):
+        assert [lead["name"] for lead in dedupe_leads([{"name": name} for name in pair])] == pair
+
+    # An initial that fits two full first names is left alone
+    ambiguous = dedupe_leads([{"name": "M. Lopez"}, {"name": "Maria Lopez"}, {"name": "Mario Lopez"}])
+    assert len(ambiguous) == 3
+
+def test_dedupe_tries_every_group_sharing_a_key():
+    """A lead is joined to a later group holding its email even when the first holder of that email rejects it"""
+    leads = [
+        {"name": "Ada Park", "email": "lab@x.edu"},
+        {"name": "M. Lopez", "email": "lab@x.edu"},
+        {"name": "Maria Lopez", "email": "lab@x.edu", "title": "Professor of Voice"},
+        {"name": "Mario Lopez", "email": "mario@x.edu"},
+    ]
+    deduped = dedupe_leads(leads)
+    assert [lead["name"] for lead in deduped] == ["Ada Park", "M. Lopez", "Mario Lopez"]
+    assert deduped[1]["title"] == "Professor of Voice"
+
+def test_dedupe_scales_to_thousands_of_leads():
+    """Distinct leads pass through untouched and doubled ones collapse"""
+    leads = [{"name": f"Person{n:05d} Musician", "email": f"p{n}@music.edu"} for n in range(3000)]
+    assert len(dedupe_leads(leads)) == 3000
+    assert len(dedupe_leads(leads + [dict(lead) for lead in leads])) == 3000
+
+def test_email_pattern_inference_stops_profile_fetches(tmp_path):
+    """Once a few profiles agree on first.last@domain, the remaining leads are inferred instead of fetched"""
+    names = ["Maria Lopez", "Wei Chen", "Dr. Cari Earnhart", "Ana Ruiz", "Li Park", "Omar Haddad", "Prince"]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        calls.append(request.url.path)
+        slug = request.url.path.strip("/")
+        return httpx.Response(200, html=f"<p>Contact: {slug}@music.edu</p>")
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    store = EnrichmentStore(path=str(tmp_path / "enrichment.sqlite3"), enabled=False)
+    leads = [{"name": name, "profile_url": f"https://music.edu/{'.'.join(name.lower().replace('dr. ', '').split())}"}
+             for name in names]
+    try:
+        enriched = asyncio.run(enrich_emails_from_profiles(leads, max_concurrent=1, store=store, infer_patterns=True))
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+
+    assert calls == ["/maria.lopez", "/wei.chen", "/cari.earnhart", "/prince"]
+    assert [lead["email_raw"] for lead in enriched[3:6]] == ["ana.ruiz@music.edu", "li.park@music.edu", "omar.haddad@music.edu"]
+    assert all(lead["email_inferred"] for lead in enriched[3:6])
+    assert enriched[6]["email_enriched"] and not enriched[6].get("email_inferred")
+    statuses = [lead.email_status for lead in normalize_columns(enriched, "https://music.edu/faculty")]
+    assert statuses == [EmailStatus.FOUND_ON_PROFILE] * 3 + [EmailStatus.INFERRED_PATTERN] * 3 + [EmailStatus.FOUND_ON_PROFILE]
+
+def test_email_pattern_inference_stops_when_a_sampled_profile_disagrees(tmp_path, monkeypatch):
+    """Sampled profiles check the pattern; once one breaks it, the remaining leads are fetched"""
+    names = ["Maria Lopez", "Wei Chen", "Cari Earnhart", "Ana Ruiz", "Li Park", "Omar Haddad", "Jane Doe", "Sam Lee"]
+    # Newer hires (from Omar Haddad on) got first-initial addresses
+    addresses = ["maria.lopez", "wei.chen", "cari.earnhart", "ana.ruiz", "li.park", "ohaddad", "jdoe", "slee"]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        calls.append(request.url.path)
+        index = int(request.url.path.rsplit("/", 1)[1])
+        return httpx.Response(200, html=f"<p>Contact: {addresses[index]}@music.edu</p>")
+
+    monkeypatch.setattr(settings, "email_pattern_confirm_every", 2)
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    store = EnrichmentStore(path=str(tmp_path / "enrichment.sqlite3"), enabled=False)
+    leads = [{"name": name, "profile_url": f"https://music.edu/people/{n}"} for n, name in enumerate(names)]
+    try:
+        enriched = asyncio.run(enrich_emails_from_profiles(leads, max_concurrent=1, store=store, infer_patterns=True))
+    finally:
+        client_pool.configure(transport=None)
+        response_cache.configure()
+        robots_cache.configure()
+
+    assert calls == ["/people/0", "/people/1", "/people/2", "/people/5", "/people/6", "/people/7"]
+    assert [lead.get("email_inferred", False) for lead in enriched] == [False] * 3 + [True] * 2 + [False] * 3
+    assert [lead["email_raw"].split("@")[0] for lead in enriched] == addresses
+
+def test_email_pattern_learner_needs_agreement():
+    """Listed emails teach the pattern per domain; mixed patterns stay below the confidence bar"""
+    learner = EmailPatternLearner(min_support=3, min_confidence=0.8)
+    for name, email in [("Lopez, Maria", "mlopez@music.edu"), ("Wei Chen", "wchen@music.edu"), ("Ana Ruiz", "aruiz@music.edu")]:
+        assert learner.add(name, email)
+    assert not learner.add("Prince", "prince@music.edu")
+    assert learner.best() == ("flast", "music.edu", 3, 1.0)
+    assert learner.infer("José Álvarez") == "jalvarez@music.edu"
+
+    learner.add("Omar Haddad", "omar.haddad@music.edu")
+    learner.add("Li Park", "lpark@arts.music.edu")
+    assert learner.best()[3] == 0.6 and learner.infer("Jane Doe") is None
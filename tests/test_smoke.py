@@ -1,10 +1,34 @@
 
+import json
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from api.result_cache import result_cache
+from fetch.cache import response_cache
+from fetch.pool import client_pool
+from fetch.robots import robots_cache
 from main import app
 
 client = TestClient(app)
 
+@pytest.fixture
+def offline_site(tmp_path):
+    """Serve every URL from an in-memory transport (robots.txt missing) with throwaway caches"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        return httpx.Response(200, html="<html><body><h1>Example Domain</h1></body></html>")
+
+    client_pool.configure(transport=httpx.MockTransport(handler))
+    response_cache.configure(directory=str(tmp_path / "http"))
+    result_cache.configure(directory=str(tmp_path / "results"))
+    robots_cache.configure(directory=str(tmp_path / "robots"))
+    yield
+    client_pool.configure(transport=None)
+    response_cache.configure()
+    result_cache.configure()
+    robots_cache.configure()
+
 def test_health_endpoint():
     """Test that health endpoint works"""
     response = client.get("/health")
@@ -30,3 +54,27 @@ def test_home_endpoint():
     response = client.get("/")
     assert response.status_code == 200
     assert "message" in response.json()
+
+def test_scrape_batch_streams_ndjson(offline_site):
+    """Batch endpoint streams one ScrapeResponse per line"""
+    response = client.post("/scrape/batch", json={
+        "requests": [{"url": "https://example.com"}, {"url": "https://example.org"}],
+        "max_concurrency": 2
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(item["source_url"] for item in lines) == ["https://example.com", "https://example.org"]
+
+def test_metrics_endpoint_and_timings(offline_site):
+    """Scrapes feed /metrics; include_timings adds per-stage milliseconds"""
+    response = client.post("/scrape", json={"url": "https://example.com", "include_timings": True})
+    assert response.status_code == 200
+    timings = response.json()["timings"]
+    assert "fetch" in timings and "total" in timings
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'scraper_stage_seconds_count{stage="fetch"}' in response.text
+    assert "scraper_fetch_requests_total" in response.text